@@ -8,7 +8,17 @@ across multiple sportsbooks.
 __version__ = "0.1.0"
 __author__ = "Arbitrage Bot Team"
 
-from .orchestrator import ArbitrageOrchestrator
-from .config import Settings
+# Imported on first use so that `import arbitrage_bot.<subpackage>` does not
+# pull in the orchestrator and every sportsbook's dependencies
+_EXPORTS = {
+    "ArbitrageOrchestrator": ".orchestrator",
+    "Settings": ".config",
+}
 
 __all__ = ["ArbitrageOrchestrator", "Settings"]
+
+
+def __getattr__(name: str):
+    from .registry import lazy_attribute
+
+    return lazy_attribute(__name__, _EXPORTS, name)
@@ -0,0 +1,4 @@
+from .snapshot import BoardSnapshot
+from .server import QueryServer
+
+__all__ = ["BoardSnapshot", "QueryServer"]
@@ -0,0 +1,123 @@
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+from arbitrage_bot.api.snapshot import BoardSnapshot
+
+logger = logging.getLogger(__name__)
+
+EMPTY_SNAPSHOT = BoardSnapshot(generation=0, board={}, opportunities=(), stats={})
+
+
+class QueryServer:
+    """
+    Read-only HTTP/JSON API over the latest BoardSnapshot
+
+    Routes:
+        /board          Current lines (game -> market -> sportsbook)
+        /opportunities  Open opportunities
+        /stats          Loop stats
+        /snapshot       All of the above in one document
+        /events         Server-sent events: opportunities whenever a new
+                        snapshot is published
+
+    `publish` swaps the snapshot reference in a single assignment, so
+    request threads read it without locks and never block the loop.
+    """
+
+    def __init__(
+        self, host: str = "127.0.0.1", port: int = 0, sse_interval: float = 0.25
+    ):
+        self.snapshot = EMPTY_SNAPSHOT
+        self.sse_interval = sse_interval
+        self.requests = 0
+
+        self._stopping = False
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def publish(self, snapshot: BoardSnapshot):
+        """Make a new snapshot visible to readers"""
+        self.snapshot = snapshot
+
+    def start(self):
+        """Serve requests on a background thread"""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="query-api", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Query API listening on {self.url}")
+
+    def stop(self):
+        """Stop serving, end event streams and close the socket"""
+        self._stopping = True
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                path = urlsplit(self.path).path.rstrip("/")
+                snapshot = server.snapshot
+
+                if path == "/board":
+                    self._send(200, snapshot.board_json())
+                elif path == "/opportunities":
+                    self._send(200, snapshot.opportunities_json())
+                elif path == "/stats":
+                    self._send(200, snapshot.stats_json())
+                elif path in ("", "/snapshot"):
+                    self._send(200, snapshot.to_json())
+                elif path == "/events":
+                    self._stream()
+                else:
+                    self._send(404, b'{"error": "not found"}')
+
+            def _stream(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+
+                generation = None
+                try:
+                    while not server._stopping:
+                        snapshot = server.snapshot
+                        if snapshot.generation != generation:
+                            generation = snapshot.generation
+                            self.wfile.write(
+                                b"id: %d\nevent: opportunities\ndata: %s\n\n"
+                                % (generation, snapshot.opportunities_json())
+                            )
+                            self.wfile.flush()
+                        time.sleep(server.sse_interval)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def _send(self, status: int, body: bytes, headers: List = ()):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format, *args)
+
+        return Handler
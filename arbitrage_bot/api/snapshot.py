@@ -0,0 +1,110 @@
+import json
+import time
+from dataclasses import asdict
+from typing import Dict, Optional, Tuple
+
+from arbitrage_bot.board import OddsBook
+from arbitrage_bot.models.arbitrage import ArbitrageOpportunity
+from arbitrage_bot.models.odds import GameOdds
+from arbitrage_bot.models.stats import LoopStats
+
+
+def _line(odds: GameOdds) -> Dict:
+    return {
+        "team1": odds.team1,
+        "team2": odds.team2,
+        "team1_odds": odds.team1_odds,
+        "team2_odds": odds.team2_odds,
+        "event_id": odds.event_id,
+    }
+
+
+class BoardSnapshot:
+    """
+    Immutable view of the board, open opportunities and loop stats
+
+    The orchestrator captures one per tick and swaps it in as a whole, so
+    readers never see a half-applied tick. JSON bodies are rendered on
+    first request and kept; if two readers race, both render the same
+    bytes and either result is kept, so no lock is needed.
+    """
+
+    def __init__(
+        self,
+        generation: int,
+        board: Dict[str, Dict[str, Dict[str, GameOdds]]],
+        opportunities: Tuple[ArbitrageOpportunity, ...],
+        stats: Dict,
+        created_at: float = None,
+    ):
+        self.generation = generation
+        self.created_at = time.time() if created_at is None else created_at
+        self._board = board
+        self._opportunities = opportunities
+        self._stats = stats
+        self._rendered: Dict[str, bytes] = {}
+
+    @classmethod
+    def capture(
+        cls, odds_book: OddsBook, stats: LoopStats, generation: int
+    ) -> "BoardSnapshot":
+        """Copy the current board state (GameOdds are replaced, never mutated)"""
+        return cls(
+            generation=generation,
+            board=odds_book.get_board(),
+            opportunities=tuple(odds_book.get_open_opportunities()),
+            stats=asdict(stats),
+        )
+
+    def board_json(self) -> bytes:
+        return self._render("board", self._board_document)
+
+    def opportunities_json(self) -> bytes:
+        return self._render("opportunities", self._opportunities_document)
+
+    def stats_json(self) -> bytes:
+        return self._render("stats", self._stats_document)
+
+    def to_json(self) -> bytes:
+        """Board, opportunities and stats in one document"""
+        return self._render(
+            "snapshot",
+            lambda: {
+                **self._stats_document(),
+                "board": self._board_document()["board"],
+                "opportunities": self._opportunities_document()["opportunities"],
+            },
+        )
+
+    def _render(self, name: str, document) -> bytes:
+        body: Optional[bytes] = self._rendered.get(name)
+        if body is None:
+            body = json.dumps(document()).encode()
+            self._rendered[name] = body
+        return body
+
+    def _header(self) -> Dict:
+        return {"generation": self.generation, "created_at": self.created_at}
+
+    def _board_document(self) -> Dict:
+        return {
+            **self._header(),
+            "board": {
+                game_key: {
+                    market: {str(book): _line(odds) for book, odds in books.items()}
+                    for market, books in markets.items()
+                }
+                for game_key, markets in self._board.items()
+            },
+        }
+
+    def _opportunities_document(self) -> Dict:
+        return {
+            **self._header(),
+            "opportunities": [
+                asdict(opportunity) for opportunity in self._opportunities
+            ],
+        }
+
+    def _stats_document(self) -> Dict:
+        return {**self._header(), "stats": self._stats}
@@ -0,0 +1,3 @@
+from .runner import BacktestConfig, BacktestResult, BacktestRunner, summarize
+
+__all__ = ["BacktestConfig", "BacktestResult", "BacktestRunner", "summarize"]
@@ -0,0 +1,104 @@
+"""
+Backtest CLI
+
+    python -m arbitrage_bot.backtest --history history --start 2025-01-01 \\
+        --latency 0,0.5,1,2 --execution-delay 2 --min-profit 1.0
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from arbitrage_bot.backtest import BacktestConfig, BacktestRunner, summarize
+
+
+def _floats(value: str):
+    return [float(v) for v in value.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded odds history")
+    parser.add_argument("--history", default="history", help="History directory")
+    parser.add_argument("--start", help="First day (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last day (YYYY-MM-DD)")
+    parser.add_argument(
+        "--min-profit",
+        type=_floats,
+        default=[2.5],
+        help="Comma-separated min profit percentages",
+    )
+    parser.add_argument(
+        "--latency",
+        type=_floats,
+        default=[0.0],
+        help="Comma-separated fetch latencies (s)",
+    )
+    parser.add_argument(
+        "--execution-delay",
+        type=_floats,
+        default=[2.0],
+        help="Comma-separated execution delays (s)",
+    )
+    parser.add_argument(
+        "--max-line-age",
+        type=float,
+        help="Skip opportunities with legs older than this (s)",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Worker processes (default: CPU count)"
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    runner = BacktestRunner(args.history)
+    days = runner.days_between(args.start, args.end)
+    if not days:
+        print(f"No recorded history in {args.history}")
+        sys.exit(1)
+
+    configs = [
+        BacktestConfig(
+            min_profit_percentage=min_profit,
+            fetch_latency=latency,
+            execution_delay=delay,
+            max_line_age=args.max_line_age,
+        )
+        for min_profit in args.min_profit
+        for latency in args.latency
+        for delay in args.execution_delay
+    ]
+
+    started = time.perf_counter()
+    rows = summarize(runner.run(days, configs, workers=args.workers))
+    wall = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"Replayed {len(days)} day(s) x {len(configs)} config(s) in {wall:.2f}s")
+    print(
+        f"{'min%':>6} {'latency':>8} {'delay':>6} {'opps':>7} {'missed':>7} {'stale':>6} "
+        f"{'exec':>6} {'hits':>6} {'hit%':>6} {'legged':>7} {'profit':>10} {'records/s':>10}"
+    )
+    for row in rows:
+        rate = (
+            row["records"] / row["elapsed_seconds"] if row["elapsed_seconds"] else 0.0
+        )
+        print(
+            f"{row['min_profit_percentage']:>6.2f} {row['fetch_latency']:>8.2f} "
+            f"{row['execution_delay']:>6.2f} {row['opportunities']:>7} {row['missed']:>7} "
+            f"{row['stale_skipped']:>6} {row['executed']:>6} {row['hits']:>6} "
+            f"{row['hit_rate'] * 100:>5.1f}% {row['legged']:>7} "
+            f"${row['total_profit']:>9.2f} {rate:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+import math
+import queue
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
+
+from arbitrage_bot.board import OddsBook
+from arbitrage_bot.detection import ArbitrageDetector
+from arbitrage_bot.history import HistoryReader
+from arbitrage_bot.models.arbitrage import ArbitrageOpportunity
+from arbitrage_bot.models.events import OpportunityEventType
+from arbitrage_bot.models.odds import GameOdds
+from arbitrage_bot.models.sportsbooks import Sportsbook
+
+
+@dataclass(frozen=True)
+class BacktestConfig:
+    """Parameters for one replay"""
+
+    min_profit_percentage: float = 2.5
+    # Seconds between a price change and the detector seeing it
+    fetch_latency: float = 0.0
+    # Seconds between detection and both bets being placed
+    execution_delay: float = 2.0
+    # Skip opportunities whose legs were last updated longer ago than this
+    # when the detector sees them
+    max_line_age: Optional[float] = None
+
+
+@dataclass
+class BacktestResult:
+    """Outcome of replaying one day with one config"""
+
+    day: str
+    config: BacktestConfig
+    records: int = 0
+    opportunities: int = 0
+    # Closed again before the detector could see them
+    missed: int = 0
+    stale_skipped: int = 0
+    executed: int = 0
+    hits: int = 0
+    legged: int = 0
+    total_profit: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.executed if self.executed else 0.0
+
+
+@dataclass
+class _PendingDetection:
+    seen_at: float
+    # (game_key, market, book1, book2)
+    key: Tuple[str, str, str, str]
+    # Which opening of the pair this is, so a reopened pair doesn't count
+    opening: int
+
+
+@dataclass(order=True)
+class _PendingExecution:
+    due: float
+    game_key: str = field(compare=False)
+    market: str = field(compare=False)
+    opportunity: ArbitrageOpportunity = field(compare=False)
+
+
+def _sportsbook(value: str):
+    try:
+        return Sportsbook(value)
+    except ValueError:
+        return value
+
+
+class BacktestRunner:
+    """
+    Replays recorded odds history through the real ArbitrageDetector
+
+    The recorded board is rebuilt change by change in an OddsBook. Each
+    opportunity it opens is seen by the detector `fetch_latency` seconds
+    later, at its prices then; if it has closed by that time it is missed.
+    `max_line_age` is checked when it is seen, and the bets are placed
+    `execution_delay` seconds after that. It counts as a hit only if both
+    legs are still available at the same or better odds at execution time.
+    """
+
+    def __init__(self, history_directory: str):
+        self.history_directory = history_directory
+
+    def run_day(self, day: str, config: BacktestConfig) -> BacktestResult:
+        """Replay a single day"""
+        started = time.perf_counter()
+        result = BacktestResult(day=day, config=config)
+
+        reader = HistoryReader(self.history_directory)
+        lines = reader.lines(day)
+        detector = ArbitrageDetector(min_profit_percentage=config.min_profit_percentage)
+        book = OddsBook(detector)
+        events = book.subscribe(maxsize=0)
+
+        # Line templates keyed by the current team mappings' game key
+        templates: Dict[int, Tuple[str, GameOdds]] = {}
+        for line_id, line in lines.items():
+            template = GameOdds(
+                sportsbook=_sportsbook(line.sportsbook),
+                team1=line.team1,
+                team2=line.team2,
+                team1_odds=None,
+                team2_odds=None,
+                market=line.market,
+            )
+            templates[line_id] = (detector.get_game_key(template), template)
+
+        updated_at: Dict[Tuple[str, str, str], float] = {}
+        # Open pairs: key -> (opening number, opportunity at its latest prices)
+        open_pairs: Dict[
+            Tuple[str, str, str, str], Tuple[int, ArbitrageOpportunity]
+        ] = {}
+        openings = 0
+        # Both are appended in time order, so each stays sorted
+        detections = deque()
+        pending = deque()
+
+        def detect(detection: _PendingDetection):
+            current = open_pairs.get(detection.key)
+            if current is None or current[0] != detection.opening:
+                result.missed += 1
+                return
+
+            game_key, market, book1, book2 = detection.key
+            if config.max_line_age is not None:
+                ages = [
+                    detection.seen_at - updated_at.get((game_key, market, b), 0.0)
+                    for b in (book1, book2)
+                ]
+                if max(ages) > config.max_line_age:
+                    result.stale_skipped += 1
+                    return
+
+            pending.append(
+                _PendingExecution(
+                    detection.seen_at + config.execution_delay,
+                    game_key,
+                    market,
+                    current[1],
+                )
+            )
+
+        def advance(until: float):
+            """Run detections and settle executions due by `until`, in time order"""
+            while detections or pending:
+                next_seen = detections[0].seen_at if detections else math.inf
+                next_due = pending[0].due if pending else math.inf
+                if min(next_seen, next_due) > until:
+                    return
+                if next_due <= next_seen:
+                    self._settle(book, pending.popleft(), result)
+                else:
+                    detect(detections.popleft())
+
+        for timestamp, line_id, team1_odds, team2_odds in reader.iter_records(day):
+            result.records += 1
+
+            # Everything that happened before this change
+            advance(timestamp)
+
+            game_key, template = templates[line_id]
+            if math.isnan(team1_odds):
+                book.remove_line(template.sportsbook, game_key, template.market)
+            else:
+                book.apply_update(
+                    replace(template, team1_odds=team1_odds, team2_odds=team2_odds)
+                )
+            updated_at[(game_key, template.market, template.sportsbook)] = timestamp
+
+            while True:
+                try:
+                    event = events.get_nowait()
+                except queue.Empty:
+                    break
+                opportunity = event.opportunity
+                key = (
+                    event.game_key,
+                    event.market,
+                    opportunity.book1,
+                    opportunity.book2,
+                )
+                if event.event_type == OpportunityEventType.OPENED:
+                    result.opportunities += 1
+                    openings += 1
+                    open_pairs[key] = (openings, opportunity)
+                    detections.append(
+                        _PendingDetection(
+                            timestamp + config.fetch_latency, key, openings
+                        )
+                    )
+                elif event.event_type == OpportunityEventType.UPDATED:
+                    if key in open_pairs:
+                        open_pairs[key] = (open_pairs[key][0], opportunity)
+                else:
+                    open_pairs.pop(key, None)
+
+        advance(math.inf)
+
+        result.elapsed_seconds = time.perf_counter() - started
+        return result
+
+    def run(
+        self, days: List[str], configs: List[BacktestConfig], workers: int = None
+    ) -> List[BacktestResult]:
+        """Replay every (day, config) combination across worker processes"""
+        # Deferred: importing it loads multiprocessing, which run_day never needs
+        from concurrent.futures import ProcessPoolExecutor
+
+        tasks = [(day, config) for config in configs for day in days]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(
+                executor.map(_run_task, [self.history_directory] * len(tasks), tasks)
+            )
+
+    def days_between(self, start: str = None, end: str = None) -> List[str]:
+        """Recorded days within [start, end] (YYYY-MM-DD, inclusive)"""
+        return [
+            day
+            for day in HistoryReader(self.history_directory).days()
+            if (start is None or day >= start) and (end is None or day <= end)
+        ]
+
+    def _settle(
+        self, book: OddsBook, execution: _PendingExecution, result: BacktestResult
+    ):
+        opportunity = execution.opportunity
+        result.executed += 1
+
+        lines = book.get_game(execution.game_key).get(execution.market, {})
+        leg1 = self._leg_still_available(
+            book,
+            lines.get(opportunity.book1),
+            opportunity.team1,
+            opportunity.book1_odds,
+        )
+        leg2 = self._leg_still_available(
+            book,
+            lines.get(opportunity.book2),
+            opportunity.team2,
+            opportunity.book2_odds,
+        )
+
+        if leg1 and leg2:
+            result.hits += 1
+            result.total_profit += opportunity.total_profit
+        elif leg1 or leg2:
+            result.legged += 1
+
+    def _leg_still_available(
+        self, book: OddsBook, odds: Optional[GameOdds], team: str, expected: float
+    ) -> bool:
+        if odds is None:
+            return False
+        mapper = book.detector.team_mapper
+        if mapper.standardize_team_name(odds.team1) == team:
+            current = odds.team1_odds
+        elif mapper.standardize_team_name(odds.team2) == team:
+            current = odds.team2_odds
+        else:
+            return False
+        # American odds: a higher number always pays at least as much
+        return current >= expected
+
+
+def _run_task(
+    history_directory: str, task: Tuple[str, BacktestConfig]
+) -> BacktestResult:
+    day, config = task
+    return BacktestRunner(history_directory).run_day(day, config)
+
+
+def summarize(results: List[BacktestResult]) -> List[Dict]:
+    """Aggregate results per config (one row per config, days summed)"""
+    rows: Dict[BacktestConfig, Dict] = {}
+    for result in results:
+        row = rows.setdefault(
+            result.config,
+            {
+                **asdict(result.config),
+                "days": 0,
+                "records": 0,
+                "opportunities": 0,
+                "missed": 0,
+                "stale_skipped": 0,
+                "executed": 0,
+                "hits": 0,
+                "legged": 0,
+                "total_profit": 0.0,
+                "elapsed_seconds": 0.0,
+            },
+        )
+        row["days"] += 1
+        for key in (
+            "records",
+            "opportunities",
+            "missed",
+            "stale_skipped",
+            "executed",
+            "hits",
+            "legged",
+            "total_profit",
+            "elapsed_seconds",
+        ):
+            row[key] += getattr(result, key)
+
+    for row in rows.values():
+        row["hit_rate"] = row["hits"] / row["executed"] if row["executed"] else 0.0
+    return list(rows.values())
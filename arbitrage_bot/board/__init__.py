@@ -0,0 +1,14 @@
+from arbitrage_bot.registry import lazy_attribute
+from .odds_book import OddsBook
+
+# The shared-memory board is only needed for process ingestion
+_EXPORTS = {
+    "SharedOddsBoard": ".shared_board",
+    "ShardWriter": ".shared_board",
+}
+
+__all__ = ["OddsBook", "SharedOddsBoard", "ShardWriter"]
+
+
+def __getattr__(name: str):
+    return lazy_attribute(__name__, _EXPORTS, name)
@@ -0,0 +1,128 @@
+import logging
+import multiprocessing
+from typing import Dict, List, Tuple
+
+from arbitrage_bot.board.shared_board import SharedOddsBoard, ShardWriter
+from arbitrage_bot.models.odds import GameOdds
+from arbitrage_bot.models.sportsbooks import Sportsbook
+from arbitrage_bot.odds.base import OddsFetcher
+
+logger = logging.getLogger(__name__)
+
+
+def _run_shard(
+    fetcher: OddsFetcher,
+    shard: int,
+    board_name: str,
+    shards: int,
+    rows_per_shard: int,
+    refresh_interval_seconds: float,
+    metadata_queue,
+    stop_event,
+):
+    """Worker process: fetch and parse one feed, publishing into its shard"""
+    board = SharedOddsBoard.attach(board_name, shards, rows_per_shard)
+    writer = ShardWriter(board, shard, metadata_queue)
+
+    try:
+        while not stop_event.is_set():
+            try:
+                writer.write(fetcher.fetch_odds())
+            except Exception as e:
+                logger.error(f"Error in ingestion shard {shard}: {e}")
+            stop_event.wait(refresh_interval_seconds)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        board.close()
+
+
+class ShardedIngestion:
+    """
+    Runs each odds feed in its own worker process
+
+    A feed is one fetcher: a whole sportsbook, or one league of it when the
+    sportsbook is split into several (`ingestion_feeds`). JSON parsing
+    happens in the workers, off the detector's GIL. Parsed prices are
+    published into a SharedOddsBoard, one shard per feed, that the detector
+    process reads in place.
+    """
+
+    def __init__(
+        self,
+        feeds: Dict[Sportsbook, List[OddsFetcher]],
+        refresh_interval_seconds: float,
+        rows_per_shard: int = 4096,
+    ):
+        # Shard index -> (sportsbook, fetcher)
+        self.feeds: List[Tuple[Sportsbook, OddsFetcher]] = [
+            (sportsbook, fetcher)
+            for sportsbook, fetchers in feeds.items()
+            for fetcher in fetchers
+        ]
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.rows_per_shard = rows_per_shard
+
+        self._context = multiprocessing.get_context("spawn")
+        self.board = SharedOddsBoard(len(self.feeds), rows_per_shard)
+        self.metadata_queue = self._context.Queue()
+        self.stop_event = self._context.Event()
+        self.processes: List[multiprocessing.Process] = []
+        # Last lines read from each shard, to rebuild a sportsbook's board
+        # when only some of its feeds changed
+        self._shard_lines: Dict[int, List[GameOdds]] = {}
+
+    def start(self):
+        """Start one worker process per feed shard"""
+        for shard, (sportsbook, fetcher) in enumerate(self.feeds):
+            process = self._context.Process(
+                target=_run_shard,
+                args=(
+                    fetcher,
+                    shard,
+                    self.board.name,
+                    self.board.shards,
+                    self.rows_per_shard,
+                    self.refresh_interval_seconds,
+                    self.metadata_queue,
+                    self.stop_event,
+                ),
+                name=f"ingestion-{sportsbook}-{shard}",
+                daemon=True,
+            )
+            process.start()
+            self.processes.append(process)
+            logger.info(f"Started ingestion shard {shard} for {sportsbook}")
+
+    def read_changed(self) -> Dict[Sportsbook, List[GameOdds]]:
+        """
+        Read every shard that published a new board since the last call
+
+        Returns:
+            Dictionary mapping each sportsbook with a changed feed to its
+            current lines across all of its feeds
+        """
+        self.board.receive_metadata(self.metadata_queue)
+
+        changed_books = set()
+        for shard in self.board.changed_shards():
+            odds = self.board.read_shard(shard)
+            if odds is not None:
+                self._shard_lines[shard] = odds
+                changed_books.add(self.feeds[shard][0])
+
+        changed = {sportsbook: [] for sportsbook in changed_books}
+        for shard, (sportsbook, _) in enumerate(self.feeds):
+            if sportsbook in changed:
+                changed[sportsbook].extend(self._shard_lines.get(shard, ()))
+        return changed
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the workers and release the shared board"""
+        self.stop_event.set()
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+        self.board.close()
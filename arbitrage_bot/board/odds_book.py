@@ -0,0 +1,270 @@
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from arbitrage_bot.detection.detector import ArbitrageDetector
+from arbitrage_bot.models.arbitrage import ArbitrageOpportunity
+from arbitrage_bot.models.events import OpportunityEvent, OpportunityEventType
+from arbitrage_bot.models.odds import GameOdds
+from arbitrage_bot.models.sportsbooks import Sportsbook
+
+logger = logging.getLogger(__name__)
+
+# (book1, book2) for a single game/market
+PairKey = Tuple[Sportsbook, Sportsbook]
+# (game_key, market)
+LineKey = Tuple[str, str]
+
+
+class OddsBook:
+    """
+    Long-lived, indexed view of the live odds board
+
+    Lines are stored as game -> market -> sportsbook -> GameOdds. Applying an
+    update only re-evaluates the games whose lines actually changed, and
+    opportunity open/update/close events are published to every subscriber
+    queue.
+    """
+
+    def __init__(self, detector: ArbitrageDetector, subscriber_queue_size: int = 1000):
+        self.detector = detector
+        self.subscriber_queue_size = subscriber_queue_size
+        self.dropped_events = 0
+
+        self._games: Dict[str, Dict[str, Dict[Sportsbook, GameOdds]]] = {}
+        self._book_lines: Dict[Sportsbook, Dict[LineKey, GameOdds]] = {}
+        self._open: Dict[LineKey, Dict[PairKey, ArbitrageOpportunity]] = {}
+        self._subscribers: List[queue.Queue] = []
+        self._lock = threading.RLock()
+
+    def subscribe(self, maxsize: Optional[int] = None) -> queue.Queue:
+        """Register a new subscriber and return its event queue"""
+        subscriber = queue.Queue(
+            maxsize=self.subscriber_queue_size if maxsize is None else maxsize
+        )
+        with self._lock:
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue):
+        """Stop publishing events to a subscriber queue"""
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def apply_snapshot(
+        self, sportsbook: Sportsbook, odds_list: Iterable[GameOdds]
+    ) -> int:
+        """
+        Replace every line of a sportsbook with a freshly fetched board
+
+        Args:
+            sportsbook: Sportsbook the lines belong to
+            odds_list: Complete list of current lines for that sportsbook
+
+        Returns:
+            Number of lines that were added, changed or removed
+        """
+        with self._lock:
+            current = self._book_lines.get(sportsbook, {})
+            incoming = {}
+            for odds in odds_list:
+                incoming[(self.detector.get_game_key(odds), odds.market)] = odds
+
+            changed = set()
+            for line_key, odds in incoming.items():
+                previous = current.get(line_key)
+                if previous is not odds and previous != odds:
+                    self._store_line(line_key, odds)
+                    changed.add(line_key)
+
+            for line_key in current.keys() - incoming.keys():
+                self._drop_line(sportsbook, line_key)
+                changed.add(line_key)
+
+            self._book_lines[sportsbook] = incoming
+            for line_key in changed:
+                self._evaluate(line_key)
+
+            return len(changed)
+
+    def apply_update(self, odds: GameOdds) -> bool:
+        """
+        Upsert a single line
+
+        Returns:
+            True if the line changed and was re-evaluated
+        """
+        with self._lock:
+            line_key = (self.detector.get_game_key(odds), odds.market)
+            book_lines = self._book_lines.setdefault(odds.sportsbook, {})
+            previous = book_lines.get(line_key)
+            if previous is odds or previous == odds:
+                return False
+
+            book_lines[line_key] = odds
+            self._store_line(line_key, odds)
+            self._evaluate(line_key)
+            return True
+
+    def remove_line(self, sportsbook: Sportsbook, game_key: str, market: str) -> bool:
+        """Remove a single line, closing any opportunity that used it"""
+        with self._lock:
+            line_key = (game_key, market)
+            book_lines = self._book_lines.get(sportsbook, {})
+            if line_key not in book_lines:
+                return False
+
+            del book_lines[line_key]
+            self._drop_line(sportsbook, line_key)
+            self._evaluate(line_key)
+            return True
+
+    def reindex(self, team_names: Optional[Set[str]] = None) -> int:
+        """
+        Re-key lines after the detector's game keys changed
+
+        Args:
+            team_names: Only re-key lines listing one of these raw team
+                names (None checks every line)
+
+        Returns:
+            Number of lines that moved to a different game
+        """
+        with self._lock:
+            moved = 0
+            touched = set()
+            for sportsbook, lines in self._book_lines.items():
+                for line_key, odds in list(lines.items()):
+                    if (
+                        team_names is not None
+                        and odds.team1 not in team_names
+                        and odds.team2 not in team_names
+                    ):
+                        continue
+                    new_key = (self.detector.get_game_key(odds), odds.market)
+                    if new_key == line_key:
+                        continue
+
+                    del lines[line_key]
+                    self._drop_line(sportsbook, line_key)
+                    lines[new_key] = odds
+                    self._store_line(new_key, odds)
+                    touched.update((line_key, new_key))
+                    moved += 1
+
+            for line_key in touched:
+                self._evaluate(line_key)
+            return moved
+
+    def get_game(self, game_key: str) -> Dict[str, Dict[Sportsbook, GameOdds]]:
+        """Get a copy of every market/book line for a game"""
+        with self._lock:
+            markets = self._games.get(game_key, {})
+            return {market: dict(books) for market, books in markets.items()}
+
+    def get_board(self) -> Dict[str, Dict[str, Dict[Sportsbook, GameOdds]]]:
+        """Get a copy of the whole board (game -> market -> sportsbook)"""
+        with self._lock:
+            return {
+                game_key: {market: dict(books) for market, books in markets.items()}
+                for game_key, markets in self._games.items()
+            }
+
+    def get_open_opportunities(self) -> List[ArbitrageOpportunity]:
+        """Get all currently open opportunities"""
+        with self._lock:
+            return [
+                opportunity
+                for pairs in self._open.values()
+                for opportunity in pairs.values()
+            ]
+
+    def get_open_keys(self) -> Set[Tuple[str, str, Sportsbook, Sportsbook]]:
+        """Get (game, market, book1, book2) for every currently open opportunity"""
+        with self._lock:
+            return {
+                (game_key, market, book1, book2)
+                for (game_key, market), pairs in self._open.items()
+                for book1, book2 in pairs
+            }
+
+    def to_dict(self) -> Dict[Sportsbook, List[GameOdds]]:
+        """Get the board in the detector's batch format (sportsbook -> odds)"""
+        with self._lock:
+            return {
+                sportsbook: list(lines.values())
+                for sportsbook, lines in self._book_lines.items()
+            }
+
+    def _store_line(self, line_key: LineKey, odds: GameOdds):
+        game_key, market = line_key
+        self._games.setdefault(game_key, {}).setdefault(market, {})[odds.sportsbook] = (
+            odds
+        )
+
+    def _drop_line(self, sportsbook: Sportsbook, line_key: LineKey):
+        game_key, market = line_key
+        markets = self._games.get(game_key)
+        if not markets or market not in markets:
+            return
+
+        markets[market].pop(sportsbook, None)
+        if not markets[market]:
+            del markets[market]
+        if not markets:
+            del self._games[game_key]
+
+    def _evaluate(self, line_key: LineKey):
+        """Re-check every book pair for a single game/market and publish changes"""
+        game_key, market = line_key
+        books = self._games.get(game_key, {}).get(market, {})
+        ordered = sorted(books.values(), key=lambda odds: odds.sportsbook)
+
+        found: Dict[PairKey, ArbitrageOpportunity] = {}
+        for i, odds1 in enumerate(ordered):
+            for odds2 in ordered[i + 1 :]:
+                opportunity = self.detector._check_arbitrage(odds1, odds2)
+                if opportunity:
+                    found[(odds1.sportsbook, odds2.sportsbook)] = opportunity
+
+        previous = self._open.get(line_key, {})
+        now = time.time()
+
+        for pair_key, opportunity in found.items():
+            if pair_key not in previous:
+                self._publish(OpportunityEventType.OPENED, line_key, opportunity, now)
+            elif previous[pair_key] != opportunity:
+                self._publish(OpportunityEventType.UPDATED, line_key, opportunity, now)
+
+        for pair_key, opportunity in previous.items():
+            if pair_key not in found:
+                self._publish(OpportunityEventType.CLOSED, line_key, opportunity, now)
+
+        if found:
+            self._open[line_key] = found
+        else:
+            self._open.pop(line_key, None)
+
+    def _publish(
+        self,
+        event_type: OpportunityEventType,
+        line_key: LineKey,
+        opportunity: ArbitrageOpportunity,
+        timestamp: float,
+    ):
+        event = OpportunityEvent(
+            event_type=event_type,
+            game_key=line_key[0],
+            market=line_key[1],
+            opportunity=opportunity,
+            timestamp=timestamp,
+        )
+        for subscriber in self._subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                self.dropped_events += 1
+                logger.warning(f"Subscriber queue full, dropped event: {event}")
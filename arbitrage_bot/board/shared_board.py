@@ -0,0 +1,311 @@
+import logging
+import math
+import queue
+from dataclasses import replace
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+from arbitrage_bot.models.odds import GameOdds
+
+logger = logging.getLogger(__name__)
+
+_WORD = 8
+_INACTIVE = math.nan
+
+# (sportsbook, team1, team2, market)
+RowKey = Tuple[str, str, str, str]
+
+# Metadata queue messages: (_TEMPLATE, row, version, template) when a row's
+# line is allocated or changes, then (_GENERATION, shard, generation, end_row)
+# once the shard's prices for that generation are written (rows from
+# end_row on have never been used)
+_TEMPLATE = "template"
+_GENERATION = "generation"
+
+
+class SharedOddsBoard:
+    """
+    Columnar odds board backed by a single shared memory block
+
+    The board is split into shards, one per ingestion feed (a sportsbook,
+    or one league of it), each owning a fixed range of rows. Prices live in shared memory columns that the
+    detector process reads in place; the non-price part of each line is sent
+    once through a metadata queue when its row is allocated or changes.
+
+    Layout (all 8-byte words):
+        generation[shards] | seq[rows] | version[rows] | team1_odds[rows] | team2_odds[rows]
+
+    Each row is guarded by a sequence counter (odd while being written) so
+    readers never see a half-written price pair. A row's version changes
+    with its template, so prices are never paired with another line's
+    template. The queue delivers a shard's templates before its generation
+    marker, and a shard only counts as changed once the marker for its new
+    generation has been received.
+
+    Writers only touch rows whose prices or template changed, so a row's
+    sequence counter doubles as its change stamp: the reader keeps the
+    GameOdds it built for each row and rebuilds only rows whose counter
+    moved since.
+    """
+
+    def __init__(
+        self,
+        shards: int,
+        rows_per_shard: int = 4096,
+        name: Optional[str] = None,
+        create: bool = True,
+    ):
+        self.shards = shards
+        self.rows_per_shard = rows_per_shard
+        self.total_rows = shards * rows_per_shard
+
+        size = (shards + 4 * self.total_rows) * _WORD
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+        self._owner = create
+
+        buffer = self.shm.buf
+        rows_bytes = self.total_rows * _WORD
+        offset = shards * _WORD
+        self.generation = buffer[:offset].cast("q")
+        self.seq = buffer[offset : offset + rows_bytes].cast("q")
+        offset += rows_bytes
+        self.version = buffer[offset : offset + rows_bytes].cast("q")
+        offset += rows_bytes
+        self.team1_odds = buffer[offset : offset + rows_bytes].cast("d")
+        offset += rows_bytes
+        self.team2_odds = buffer[offset : offset + rows_bytes].cast("d")
+
+        if create:
+            for row in range(self.total_rows):
+                self.team1_odds[row] = _INACTIVE
+                self.team2_odds[row] = _INACTIVE
+
+        # Reader side: row -> (version, GameOdds template); prices come from
+        # the columns
+        self._templates: Dict[int, Tuple[int, GameOdds]] = {}
+        # Row -> (seq it was read at, its GameOdds or None if inactive)
+        self._materialized: Dict[int, Tuple[int, Optional[GameOdds]]] = {}
+        self._ready_generation = [0] * shards
+        self._seen_generation = [0] * shards
+        self._end_rows = [self.shard_rows(shard)[0] for shard in range(shards)]
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @classmethod
+    def attach(cls, name: str, shards: int, rows_per_shard: int) -> "SharedOddsBoard":
+        """Attach to a board created by another process"""
+        return cls(shards, rows_per_shard, name=name, create=False)
+
+    def shard_rows(self, shard: int) -> Tuple[int, int]:
+        """Get the [start, end) row range owned by a shard"""
+        start = shard * self.rows_per_shard
+        return start, start + self.rows_per_shard
+
+    def prices(self, shard: int) -> Tuple[memoryview, memoryview]:
+        """Zero-copy views of a shard's team1/team2 price columns"""
+        start, end = self.shard_rows(shard)
+        return self.team1_odds[start:end], self.team2_odds[start:end]
+
+    def write_row(
+        self, row: int, team1_odds: float, team2_odds: float, version: int = None
+    ):
+        """Write one price pair (and a new template version) under the row's sequence lock"""
+        self.seq[row] += 1
+        if version is not None:
+            self.version[row] = version
+        self.team1_odds[row] = team1_odds
+        self.team2_odds[row] = team2_odds
+        self.seq[row] += 1
+
+    def read_row(
+        self, row: int, max_spins: int = 1000
+    ) -> Tuple[int, int, float, float]:
+        """
+        Read one consistent sequence number, version and price pair
+
+        A sequence number of -1 (with inactive prices) means the writer
+        never settled.
+        """
+        for _ in range(max_spins):
+            before = self.seq[row]
+            if before % 2:
+                continue
+            version = self.version[row]
+            team1_odds = self.team1_odds[row]
+            team2_odds = self.team2_odds[row]
+            if self.seq[row] == before:
+                return before, version, team1_odds, team2_odds
+        return -1, -1, _INACTIVE, _INACTIVE
+
+    def receive_metadata(self, metadata_queue) -> int:
+        """Drain pending row templates and generation markers published by the shard writers"""
+        received = 0
+        while True:
+            try:
+                kind, index, *payload = metadata_queue.get_nowait()
+            except queue.Empty:
+                return received
+            if kind == _TEMPLATE:
+                version, template = payload
+                self._templates[index] = (version, template)
+            else:
+                generation, end_row = payload
+                if generation > self._ready_generation[index]:
+                    self._ready_generation[index] = generation
+                    self._end_rows[index] = end_row
+            received += 1
+
+    def changed_shards(self) -> List[int]:
+        """Get shards whose templates for a new generation have all been received"""
+        return [
+            shard
+            for shard in range(self.shards)
+            if self._ready_generation[shard] != self._seen_generation[shard]
+        ]
+
+    def read_shard(self, shard: int) -> Optional[List[GameOdds]]:
+        """
+        Get the active lines of a shard as GameOdds
+
+        Only rows written since the last read are rebuilt; the rest reuse
+        the GameOdds built then. Marks the shard's received generation as
+        read.
+
+        Returns:
+            The lines, or None if the writer has since moved a row to a line
+            whose template has not arrived yet (read again after the next
+            `receive_metadata`)
+        """
+        odds = []
+        materialized = self._materialized
+        start, _ = self.shard_rows(shard)
+        for row in range(start, self._end_rows[shard]):
+            entry = materialized.get(row)
+            if entry is not None and entry[0] == self.seq[row]:
+                if entry[1] is not None:
+                    odds.append(entry[1])
+                continue
+
+            seq, version, team1_odds, team2_odds = self.read_row(row)
+            if math.isnan(team1_odds) or math.isnan(team2_odds):
+                materialized[row] = (seq, None)
+                continue
+            template = self._templates.get(row)
+            if template is None or template[0] != version:
+                return None
+            line = replace(template[1], team1_odds=team1_odds, team2_odds=team2_odds)
+            materialized[row] = (seq, line)
+            odds.append(line)
+
+        self._seen_generation[shard] = self._ready_generation[shard]
+        return odds
+
+    def close(self):
+        """Release the views and the shared memory block"""
+        for view in (
+            self.generation,
+            self.seq,
+            self.version,
+            self.team1_odds,
+            self.team2_odds,
+        ):
+            view.release()
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+class ShardWriter:
+    """
+    Writes one fetcher's lines into its shard of a SharedOddsBoard
+
+    Rows of lines that leave the feed are freed and reused for new lines,
+    so a shard only has to hold the lines live at one time.
+    """
+
+    def __init__(self, board: SharedOddsBoard, shard: int, metadata_queue):
+        self.board = board
+        self.shard = shard
+        self.metadata_queue = metadata_queue
+        self._next_row, self._end_row = board.shard_rows(shard)
+        self._rows: Dict[RowKey, int] = {}
+        self._free_rows: List[int] = []
+        self._templates: Dict[int, GameOdds] = {}
+        self._versions: Dict[int, int] = {}
+        self._prices: Dict[int, Tuple[float, float]] = {}
+        # Lines currently not fitting in the shard (logged once each)
+        self._dropped = set()
+
+    def write(self, odds_list: List[GameOdds]) -> int:
+        """
+        Publish a full board for this shard
+
+        Returns:
+            Number of rows written
+        """
+        incoming = {
+            (odds.sportsbook, odds.team1, odds.team2, odds.market): odds
+            for odds in odds_list
+        }
+
+        # Lines that disappeared from the feed are marked inactive and their
+        # rows freed before new lines are placed
+        for key in self._rows.keys() - incoming.keys():
+            row = self._rows.pop(key)
+            self.board.write_row(row, _INACTIVE, _INACTIVE)
+            self._prices.pop(row, None)
+            self._free_rows.append(row)
+
+        # Unchanged rows are left alone, so their sequence counters (which
+        # readers use as change stamps) stay put
+        dropped = set()
+        for key, odds in incoming.items():
+            row = self._row_for(key, odds)
+            if row is None:
+                dropped.add(key)
+                continue
+            version = self._publish_template(row, odds)
+            prices = (odds.team1_odds, odds.team2_odds)
+            if version is not None or self._prices.get(row) != prices:
+                self.board.write_row(row, *prices, version)
+                self._prices[row] = prices
+
+        for key in dropped - self._dropped:
+            logger.error(f"Shard {self.shard} is full, dropping line {key}")
+        self._dropped = dropped
+
+        self.board.generation[self.shard] += 1
+        self.metadata_queue.put(
+            (_GENERATION, self.shard, self.board.generation[self.shard], self._next_row)
+        )
+        return len(incoming) - len(dropped)
+
+    def _row_for(self, key: RowKey, odds: GameOdds) -> Optional[int]:
+        row = self._rows.get(key)
+        if row is not None:
+            return row
+
+        if self._free_rows:
+            row = self._free_rows.pop()
+        elif self._next_row < self._end_row:
+            row = self._next_row
+            self._next_row += 1
+        else:
+            return None
+        # A reused row always gets a new template version
+        self._templates.pop(row, None)
+        self._rows[key] = row
+        return row
+
+    def _publish_template(self, row: int, odds: GameOdds) -> Optional[int]:
+        """Send the row's template if it changed; returns its new version, if any"""
+        template = replace(odds, team1_odds=None, team2_odds=None)
+        if self._templates.get(row) == template:
+            return None
+        self._templates[row] = template
+        version = self._versions.get(row, 0) + 1
+        self._versions[row] = version
+        self.metadata_queue.put((_TEMPLATE, row, version, template))
+        return version
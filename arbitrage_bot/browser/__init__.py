@@ -1,5 +1,15 @@
-from .base import BrowserAutomation
-from .draftkings import DraftKingsBrowser
-from .betmgm import BetMGMBrowser
+from arbitrage_bot.registry import lazy_attribute
 
-__all__ = ["BrowserAutomation", "DraftKingsBrowser", "BetMGMBrowser"]
+# Browsers need Selenium, so nothing is imported until first use
+_EXPORTS = {
+    "BrowserAutomation": ".base",
+    "BrowserWorker": ".worker",
+    "DraftKingsBrowser": ".draftkings",
+    "BetMGMBrowser": ".betmgm",
+}
+
+__all__ = ["BrowserAutomation", "BrowserWorker", "DraftKingsBrowser", "BetMGMBrowser"]
+
+
+def __getattr__(name: str):
+    return lazy_attribute(__name__, _EXPORTS, name)
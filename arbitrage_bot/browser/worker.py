@@ -0,0 +1,94 @@
+import queue
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Callable, Set
+
+if TYPE_CHECKING:
+    from arbitrage_bot.browser.base import BrowserAutomation
+
+
+class BrowserWorker:
+    """
+    Long-lived thread that owns one browser automation
+
+    Selenium drivers are not thread-safe, so every command for a browser
+    runs on its worker, one at a time and in the order submitted. `submit`
+    returns a concurrent.futures.Future; commands that have not started
+    yet can be cancelled through it or all at once with `cancel_pending`.
+    """
+
+    def __init__(self, automation: "BrowserAutomation", name: str = None):
+        self.automation = automation
+        self.name = name or type(automation).__name__
+        self.commands_run = 0
+
+        self._queue: queue.Queue = queue.Queue()
+        self._pending: Set[Future] = set()
+        self._lock = threading.Lock()
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name=f"browser-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Queue a command behind everything already submitted
+
+        Raises:
+            RuntimeError: If the worker has been stopped
+        """
+        future = Future()
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError(f"Browser worker {self.name} is stopped")
+            self._pending.add(future)
+            self._queue.put((future, fn, args, kwargs))
+        return future
+
+    @property
+    def pending(self) -> int:
+        """Number of queued commands that have not started"""
+        return len(self._pending)
+
+    def cancel_pending(self) -> int:
+        """
+        Cancel every queued command that has not started
+
+        Returns:
+            Number of commands cancelled
+        """
+        with self._lock:
+            pending = list(self._pending)
+        return sum(future.cancel() for future in pending)
+
+    def stop(self, cancel: bool = True, timeout: float = None):
+        """Stop accepting commands and end the thread once the queue drains"""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._queue.put(None)
+        if cancel:
+            self.cancel_pending()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            future, fn, args, kwargs = item
+            with self._lock:
+                self._pending.discard(future)
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            self.commands_run += 1
@@ -1,3 +1,4 @@
 from .settings import Settings
+from .watcher import ConfigWatcher
 
-__all__ = ["Settings"]
+__all__ = ["Settings", "ConfigWatcher"]
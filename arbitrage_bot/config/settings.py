@@ -1,9 +1,21 @@
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, fields
+from typing import Dict, List
 import json
 import os
 from arbitrage_bot.models.sportsbooks import Sportsbook
 
+# Settings a running orchestrator picks up on reload; changes to any other
+# field only take effect after a restart
+RELOADABLE_SETTINGS = (
+    "min_profit_percentage",
+    "total_bet_amount",
+    "max_opportunities_per_tick",
+    "book_balances",
+    "max_stake_per_bet",
+    "stake_rounding",
+    "refresh_interval_seconds",
+)
+
 
 @dataclass
 class Settings:
@@ -16,9 +28,78 @@ class Settings:
     min_profit_percentage: float = 2.5
     total_bet_amount: float = 100.0
 
+    # Most opportunities acted on per tick, ranked by profit and freshness
+    max_opportunities_per_tick: int = 50
+
+    # Stake sizing (balances keyed by sportsbook; untracked books are unlimited)
+    book_balances: Dict[str, float] = None
+    max_stake_per_bet: float = None
+    stake_rounding: float = 0.01
+
     # Timing settings
     refresh_interval_seconds: int = 5
 
+    # Extra or overridden sportsbook plugins keyed by name, e.g.
+    # {"fanduel": {"fetcher": "my_books.fanduel:FanDuelOddsFetcher", ...}}
+    sportsbook_plugins: Dict[str, Dict] = None
+    # Upper bound on parallel fetches (one per configured sportsbook)
+    max_fetch_workers: int = 32
+
+    # Endpoint overrides keyed by sportsbook, e.g. to target a mock server
+    sportsbook_api_urls: Dict[str, str] = None
+    sportsbook_site_urls: Dict[str, str] = None
+    # Server-sent events price feeds keyed by sportsbook; books without one
+    # are only polled
+    sportsbook_stream_urls: Dict[str, str] = None
+
+    # Ingestion settings (parse each feed in its own worker process)
+    enable_process_ingestion: bool = False
+    ingestion_rows_per_shard: int = 4096
+    # Split a sportsbook into one feed (worker process and shard) per entry,
+    # each entry being fetcher options such as a league; books not listed
+    # run as a single feed
+    ingestion_feeds: Dict[str, List[Dict]] = None
+
+    # History settings (None disables recording)
+    history_directory: str = None
+    history_segment_bytes: int = 64 * 1024 * 1024
+
+    # SQLite file recording opportunities and executions (None disables it)
+    database_path: str = None
+
+    # SQLite execution queue shared with executor processes (None places
+    # bets in this process). Opportunities not claimed within the TTL expire
+    execution_queue_path: str = None
+    execution_lease_seconds: float = 30.0
+    execution_job_ttl: float = 10.0
+    executor_poll_seconds: float = 0.1
+
+    # Read-only query API (None disables it; 0 picks a free port)
+    query_api_port: int = None
+    query_api_host: str = "127.0.0.1"
+
+    # Seconds between checks of the settings and team mapping files for
+    # changes (None disables hot reload)
+    config_reload_seconds: float = 1.0
+
+    # Memory governor: ticks between RSS samples and cache trims (0
+    # disables it), optional tracemalloc diffs of the top allocation sites,
+    # and an RSS ceiling (bytes) above which caches are trimmed harder
+    memory_check_ticks: int = 100
+    memory_trace_allocations: bool = False
+    memory_limit_bytes: int = None
+    # Size limits for caches and queues that would otherwise grow with
+    # every game ever seen
+    max_game_key_cache: int = 100000
+    max_pending_events: int = 100000
+    # Finished execution jobs kept in the queue database
+    execution_retention_seconds: float = 86400.0
+
+    # Log file rotation
+    log_file: str = "arbitrage_bot.log"
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_backup_count: int = 5
+
     # Browser settings
     enable_browser_automation: bool = True
 
@@ -28,6 +109,84 @@ class Settings:
                 Sportsbook.DRAFTKINGS,
                 Sportsbook.BETMGM,
             ]
+        if self.book_balances is None:
+            self.book_balances = {}
+        if self.sportsbook_plugins is None:
+            self.sportsbook_plugins = {}
+        if self.sportsbook_api_urls is None:
+            self.sportsbook_api_urls = {}
+        if self.sportsbook_site_urls is None:
+            self.sportsbook_site_urls = {}
+        if self.sportsbook_stream_urls is None:
+            self.sportsbook_stream_urls = {}
+        if self.ingestion_feeds is None:
+            self.ingestion_feeds = {}
+
+    def validate(self):
+        """
+        Check values that would break the loop if activated
+
+        Raises:
+            ValueError: If a setting has the wrong type or is out of range
+        """
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if f.type in (int, float) and value is not None:
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    raise ValueError(f"{f.name} must be a number, got {value!r}")
+
+        if self.total_bet_amount <= 0:
+            raise ValueError("total_bet_amount must be positive")
+        if self.refresh_interval_seconds < 0:
+            raise ValueError("refresh_interval_seconds must not be negative")
+        if self.max_opportunities_per_tick < 1:
+            raise ValueError("max_opportunities_per_tick must be at least 1")
+        if self.max_stake_per_bet is not None and self.max_stake_per_bet <= 0:
+            raise ValueError("max_stake_per_bet must be positive")
+        if self.stake_rounding <= 0:
+            raise ValueError("stake_rounding must be positive")
+        if self.memory_check_ticks < 0:
+            raise ValueError("memory_check_ticks must not be negative")
+        if self.max_game_key_cache < 1 or self.max_pending_events < 1:
+            raise ValueError(
+                "max_game_key_cache and max_pending_events must be at least 1"
+            )
+        for sportsbook, balance in self.book_balances.items():
+            if balance < 0:
+                raise ValueError(f"book_balances[{sportsbook!r}] must not be negative")
+
+    def reloadable_changes(self, other: "Settings") -> Dict[str, object]:
+        """Reloadable settings whose value differs in `other`"""
+        return {
+            name: getattr(other, name)
+            for name in RELOADABLE_SETTINGS
+            if getattr(other, name) != getattr(self, name)
+        }
+
+    def restart_changes(self, other: "Settings") -> List[str]:
+        """Names of changed settings that need a restart to take effect"""
+        return [
+            f.name
+            for f in fields(self)
+            if f.name not in RELOADABLE_SETTINGS
+            and getattr(other, f.name) != getattr(self, f.name)
+        ]
+
+    @classmethod
+    def load(cls, config_file: str) -> "Settings":
+        """
+        Load and validate settings from a JSON file
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If it is not valid JSON or a setting is invalid
+            TypeError: If it contains unknown settings
+        """
+        with open(config_file, "r") as f:
+            config_data = json.load(f)
+        settings = cls(**config_data)
+        settings.validate()
+        return settings
 
     @classmethod
     def from_file(cls, config_file: str = "config/settings.json") -> "Settings":
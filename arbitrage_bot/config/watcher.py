@@ -0,0 +1,93 @@
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigWatcher:
+    """
+    Watches config files and prepares validated reloads off the loop thread
+
+    A background thread polls each file's mtime and size. When one changes,
+    its loader parses and validates it there; only a loaded result is
+    staged, so a broken edit is logged and never activated. The loop calls
+    `take` between ticks to pick up staged results, which is a single
+    attribute swap when nothing changed.
+    """
+
+    def __init__(self, loaders: Dict[str, Callable[[str], Any]], interval: float = 1.0):
+        """
+        Args:
+            loaders: File path -> function that loads and validates it,
+                raising on invalid content
+            interval: Seconds between polls
+        """
+        self.loaders = loaders
+        self.interval = interval
+        self.reloads = 0
+        self.rejected = 0
+
+        self._versions: Dict[str, Optional[Tuple[int, int]]] = {
+            path: self._version(path) for path in loaders
+        }
+        self._staged: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Poll on a background thread"""
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="config-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop polling"""
+        self._stopping.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def take(self) -> Dict[str, Any]:
+        """Return and clear the loaded results staged since the last call"""
+        if not self._staged:
+            return {}
+        with self._lock:
+            staged, self._staged = self._staged, {}
+        return staged
+
+    def poll(self):
+        """Check every file once, staging any that changed and loaded cleanly"""
+        for path, loader in self.loaders.items():
+            version = self._version(path)
+            if version == self._versions[path] or version is None:
+                continue
+            self._versions[path] = version
+
+            try:
+                loaded = loader(path)
+            except Exception as e:
+                self.rejected += 1
+                logger.error(f"Not reloading {path}: {e}")
+                continue
+
+            with self._lock:
+                self._staged[path] = loaded
+            self.reloads += 1
+            logger.info(f"Staged reload of {path}")
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            self.poll()
+
+    @staticmethod
+    def _version(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
@@ -1,4 +1,12 @@
 from .detector import ArbitrageDetector
+from .allocator import StakeAllocator
+from .ranking import opportunity_score, top_k
 from .team_mapper import TeamMapper
 
-__all__ = ["ArbitrageDetector", "TeamMapper"]
+__all__ = [
+    "ArbitrageDetector",
+    "StakeAllocator",
+    "TeamMapper",
+    "opportunity_score",
+    "top_k",
+]
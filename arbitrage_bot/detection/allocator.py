@@ -0,0 +1,242 @@
+import logging
+import math
+import time
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models.arbitrage import ArbitrageOpportunity
+from .odds_math import american_to_decimal
+
+logger = logging.getLogger(__name__)
+
+# (sportsbook, team backed, opponent)
+LegKey = Tuple[str, str, str]
+
+
+class StakeAllocator:
+    """
+    Sizes stakes for every current opportunity together
+
+    Each opportunity's stake is split so both outcomes pay the same, which
+    makes its guaranteed return linear in the total staked. Opportunities
+    are then filled best return-per-dollar first, up to the tightest of
+    `total_bet_amount`, the per-leg `max_stake_per_bet` (shared by
+    opportunities that back the same selection), and the remaining balance
+    at each sportsbook. This greedy fill is optimal when only
+    `total_bet_amount` binds; once balances or shared per-leg limits bind,
+    it is a fast heuristic that can fall short of the best allocation. Leg
+    stakes are then rounded down to `stake_rounding`.
+
+    Allocation stops once `time_budget_ms` is spent. The opportunities not
+    reached yet (the lowest returns) get no stake and are counted in
+    `skipped`.
+
+    Stakes of opportunities handed to another process are reserved until
+    the outcome is known, so later batches cannot spend the same balance
+    or exceed `max_stake_per_bet` on a selection already in flight.
+    """
+
+    def __init__(
+        self,
+        total_bet_amount: float = 100.0,
+        book_balances: Dict[str, float] = None,
+        max_stake_per_bet: Optional[float] = None,
+        stake_rounding: float = 0.01,
+        time_budget_ms: float = 1.0,
+    ):
+        self.total_bet_amount = total_bet_amount
+        self.balances = dict(book_balances or {})
+        self.max_stake_per_bet = max_stake_per_bet
+        self.stake_rounding = stake_rounding
+        self.time_budget_ms = time_budget_ms
+        # Opportunities left unallocated because the time budget ran out
+        self.skipped = 0
+
+        # Reservation key -> opportunity, and the stake they hold per leg
+        self._reservations: Dict[str, ArbitrageOpportunity] = {}
+        self._reserved_legs: Dict[LegKey, float] = {}
+
+    def allocate(
+        self, opportunities: List[ArbitrageOpportunity]
+    ) -> List[ArbitrageOpportunity]:
+        """
+        Solve stakes for a batch of opportunities
+
+        Returns:
+            Opportunities with bet amounts and total profit resized, best
+            return first; those that get no stake are dropped
+        """
+        deadline = time.perf_counter() + self.time_budget_ms / 1000
+
+        candidates = []
+        for opportunity in opportunities:
+            decimal1 = american_to_decimal(opportunity.book1_odds)
+            decimal2 = american_to_decimal(opportunity.book2_odds)
+            # Share of the total stake on the first leg, and return per dollar staked
+            share1 = decimal2 / (decimal1 + decimal2)
+            rate = decimal1 * share1 - 1
+            candidates.append((rate, share1, decimal1, decimal2, opportunity))
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+
+        balances = dict(self.balances)
+        leg_stakes: Dict[LegKey, float] = dict(self._reserved_legs)
+        max_stake = self.max_stake_per_bet
+        increment = self.stake_rounding
+        allocated = []
+
+        for index, (rate, share1, decimal1, decimal2, opportunity) in enumerate(
+            candidates
+        ):
+            if index % 32 == 0 and time.perf_counter() > deadline:
+                self.skipped += len(candidates) - index
+                logger.warning(
+                    f"Stake allocation budget exceeded, skipping "
+                    f"{len(candidates) - index} opportunities"
+                )
+                break
+
+            book1 = opportunity.book1
+            book2 = opportunity.book2
+            share2 = 1 - share1
+
+            # Largest total stake every constraint allows
+            total = self.total_bet_amount
+            room1 = balances.get(book1)
+            if room1 is not None:
+                total = min(total, room1 / share1)
+            room2 = balances.get(book2)
+            if room2 is not None:
+                total = min(total, room2 / share2)
+            if max_stake is not None:
+                leg1 = (book1, opportunity.team1, opportunity.team2)
+                leg2 = (book2, opportunity.team2, opportunity.team1)
+                total = min(
+                    total,
+                    (max_stake - leg_stakes.get(leg1, 0.0)) / share1,
+                    (max_stake - leg_stakes.get(leg2, 0.0)) / share2,
+                )
+            if total <= 0:
+                continue
+
+            bet1_amount = total * share1
+            bet2_amount = total * share2
+            if increment:
+                # Small epsilon so 12.999999 rounds to 13 rather than 12.99
+                bet1_amount = round(
+                    math.floor(bet1_amount / increment + 1e-9) * increment, 10
+                )
+                bet2_amount = round(
+                    math.floor(bet2_amount / increment + 1e-9) * increment, 10
+                )
+                if bet1_amount <= 0 or bet2_amount <= 0:
+                    continue
+
+            total_profit = min(bet1_amount * decimal1, bet2_amount * decimal2) - (
+                bet1_amount + bet2_amount
+            )
+            if rate > 0 and total_profit <= 0:
+                # Rounding ate the whole edge
+                continue
+
+            if room1 is not None:
+                balances[book1] = room1 - bet1_amount
+            if room2 is not None:
+                balances[book2] = room2 - bet2_amount
+            if max_stake is not None:
+                leg_stakes[leg1] = leg_stakes.get(leg1, 0.0) + bet1_amount
+                leg_stakes[leg2] = leg_stakes.get(leg2, 0.0) + bet2_amount
+
+            allocated.append(
+                replace(
+                    opportunity,
+                    bet1_amount=bet1_amount,
+                    bet2_amount=bet2_amount,
+                    total_profit=total_profit,
+                )
+            )
+
+        return allocated
+
+    def set_balances(self, book_balances: Dict[str, float]):
+        """Replace the tracked balances, keeping outstanding reservations deducted"""
+        self.balances = dict(book_balances)
+        for opportunity in self._reservations.values():
+            self._deduct(opportunity)
+
+    @property
+    def reservations(self) -> List[str]:
+        """Keys of the reservations still outstanding"""
+        return list(self._reservations)
+
+    def reserve(self, key: str, opportunity: ArbitrageOpportunity):
+        """Hold an allocated opportunity's stakes until `settle` is called"""
+        self._reservations[key] = opportunity
+        self._deduct(opportunity)
+        for leg, amount in self._legs(opportunity):
+            self._reserved_legs[leg] = self._reserved_legs.get(leg, 0.0) + amount
+
+    def settle(self, key: str, books: Iterable[str] = ()) -> bool:
+        """
+        Resolve a reservation, keeping the stakes of the bets that were placed
+
+        Args:
+            key: Reservation key passed to `reserve`
+            books: Sportsbooks whose bet was placed; the other legs' stakes
+                are returned to the balances
+
+        Returns:
+            False if there was no such reservation
+        """
+        opportunity = self._reservations.pop(key, None)
+        if opportunity is None:
+            return False
+
+        books = set(books)
+        for book, amount in (
+            (opportunity.book1, opportunity.bet1_amount),
+            (opportunity.book2, opportunity.bet2_amount),
+        ):
+            if book in self.balances and book not in books:
+                self.balances[book] += amount
+        for leg, amount in self._legs(opportunity):
+            remaining = self._reserved_legs.get(leg, 0.0) - amount
+            if remaining > 1e-9:
+                self._reserved_legs[leg] = remaining
+            else:
+                self._reserved_legs.pop(leg, None)
+        return True
+
+    def _deduct(self, opportunity: ArbitrageOpportunity):
+        if opportunity.book1 in self.balances:
+            self.balances[opportunity.book1] -= opportunity.bet1_amount
+        if opportunity.book2 in self.balances:
+            self.balances[opportunity.book2] -= opportunity.bet2_amount
+
+    @staticmethod
+    def _legs(opportunity: ArbitrageOpportunity) -> List[Tuple[LegKey, float]]:
+        return [
+            (
+                (opportunity.book1, opportunity.team1, opportunity.team2),
+                opportunity.bet1_amount,
+            ),
+            (
+                (opportunity.book2, opportunity.team2, opportunity.team1),
+                opportunity.bet2_amount,
+            ),
+        ]
+
+    def commit(self, opportunity: ArbitrageOpportunity, books: Iterable[str] = None):
+        """
+        Deduct a placed opportunity's stakes from the tracked balances
+
+        Args:
+            opportunity: The placed opportunity
+            books: Sportsbooks whose bet was actually placed (None for both)
+        """
+        books = None if books is None else set(books)
+        for book, amount in (
+            (opportunity.book1, opportunity.bet1_amount),
+            (opportunity.book2, opportunity.bet2_amount),
+        ):
+            if book in self.balances and (books is None or book in books):
+                self.balances[book] -= amount
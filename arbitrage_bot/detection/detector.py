@@ -1,15 +1,30 @@
-from typing import Dict, List, Tuple
+import logging
+import threading
+from typing import Dict, Iterable, Iterator, List, Tuple
 from ..models.odds import GameOdds
 from ..models.arbitrage import ArbitrageOpportunity
+from ..memory import evict_oldest
+from .odds_math import arbitrage_profit_percentage, split_stake
+from .ranking import opportunity_score, top_k
 from .team_mapper import TeamMapper
 
+logger = logging.getLogger(__name__)
+
 
 class ArbitrageDetector:
     """Detects arbitrage opportunities across sportsbooks"""
 
-    def __init__(self, min_profit_percentage: float = -10.0):
+    def __init__(
+        self, min_profit_percentage: float = -10.0, total_bet_amount: float = 100.0
+    ):
         self.min_profit_percentage = min_profit_percentage
+        self.total_bet_amount = total_bet_amount
         self.team_mapper = TeamMapper()
+        # (team1, team2) as listed by a sportsbook -> standardized game key.
+        # Filled from stream threads as well as the loop, so reads and
+        # writes hold the lock
+        self._game_keys: Dict[Tuple[str, str], str] = {}
+        self._game_keys_lock = threading.Lock()
 
     def detect_opportunities(
         self, all_odds: Dict[str, List[GameOdds]]
@@ -23,29 +38,52 @@ class ArbitrageDetector:
         Returns:
             List of ArbitrageOpportunity objects
         """
-        opportunities = []
+        return list(self.iter_opportunities(all_odds))
 
+    def iter_opportunities(
+        self, all_odds: Dict[str, List[GameOdds]]
+    ) -> Iterator[ArbitrageOpportunity]:
+        """
+        Yield arbitrage opportunities as each pair of sportsbooks is checked
+
+        Args:
+            all_odds: Dictionary mapping sportsbook names to lists of GameOdds
+        """
         # Get all unique games across sportsbooks
         all_games = self._get_all_games(all_odds)
 
-        for game in all_games:
-            print(game)
-
         # For each game, check for arbitrage between sportsbooks
-        for game_key in all_games:
-            game_odds = all_games[game_key]
-
+        for game_key, game_odds in all_games.items():
             # Check all pairs of sportsbooks for this game
             for i, odds1 in enumerate(game_odds):
                 for odds2 in game_odds[i + 1 :]:
-                    print(odds1, odds2)
+                    logger.debug("%s %s", odds1, odds2)
                     opportunity = self._check_arbitrage(odds1, odds2)
                     if opportunity:
-                        opportunities.append(opportunity)
+                        yield opportunity
+
+    def detect_top(
+        self,
+        all_odds: Dict[str, List[GameOdds]],
+        k: int,
+        cutoff_percentage: float = None,
+    ) -> Iterator[ArbitrageOpportunity]:
+        """
+        Yield the `k` most profitable opportunities, best first
 
-        print(opportunities)
+        Only `k` opportunities are held at a time. One at or above
+        `cutoff_percentage` is yielded as soon as it is found, so it can be
+        acted on before the rest of the board is scanned; scanning stops
+        once `k` have been yielded.
 
-        return opportunities
+        Args:
+            all_odds: Dictionary mapping sportsbook names to lists of GameOdds
+            k: Maximum number of opportunities to yield
+            cutoff_percentage: Profit at which to yield immediately
+        """
+        return top_k(
+            self.iter_opportunities(all_odds), k, opportunity_score, cutoff_percentage
+        )
 
     def _get_all_games(
         self, all_odds: Dict[str, List[GameOdds]]
@@ -55,15 +93,7 @@ class ArbitrageDetector:
 
         for sportsbook, odds_list in all_odds.items():
             for odds in odds_list:
-                # Standardize team names
-                team1_std = self.team_mapper.standardize_team_name(odds.team1)
-                team2_std = self.team_mapper.standardize_team_name(odds.team2)
-
-                # Create consistent game key (alphabetical order)
-                if team1_std < team2_std:
-                    game_key = f"{team1_std}_vs_{team2_std}"
-                else:
-                    game_key = f"{team2_std}_vs_{team1_std}"
+                game_key = self.get_game_key(odds)
 
                 if game_key not in games:
                     games[game_key] = []
@@ -71,6 +101,63 @@ class ArbitrageDetector:
 
         return games
 
+    def get_game_key(self, odds: GameOdds) -> str:
+        """Build the standardized game key (team1 vs team2) for an odds object"""
+        teams = (odds.team1, odds.team2)
+        with self._game_keys_lock:
+            game_key = self._game_keys.get(teams)
+            if game_key is not None:
+                return game_key
+
+            # Standardize team names
+            team1_std = self.team_mapper.standardize_team_name(odds.team1)
+            team2_std = self.team_mapper.standardize_team_name(odds.team2)
+
+            # Create consistent game key (alphabetical order)
+            if team1_std < team2_std:
+                game_key = f"{team1_std}_vs_{team2_std}"
+            else:
+                game_key = f"{team2_std}_vs_{team1_std}"
+            self._game_keys[teams] = game_key
+            return game_key
+
+    def invalidate_teams(self, team_names: Iterable[str]) -> int:
+        """
+        Drop cached game keys that involve any of these raw team names
+
+        Returns:
+            Number of cached game keys dropped
+        """
+        names = set(team_names)
+        if not names:
+            return 0
+        with self._game_keys_lock:
+            stale = [
+                teams
+                for teams in self._game_keys
+                if teams[0] in names or teams[1] in names
+            ]
+            for teams in stale:
+                del self._game_keys[teams]
+        return len(stale)
+
+    @property
+    def game_key_cache_size(self) -> int:
+        """Number of cached game keys"""
+        return len(self._game_keys)
+
+    def evict_game_keys(self, count: int) -> int:
+        """
+        Drop the `count` oldest cached game keys
+
+        Games still on the board are simply re-keyed on their next lookup.
+
+        Returns:
+            Number of cached game keys dropped
+        """
+        with self._game_keys_lock:
+            return evict_oldest(self._game_keys, count)
+
     def _check_arbitrage(
         self, odds1: GameOdds, odds2: GameOdds
     ) -> ArbitrageOpportunity:
@@ -91,8 +178,6 @@ class ArbitrageDetector:
                     "book2_side": "team2",
                     "book1_odds": odds1.team1_odds,
                     "book2_odds": odds2.team2_odds,
-                    "book1_url": odds1.team1_url,
-                    "book2_url": odds2.team2_url,
                     "team1_std": odds1_team1_std,
                     "team2_std": odds2_team2_std,
                 }
@@ -103,8 +188,6 @@ class ArbitrageDetector:
                     "book2_side": "team1",
                     "book1_odds": odds1.team2_odds,
                     "book2_odds": odds2.team1_odds,
-                    "book1_url": odds1.team2_url,
-                    "book2_url": odds2.team1_url,
                     "team1_std": odds1_team2_std,
                     "team2_std": odds2_team1_std,
                 }
@@ -116,8 +199,6 @@ class ArbitrageDetector:
                     "book2_side": "team1",
                     "book1_odds": odds1.team1_odds,
                     "book2_odds": odds2.team1_odds,
-                    "book1_url": odds1.team1_url,
-                    "book2_url": odds2.team1_url,
                     "team1_std": odds1_team1_std,
                     "team2_std": odds2_team1_std,
                 }
@@ -128,8 +209,6 @@ class ArbitrageDetector:
                     "book2_side": "team2",
                     "book1_odds": odds1.team2_odds,
                     "book2_odds": odds2.team2_odds,
-                    "book1_url": odds1.team2_url,
-                    "book2_url": odds2.team2_url,
                     "team1_std": odds1_team2_std,
                     "team2_std": odds2_team2_std,
                 }
@@ -143,21 +222,19 @@ class ArbitrageDetector:
                 scenario["book1_odds"], scenario["book2_odds"]
             )
 
-            print(profit_pct)
-
-            print(self.min_profit_percentage)
+            logger.debug("%s (min %s)", profit_pct, self.min_profit_percentage)
 
             if profit_pct > best_profit and profit_pct >= self.min_profit_percentage:
                 best_profit = profit_pct
                 best_opportunity = scenario
 
         if best_opportunity:
-            # Calculate bet amounts for $100 total bet
-            total_bet = 100
+            # Calculate bet amounts for the configured total bet; the
+            # StakeAllocator resizes these against balances before execution
             bet1_amount, bet2_amount, total_profit = self._calculate_bet_amounts(
                 best_opportunity["book1_odds"],
                 best_opportunity["book2_odds"],
-                total_bet,
+                self.total_bet_amount,
             )
 
             return ArbitrageOpportunity(
@@ -165,8 +242,9 @@ class ArbitrageDetector:
                 team2=best_opportunity["team2_std"],
                 book1=odds1.sportsbook,
                 book2=odds2.sportsbook,
-                book1_url=best_opportunity["book1_url"],
-                book2_url=best_opportunity["book2_url"],
+                # Deep links are only built for lines that become opportunities
+                book1_url=odds1.url_for(best_opportunity["book1_side"]),
+                book2_url=odds2.url_for(best_opportunity["book2_side"]),
                 book1_odds=best_opportunity["book1_odds"],
                 book2_odds=best_opportunity["book2_odds"],
                 profit_percentage=best_profit,
@@ -179,46 +257,10 @@ class ArbitrageDetector:
 
     def _calculate_arbitrage_profit(self, odds1: float, odds2: float) -> float:
         """Calculate arbitrage profit percentage"""
-        # Convert American odds to probability of winning
-        if odds1 > 0:
-            prob1 = 100 / (odds1 + 100)
-        else:
-            prob1 = abs(odds1) / (abs(odds1) + 100)
-
-        if odds2 > 0:
-            prob2 = 100 / (odds2 + 100)
-        else:
-            prob2 = abs(odds2) / (abs(odds2) + 100)
-
-        # Calculate arbitrage profit percentage
-        total_probability = prob1 + prob2
-        profit_percentage = (1 - total_probability) * 100
-
-        return profit_percentage
+        return arbitrage_profit_percentage(odds1, odds2)
 
     def _calculate_bet_amounts(
         self, odds1: float, odds2: float, total_bet: float
     ) -> Tuple[float, float, float]:
         """Calculate optimal bet amounts for arbitrage"""
-        # Convert American odds to decimal
-        if odds1 > 0:
-            decimal1 = (odds1 / 100) + 1
-        else:
-            decimal1 = (100 / abs(odds1)) + 1
-
-        if odds2 > 0:
-            decimal2 = (odds2 / 100) + 1
-        else:
-            decimal2 = (100 / abs(odds2)) + 1
-
-        # Calculate bet amounts
-        bet1_amount = (total_bet * decimal2) / (decimal1 + decimal2)
-        bet2_amount = total_bet - bet1_amount
-
-        # Calculate profit
-        profit1 = (bet1_amount * decimal1) - total_bet
-        profit2 = (bet2_amount * decimal2) - total_bet
-
-        total_profit = min(profit1, profit2)
-
-        return bet1_amount, bet2_amount, total_profit
+        return split_stake(odds1, odds2, total_bet)
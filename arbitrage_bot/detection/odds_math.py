@@ -0,0 +1,113 @@
+from typing import Iterable, List, Tuple
+
+# American prices in [-MAX_TABLE_ODDS, MAX_TABLE_ODDS] are served from
+# precomputed tables; anything else (non-integer or out of range) is computed
+MAX_TABLE_ODDS = 10000
+
+
+def _decimal(odds: float) -> float:
+    if odds > 0:
+        return (odds / 100) + 1
+    return (100 / abs(odds)) + 1
+
+
+def _probability(odds: float) -> float:
+    if odds > 0:
+        return 100 / (odds + 100)
+    return abs(odds) / (abs(odds) + 100)
+
+
+# Keyed by int; integral floats such as 150.0 hash equal and hit the same entry.
+# Built with the same expressions as _decimal/_probability (so values are
+# identical) but without a function call per entry, to keep import fast.
+_NEGATIVE = range(-MAX_TABLE_ODDS, 0)
+_POSITIVE = range(1, MAX_TABLE_ODDS + 1)
+_DECIMAL = dict(zip(_NEGATIVE, [(100 / -odds) + 1 for odds in _NEGATIVE]))
+_DECIMAL.update(zip(_POSITIVE, [(odds / 100) + 1 for odds in _POSITIVE]))
+_PROBABILITY = dict(zip(_NEGATIVE, [-odds / (-odds + 100) for odds in _NEGATIVE]))
+_PROBABILITY.update(zip(_POSITIVE, [100 / (odds + 100) for odds in _POSITIVE]))
+
+
+def american_to_decimal(odds: float) -> float:
+    """Convert American odds to a decimal price (stake included)"""
+    decimal = _DECIMAL.get(odds)
+    if decimal is None:
+        return _decimal(odds)
+    return decimal
+
+
+def american_to_probability(odds: float) -> float:
+    """Convert American odds to the implied probability of winning"""
+    probability = _PROBABILITY.get(odds)
+    if probability is None:
+        return _probability(odds)
+    return probability
+
+
+def decimal_to_american(decimal: float) -> float:
+    """Convert a decimal price to American odds"""
+    if decimal >= 2:
+        return (decimal - 1) * 100
+    return -100 / (decimal - 1)
+
+
+def decimal_to_probability(decimal: float) -> float:
+    """Convert a decimal price to its implied probability"""
+    return 1 / decimal
+
+
+def probability_to_decimal(probability: float) -> float:
+    """Convert an implied probability to a decimal price"""
+    return 1 / probability
+
+
+def probability_to_american(probability: float) -> float:
+    """Convert an implied probability to American odds"""
+    return decimal_to_american(1 / probability)
+
+
+def _convert_many(odds: Iterable[float], table: dict, convert) -> List[float]:
+    odds = list(odds)
+    converted = list(map(table.get, odds))
+    # Only non-integer or out-of-range prices miss the table
+    if None in converted:
+        for index, value in enumerate(converted):
+            if value is None:
+                converted[index] = convert(odds[index])
+    return converted
+
+
+def american_to_decimal_many(odds: Iterable[float]) -> List[float]:
+    """Convert a column of American odds (list, array or memoryview) at once"""
+    return _convert_many(odds, _DECIMAL, _decimal)
+
+
+def american_to_probability_many(odds: Iterable[float]) -> List[float]:
+    """Convert a column of American odds to implied probabilities at once"""
+    return _convert_many(odds, _PROBABILITY, _probability)
+
+
+def arbitrage_profit_percentage(odds1: float, odds2: float) -> float:
+    """Guaranteed profit percentage of backing both sides of a two-way market"""
+    return (1 - (american_to_probability(odds1) + american_to_probability(odds2))) * 100
+
+
+def split_stake(
+    odds1: float, odds2: float, total_bet: float
+) -> Tuple[float, float, float]:
+    """
+    Split a total stake so both outcomes pay the same
+
+    Returns:
+        Tuple of (bet1_amount, bet2_amount, guaranteed profit)
+    """
+    decimal1 = american_to_decimal(odds1)
+    decimal2 = american_to_decimal(odds2)
+
+    bet1_amount = (total_bet * decimal2) / (decimal1 + decimal2)
+    bet2_amount = total_bet - bet1_amount
+
+    profit1 = (bet1_amount * decimal1) - total_bet
+    profit2 = (bet2_amount * decimal2) - total_bet
+
+    return bet1_amount, bet2_amount, min(profit1, profit2)
@@ -0,0 +1,79 @@
+import heapq
+import time
+from typing import Callable, Iterable, Iterator, List, Tuple, TypeVar
+
+from arbitrage_bot.models.arbitrage import ArbitrageOpportunity
+
+T = TypeVar("T")
+
+# Percentage points of profit an opportunity loses per second of age
+STALENESS_PENALTY = 0.1
+
+
+def opportunity_score(
+    opportunity: ArbitrageOpportunity,
+    detected_at: float = None,
+    now: float = None,
+    staleness_penalty: float = STALENESS_PENALTY,
+) -> float:
+    """
+    Rank an opportunity by profit, discounted for how long ago it was seen
+
+    Older prices are more likely to have moved by the time the bets land,
+    so each second of age costs `staleness_penalty` percentage points.
+    """
+    if detected_at is None:
+        return opportunity.profit_percentage
+    age = max(0.0, (time.time() if now is None else now) - detected_at)
+    return opportunity.profit_percentage - staleness_penalty * age
+
+
+def top_k(
+    items: Iterable[T],
+    k: int,
+    score: Callable[[T], float],
+    cutoff: float = None,
+) -> Iterator[T]:
+    """
+    Yield the `k` best items of a stream, best first, in O(k) memory
+
+    Items scoring at least `cutoff` are yielded as soon as they are seen,
+    so a caller can act on a clearly good item before the rest of the
+    stream has been produced. They count toward `k`, and once `k` items
+    have been yielded the stream is not consumed any further. Everything
+    else is held in a bounded min-heap and yielded, best first, when the
+    stream ends. Ties go to the item seen first.
+
+    Args:
+        items: Stream of candidates (e.g. a detector generator)
+        k: Maximum number of items to yield
+        score: Higher is better
+        cutoff: Score at which an item is yielded immediately (None waits
+            for the whole stream)
+    """
+    if k <= 0:
+        return
+
+    # (score, -sequence, item): the root is the worst kept candidate
+    heap: List[Tuple[float, int, T]] = []
+    remaining = k
+    for sequence, item in enumerate(items):
+        value = score(item)
+
+        if cutoff is not None and value >= cutoff:
+            yield item
+            remaining -= 1
+            if remaining == 0:
+                return
+            while len(heap) > remaining:
+                heapq.heappop(heap)
+            continue
+
+        if len(heap) < remaining:
+            heapq.heappush(heap, (value, -sequence, item))
+        elif heap and value > heap[0][0]:
+            heapq.heapreplace(heap, (value, -sequence, item))
+
+    heap.sort(reverse=True)
+    for _, _, item in heap:
+        yield item
@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, Set
 import json
 import os
 
@@ -18,13 +18,65 @@ class TeamMapper:
 
         if os.path.exists(self.mappings_file):
             try:
-                with open(self.mappings_file, "r") as f:
-                    return json.load(f)
+                return self.load_mappings_file(self.mappings_file)
             except:
                 return default_mappings
         else:
             return default_mappings
 
+    @staticmethod
+    def load_mappings_file(path: str) -> Dict[str, str]:
+        """
+        Read and validate a mappings file without activating it
+
+        Chains (A -> B, B -> C) are resolved so every name maps straight to
+        its standardized form.
+
+        Raises:
+            ValueError: If the file is not a JSON object of non-empty
+                strings, or the mappings contain a cycle
+        """
+        with open(path, "r") as f:
+            mappings = json.load(f)
+
+        if not isinstance(mappings, dict):
+            raise ValueError(f"{path}: expected a JSON object of team name mappings")
+        for name, standard in mappings.items():
+            if (
+                not isinstance(standard, str)
+                or not name.strip()
+                or not standard.strip()
+            ):
+                raise ValueError(f"{path}: invalid mapping {name!r} -> {standard!r}")
+
+        resolved = {}
+        for name in mappings:
+            seen = {name}
+            standard = mappings[name]
+            while standard in mappings and standard != mappings[standard]:
+                if standard in seen:
+                    raise ValueError(f"{path}: mapping cycle through {name!r}")
+                seen.add(standard)
+                standard = mappings[standard]
+            resolved[name] = standard
+        return resolved
+
+    def swap_mappings(self, mappings: Dict[str, str]) -> Set[str]:
+        """
+        Activate a validated mapping in one assignment
+
+        Returns:
+            Raw team names whose standardized form changed
+        """
+        previous = self.team_mappings
+        changed = {
+            name
+            for name in previous.keys() | mappings.keys()
+            if previous.get(name, name) != mappings.get(name, name)
+        }
+        self.team_mappings = mappings
+        return changed
+
     def standardize_team_name(self, team_name: str) -> str:
         """Convert team name to standardized format"""
         return self.team_mappings.get(team_name, team_name)
@@ -0,0 +1,4 @@
+from .segment import Segment
+from .store import HistoryLine, HistoryReader, HistoryRecorder
+
+__all__ = ["Segment", "HistoryLine", "HistoryReader", "HistoryRecorder"]
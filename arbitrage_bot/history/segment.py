@@ -0,0 +1,171 @@
+import json
+import mmap
+import os
+import struct
+from array import array
+from typing import Dict, Tuple
+
+MAGIC = b"ODDSHIST"
+VERSION = 1
+
+# magic, version, capacity, count
+_HEADER = struct.Struct("<8sIIQ")
+HEADER_SIZE = 64
+
+# Column name, memoryview format, item size
+COLUMNS = (
+    ("timestamp", "d", 8),
+    ("team1_odds", "d", 8),
+    ("team2_odds", "d", 8),
+    ("line_id", "I", 4),
+)
+ROW_SIZE = sum(size for _, _, size in COLUMNS)
+
+
+def capacity_for(segment_bytes: int) -> int:
+    """Number of rows that fit in a segment file of the given size"""
+    return max(1, (segment_bytes - HEADER_SIZE) // ROW_SIZE)
+
+
+class Segment:
+    """
+    Fixed-capacity, memory-mapped columnar segment of odds changes
+
+    The file is preallocated to its full size and laid out as a header
+    followed by one contiguous block per column, so every column can be read
+    as a zero-copy memoryview. When a segment is sealed, a sidecar index
+    groups its row numbers by line id.
+    """
+
+    def __init__(self, path: str, capacity: int = None, writable: bool = False):
+        self.path = path
+        self.writable = writable
+
+        if writable and not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.truncate(HEADER_SIZE + capacity * ROW_SIZE)
+                f.write(_HEADER.pack(MAGIC, VERSION, capacity, 0))
+
+        self._file = open(path, "r+b" if writable else "rb")
+        self._mmap = mmap.mmap(
+            self._file.fileno(),
+            0,
+            access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ,
+        )
+
+        magic, version, self.capacity, self._count = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not an odds history segment")
+
+        self._columns: Dict[str, memoryview] = {}
+        offset = HEADER_SIZE
+        buffer = memoryview(self._mmap)
+        for name, fmt, size in COLUMNS:
+            end = offset + self.capacity * size
+            self._columns[name] = buffer[offset:end].cast(fmt)
+            offset = end
+        buffer.release()
+
+        self._index: Dict[int, array] = {}
+        self._sealed_index = None
+
+    @property
+    def count(self) -> int:
+        if not self.writable:
+            self._count = _HEADER.unpack_from(self._mmap)[3]
+        return self._count
+
+    @property
+    def full(self) -> bool:
+        return self._count >= self.capacity
+
+    @property
+    def index_path(self) -> str:
+        return f"{self.path}.idx"
+
+    def append(
+        self, timestamp: float, line_id: int, team1_odds: float, team2_odds: float
+    ):
+        """Append one row; the caller rotates before the segment is full"""
+        row = self._count
+        self._columns["timestamp"][row] = timestamp
+        self._columns["line_id"][row] = line_id
+        self._columns["team1_odds"][row] = team1_odds
+        self._columns["team2_odds"][row] = team2_odds
+        self._index.setdefault(line_id, array("I")).append(row)
+        self._count = row + 1
+
+    def commit(self):
+        """Publish appended rows to readers by updating the header count"""
+        struct.pack_into("<Q", self._mmap, 16, self._count)
+
+    def column(self, name: str) -> memoryview:
+        """Zero-copy view of a column's populated rows"""
+        return self._columns[name][: self.count]
+
+    def rows_for(self, line_id: int) -> memoryview:
+        """Zero-copy view of the row numbers recorded for a line"""
+        offsets, rows = self._load_index()
+        if line_id not in offsets:
+            return memoryview(array("I"))
+        start, count = offsets[line_id]
+        return rows[start : start + count]
+
+    def seal(self):
+        """Write the line index sidecar (rows grouped by line id)"""
+        self.commit()
+        rows = array("I")
+        offsets = {}
+        for line_id, line_rows in self._index.items():
+            offsets[line_id] = (len(rows), len(line_rows))
+            rows.extend(line_rows)
+
+        with open(self.index_path, "wb") as f:
+            header = json.dumps({str(k): v for k, v in offsets.items()}).encode()
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            f.write(rows.tobytes())
+
+    def _load_index(self) -> Tuple[Dict[int, Tuple[int, int]], memoryview]:
+        if self._sealed_index is not None:
+            return self._sealed_index
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as f:
+                data = f.read()
+            (header_size,) = struct.unpack_from("<I", data)
+            header = json.loads(data[4 : 4 + header_size])
+            offsets = {int(k): tuple(v) for k, v in header.items()}
+            self._sealed_index = offsets, memoryview(data)[4 + header_size :].cast("I")
+            return self._sealed_index
+
+        # Segment still being written: index its populated rows on the fly
+        grouped = self._index if self.writable else {}
+        if not self.writable:
+            for row, line_id in enumerate(self.column("line_id")):
+                grouped.setdefault(line_id, array("I")).append(row)
+
+        rows = array("I")
+        offsets = {}
+        for line_id, line_rows in grouped.items():
+            offsets[line_id] = (len(rows), len(line_rows))
+            rows.extend(line_rows)
+        return offsets, memoryview(rows)
+
+    def close(self):
+        """
+        Release the column views and unmap the file
+
+        Slices handed out by column() keep the mapping alive until they are
+        released, in which case unmapping is left to garbage collection.
+        """
+        if self.writable:
+            self.commit()
+        for view in self._columns.values():
+            view.release()
+        self._columns = {}
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+        self._file.close()
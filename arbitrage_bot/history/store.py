@@ -0,0 +1,300 @@
+import json
+import logging
+import math
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from arbitrage_bot.history.segment import Segment, capacity_for
+from arbitrage_bot.models.odds import GameOdds
+from arbitrage_bot.models.sportsbooks import Sportsbook
+
+logger = logging.getLogger(__name__)
+
+LINES_FILE = "lines.jsonl"
+SEGMENT_SUFFIX = ".odds"
+
+
+@dataclass(frozen=True)
+class HistoryLine:
+    """Dictionary entry for one sportsbook's line on one game"""
+
+    line_id: int
+    game_key: str
+    sportsbook: str
+    market: str
+    team1: str
+    team2: str
+
+
+def _day(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d")
+
+
+class HistoryRecorder:
+    """
+    Append-only recorder of odds changes
+
+    The live loop hands each fetched board to `record`, which looks up the
+    lines' game keys (on the caller's thread, so `game_key` is never called
+    from the writer) and enqueues it. A background thread diffs it against the last recorded prices and
+    appends the changed lines (NaN prices when a line leaves the board) to
+    memory-mapped segment files under `<directory>/<YYYY-MM-DD>/`, rotating
+    to a new segment when the current one is full.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        game_key: Callable[[GameOdds], str],
+        segment_bytes: int = 64 * 1024 * 1024,
+        queue_size: int = 1000,
+    ):
+        self.directory = directory
+        self.game_key = game_key
+        self.capacity = capacity_for(segment_bytes)
+        self.dropped_batches = 0
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+
+        # Writer-thread state
+        self._day: Optional[str] = None
+        self._segment: Optional[Segment] = None
+        self._segment_number = 0
+        self._lines: Dict[Tuple[str, str, str, str], int] = {}
+        self._lines_file = None
+        self._last_prices: Dict[int, Tuple[float, float]] = {}
+        self._book_lines: Dict[str, set] = {}
+
+    def start(self):
+        """Start the background writer thread"""
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(
+            target=self._run, name="history-recorder", daemon=True
+        )
+        self._thread.start()
+
+    def record(
+        self, sportsbook: Sportsbook, odds_list: List[GameOdds], timestamp: float = None
+    ):
+        """Queue a sportsbook's full board for recording (never blocks)"""
+        game_keys = [self.game_key(odds) for odds in odds_list]
+        try:
+            self._queue.put_nowait(
+                (timestamp or time.time(), sportsbook, odds_list, game_keys)
+            )
+        except queue.Full:
+            self.dropped_batches += 1
+            logger.warning(f"History queue full, dropped board from {sportsbook}")
+
+    @property
+    def pending(self) -> int:
+        """Number of boards queued for the writer"""
+        return self._queue.qsize()
+
+    def stop(self, timeout: float = 5.0):
+        """Flush pending boards and seal the current segment"""
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                break
+            try:
+                self._write_board(*batch)
+                # Publish everything recorded so far to readers
+                if self._queue.empty() and self._segment:
+                    self._segment.commit()
+            except Exception as e:
+                logger.error(f"Error recording odds history: {e}")
+
+        self._close_day()
+
+    def _write_board(
+        self,
+        timestamp: float,
+        sportsbook: Sportsbook,
+        odds_list: List[GameOdds],
+        game_keys: List[str],
+    ):
+        day = _day(timestamp)
+        if day != self._day:
+            self._open_day(day)
+
+        live = set()
+        for odds, game_key in zip(odds_list, game_keys):
+            line_id = self._line_id(sportsbook, odds, game_key)
+            live.add(line_id)
+            prices = (float(odds.team1_odds), float(odds.team2_odds))
+            if self._last_prices.get(line_id) != prices:
+                self._append(timestamp, line_id, prices)
+
+        for line_id in self._book_lines.get(sportsbook, set()) - live:
+            if line_id in self._last_prices:
+                self._append(timestamp, line_id, (math.nan, math.nan))
+                del self._last_prices[line_id]
+        self._book_lines[sportsbook] = live
+
+    def _append(self, timestamp: float, line_id: int, prices: Tuple[float, float]):
+        if self._segment is None or self._segment.full:
+            self._rotate()
+        self._segment.append(timestamp, line_id, *prices)
+        if not math.isnan(prices[0]):
+            self._last_prices[line_id] = prices
+
+    def _line_id(self, sportsbook: Sportsbook, odds: GameOdds, game_key: str) -> int:
+        key = (str(sportsbook), odds.market, odds.team1, odds.team2)
+        line_id = self._lines.get(key)
+        if line_id is None:
+            line_id = len(self._lines)
+            self._lines[key] = line_id
+            entry = {
+                "line_id": line_id,
+                "game_key": game_key,
+                "sportsbook": str(sportsbook),
+                "market": odds.market,
+                "team1": odds.team1,
+                "team2": odds.team2,
+            }
+            self._lines_file.write(json.dumps(entry) + "\n")
+            self._lines_file.flush()
+        return line_id
+
+    def _open_day(self, day: str):
+        self._close_day()
+        self._day = day
+        day_directory = os.path.join(self.directory, day)
+        os.makedirs(day_directory, exist_ok=True)
+
+        # Resume an existing day: reload its line dictionary and segment count
+        self._lines = {}
+        lines_path = os.path.join(day_directory, LINES_FILE)
+        if os.path.exists(lines_path):
+            with open(lines_path) as f:
+                for row in f:
+                    entry = json.loads(row)
+                    key = (
+                        entry["sportsbook"],
+                        entry["market"],
+                        entry["team1"],
+                        entry["team2"],
+                    )
+                    self._lines[key] = entry["line_id"]
+        self._lines_file = open(lines_path, "a")
+        self._segment_number = len(
+            [
+                name
+                for name in os.listdir(day_directory)
+                if name.endswith(SEGMENT_SUFFIX)
+            ]
+        )
+        self._last_prices = {}
+        self._book_lines = {}
+
+    def _close_day(self):
+        if self._segment:
+            self._segment.seal()
+            self._segment.close()
+            self._segment = None
+        if self._lines_file:
+            self._lines_file.close()
+            self._lines_file = None
+
+    def _rotate(self):
+        if self._segment:
+            self._segment.seal()
+            self._segment.close()
+        self._segment_number += 1
+        path = os.path.join(
+            self.directory,
+            self._day,
+            f"segment-{self._segment_number:05d}{SEGMENT_SUFFIX}",
+        )
+        self._segment = Segment(path, self.capacity, writable=True)
+
+
+class HistoryReader:
+    """Read-only access to recorded odds history"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def days(self) -> List[str]:
+        """Get every recorded day (YYYY-MM-DD), oldest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            name
+            for name in os.listdir(self.directory)
+            if os.path.exists(os.path.join(self.directory, name, LINES_FILE))
+        )
+
+    def lines(self, day: str) -> Dict[int, HistoryLine]:
+        """Get the line dictionary for a day"""
+        lines = {}
+        with open(os.path.join(self.directory, day, LINES_FILE)) as f:
+            for row in f:
+                entry = json.loads(row)
+                lines[entry["line_id"]] = HistoryLine(**entry)
+        return lines
+
+    def find_lines(
+        self, day: str, game_key: str = None, sportsbook: str = None
+    ) -> List[HistoryLine]:
+        """Find a day's lines by game and/or sportsbook"""
+        return [
+            line
+            for line in self.lines(day).values()
+            if (game_key is None or line.game_key == game_key)
+            and (sportsbook is None or line.sportsbook == sportsbook)
+        ]
+
+    def segments(self, day: str) -> List[Segment]:
+        """Open a day's segments read-only, in recording order"""
+        day_directory = os.path.join(self.directory, day)
+        return [
+            Segment(os.path.join(day_directory, name))
+            for name in sorted(os.listdir(day_directory))
+            if name.endswith(SEGMENT_SUFFIX)
+        ]
+
+    def iter_records(self, day: str) -> Iterator[Tuple[float, int, float, float]]:
+        """
+        Iterate a day's changes in recording order
+
+        Yields:
+            (timestamp, line_id, team1_odds, team2_odds); NaN odds mean the
+            line left the board
+        """
+        for segment in self.segments(day):
+            timestamps = segment.column("timestamp")
+            line_ids = segment.column("line_id")
+            team1_odds = segment.column("team1_odds")
+            team2_odds = segment.column("team2_odds")
+            yield from zip(timestamps, line_ids, team1_odds, team2_odds)
+            for view in (timestamps, line_ids, team1_odds, team2_odds):
+                view.release()
+            segment.close()
+
+    def line_history(
+        self, day: str, line_id: int
+    ) -> Iterator[Tuple[float, float, float]]:
+        """Iterate one line's (timestamp, team1_odds, team2_odds) changes"""
+        for segment in self.segments(day):
+            timestamps = segment.column("timestamp")
+            team1_odds = segment.column("team1_odds")
+            team2_odds = segment.column("team2_odds")
+            for row in segment.rows_for(line_id):
+                yield timestamps[row], team1_odds[row], team2_odds[row]
+            for view in (timestamps, team1_odds, team2_odds):
+                view.release()
+            segment.close()
@@ -4,6 +4,7 @@ Arbitrage Sports Betting Bot
 Main entry point for the arbitrage detection and execution system.
 """
 
+import argparse
 import sys
 import os
 
@@ -16,18 +17,32 @@ from arbitrage_bot.config import Settings
 
 def main():
     """Main entry point for the arbitrage bot"""
+    parser = argparse.ArgumentParser(description="Arbitrage Sports Betting Bot")
+    parser.add_argument(
+        "--config", default="config/settings.json", help="Settings file"
+    )
+    parser.add_argument(
+        "--executor",
+        action="store_true",
+        help="Place bets claimed from the execution queue instead of detecting",
+    )
+    args = parser.parse_args()
+
     print("Starting Arbitrage Sports Betting Bot...")
     print("=" * 50)
 
     # Load settings
-    settings = Settings.from_file()
+    settings = Settings.from_file(args.config)
     print(f"Loaded settings: {settings}")
 
     # Create and run orchestrator
-    orchestrator = ArbitrageOrchestrator(settings)
+    orchestrator = ArbitrageOrchestrator(settings, config_file=args.config)
 
     try:
-        orchestrator.run_continuous_loop()
+        if args.executor:
+            orchestrator.run_executor_loop()
+        else:
+            orchestrator.run_continuous_loop()
     except KeyboardInterrupt:
         print("\nBot stopped by user.")
     except Exception as e:
@@ -0,0 +1,245 @@
+import gc
+import logging
+import os
+import sys
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice, pairwise
+from typing import Callable, Deque, Dict, List, Optional
+
+from arbitrage_bot.models.stats import LoopStats
+
+logger = logging.getLogger(__name__)
+
+# Allocations made by the tracer itself and by imports are not leaks
+_TRACE_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def current_rss_bytes() -> int:
+    """
+    Resident set size of this process
+
+    Read from /proc where available. Elsewhere the peak RSS reported by
+    getrusage is the closest portable figure, and 0 means unknown.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def evict_oldest(mapping: Dict, count: int) -> int:
+    """
+    Drop the `count` oldest entries of an insertion-ordered dict
+
+    Safe against other threads inserting concurrently: the keys are copied
+    in one step and entries that are already gone are skipped.
+
+    Returns:
+        Number of entries dropped
+    """
+    keys = list(islice(mapping, max(0, count)))
+    return sum(mapping.pop(key, None) is not None for key in keys)
+
+
+@dataclass
+class BoundedResource:
+    """A cache or queue the governor watches"""
+
+    name: str
+    size: Callable[[], int]
+    # None only reports the size (the resource bounds itself)
+    limit: Optional[int] = None
+    # Called with the number of entries to drop; returns how many it dropped
+    evict: Optional[Callable[[int], int]] = None
+
+
+class MemoryGovernor:
+    """
+    Keeps a long-running loop's memory flat
+
+    Every `check_ticks` ticks the governor samples RSS, trims each
+    registered cache or queue back to its limit and, with
+    `trace_allocations`, diffs a tracemalloc snapshot against the previous
+    one to find the source lines whose allocations keep growing. Results go
+    into the loop stats, so they are served by the query API with
+    everything else.
+
+    RSS rising at every one of `leak_checks` checks in a row, by more than
+    `leak_growth_bytes` in total, is logged as a suspected leak along with
+    the top growing allocation sites. Above
+    `rss_limit_bytes` every evictable resource is cut to half its limit and
+    a full garbage collection is run.
+    """
+
+    def __init__(
+        self,
+        check_ticks: int = 100,
+        trace_allocations: bool = False,
+        top_allocations: int = 10,
+        rss_limit_bytes: int = None,
+        leak_checks: int = 5,
+        leak_growth_bytes: int = 1024 * 1024,
+    ):
+        self.check_ticks = check_ticks
+        self.trace_allocations = trace_allocations
+        self.top_allocations = top_allocations
+        self.rss_limit_bytes = rss_limit_bytes
+        self.leak_checks = leak_checks
+        self.leak_growth_bytes = leak_growth_bytes
+
+        self.resources: Dict[str, BoundedResource] = {}
+        self.evictions: Dict[str, int] = {}
+        self.checks = 0
+        self.peak_rss_bytes = 0
+
+        self._recent_rss: Deque[int] = deque(maxlen=leak_checks + 1)
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._started_tracing = False
+
+    def register(
+        self,
+        name: str,
+        size: Callable[[], int],
+        limit: int = None,
+        evict: Callable[[int], int] = None,
+    ):
+        """
+        Watch a cache or queue
+
+        Args:
+            name: Name reported in the loop stats
+            size: Returns the current number of entries
+            limit: Entries kept after a check (None only reports the size)
+            evict: Drops the given number of entries, oldest first, and
+                returns how many it dropped (required with a limit)
+        """
+        if limit is not None and evict is None:
+            raise ValueError(f"{name}: a limit needs an evict function")
+        self.resources[name] = BoundedResource(name, size, limit, evict)
+        self.evictions.setdefault(name, 0)
+
+    def start(self):
+        """Start allocation tracing if enabled"""
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self):
+        """Stop allocation tracing if this governor started it"""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._snapshot = None
+
+    def on_tick(self, stats: LoopStats) -> bool:
+        """
+        Run a check if this tick is due for one
+
+        Returns:
+            True if a check ran
+        """
+        if not self.check_ticks or stats.ticks % self.check_ticks:
+            return False
+        self.check(stats)
+        return True
+
+    def check(self, stats: LoopStats):
+        """Sample memory, enforce limits and update `stats`"""
+        self.checks += 1
+        rss = current_rss_bytes()
+
+        over_budget = bool(self.rss_limit_bytes) and rss > self.rss_limit_bytes
+        if over_budget:
+            logger.warning(
+                f"RSS {rss / 2**20:.0f} MiB is over the {self.rss_limit_bytes / 2**20:.0f} MiB "
+                f"limit, trimming caches to half their limits"
+            )
+
+        sizes = {}
+        for resource in self.resources.values():
+            sizes[resource.name] = self._enforce(resource, over_budget)
+
+        if over_budget:
+            gc.collect()
+            rss = current_rss_bytes()
+
+        self.peak_rss_bytes = max(self.peak_rss_bytes, rss)
+        self._recent_rss.append(rss)
+
+        top = self._top_allocations() if tracemalloc.is_tracing() else []
+        if self._leaking():
+            growth = self._recent_rss[-1] - self._recent_rss[0]
+            logger.warning(
+                f"RSS grew {growth / 2**20:.1f} MiB over the last {self.leak_checks} checks "
+                f"(now {rss / 2**20:.1f} MiB), possible leak"
+                + "".join(f"\n  {line}" for line in top)
+            )
+
+        stats.memory_checks = self.checks
+        stats.rss_bytes = rss
+        stats.peak_rss_bytes = self.peak_rss_bytes
+        stats.cache_sizes = sizes
+        stats.cache_evictions = dict(self.evictions)
+        stats.top_allocations = top
+
+        logger.info(
+            f"Memory: RSS {rss / 2**20:.1f} MiB (peak {self.peak_rss_bytes / 2**20:.1f} MiB), "
+            f"{sum(self.evictions.values())} evictions"
+        )
+
+    def _leaking(self) -> bool:
+        recent = self._recent_rss
+        return (
+            self.leak_checks > 0
+            and len(recent) == recent.maxlen
+            and recent[-1] - recent[0] > self.leak_growth_bytes
+            and all(later > earlier for earlier, later in pairwise(recent))
+        )
+
+    def _enforce(self, resource: BoundedResource, over_budget: bool) -> int:
+        size = resource.size()
+        if resource.limit is None:
+            return size
+
+        limit = resource.limit // 2 if over_budget else resource.limit
+        if size > limit:
+            evicted = resource.evict(size - limit)
+            self.evictions[resource.name] += evicted
+            size = resource.size()
+            logger.info(f"Evicted {evicted} entries from {resource.name}")
+        return size
+
+    def _top_allocations(self) -> List[str]:
+        """Allocation sites whose size changed most since the previous check"""
+        snapshot = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+        if self._snapshot is None:
+            statistics = snapshot.statistics("lineno")
+        else:
+            statistics = snapshot.compare_to(self._snapshot, "lineno")
+        self._snapshot = snapshot
+
+        top = []
+        for stat in statistics[: self.top_allocations]:
+            frame = stat.traceback[0]
+            growth = getattr(stat, "size_diff", stat.size)
+            top.append(
+                f"{frame.filename}:{frame.lineno}: {stat.size / 1024:.1f} KiB "
+                f"({growth / 1024:+.1f} KiB), {stat.count} blocks"
+            )
+        return top
@@ -0,0 +1,4 @@
+from .board import MockBoard
+from .server import MockSportsbookServer
+
+__all__ = ["MockBoard", "MockSportsbookServer"]
@@ -0,0 +1,91 @@
+"""
+Mock sportsbook server CLI
+
+    python -m arbitrage_bot.mock --port 8080 --games 200 --latency-ms 50 --error-rate 0.01
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from arbitrage_bot.mock import MockBoard, MockSportsbookServer
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve DraftKings/BetMGM-shaped mock endpoints"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--games", type=int, default=20, help="Live games on the board")
+    parser.add_argument(
+        "--volatility", type=float, default=0.1, help="Chance a line moves per tick"
+    )
+    parser.add_argument(
+        "--tick-seconds", type=float, default=1.0, help="Seconds between price ticks"
+    )
+    parser.add_argument(
+        "--extra-markets",
+        type=int,
+        default=2,
+        help="Non-moneyline markets per game (payload size)",
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of API requests answered with HTTP 500",
+    )
+    parser.add_argument(
+        "--turnover",
+        type=float,
+        default=0.0,
+        help="Chance a game is replaced by a new matchup per tick",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    board = MockBoard(
+        games=args.games,
+        volatility=args.volatility,
+        tick_seconds=args.tick_seconds,
+        extra_markets=args.extra_markets,
+        seed=args.seed,
+        turnover=args.turnover,
+    )
+    server = MockSportsbookServer(
+        board,
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    server.start()
+    print(f"Mock sportsbooks at {server.url}")
+    overrides = {
+        "sportsbook_api_urls": server.api_urls,
+        "sportsbook_site_urls": server.site_urls,
+        "sportsbook_stream_urls": server.stream_urls,
+    }
+    print("Settings overrides:")
+    print(json.dumps(overrides, indent=2))
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
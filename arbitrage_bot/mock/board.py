@@ -0,0 +1,231 @@
+import json
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Tuple
+
+
+@dataclass
+class MockGame:
+    """One simulated live game with independent prices per sportsbook"""
+
+    index: int
+    away: str
+    home: str
+    draftkings: List[int]
+    betmgm: List[int]
+
+
+def _random_price(rng: random.Random) -> int:
+    return rng.choice([-1, 1]) * rng.randint(100, 250)
+
+
+class MockBoard:
+    """
+    Simulated live board shared by the DraftKings and BetMGM mock endpoints
+
+    Each sportsbook's prices move independently: on every tick a line moves
+    with probability `volatility`, so arbitrage opportunities open and close
+    on their own. `extra_markets` adds non-moneyline markets per game to
+    grow the payload without changing the moneyline board. With `turnover`,
+    games finish and are replaced by new matchups, as on a real board over
+    days. Recent price moves are kept in a change log for the streaming
+    endpoints.
+    """
+
+    def __init__(
+        self,
+        games: int = 20,
+        volatility: float = 0.1,
+        tick_seconds: float = 1.0,
+        extra_markets: int = 2,
+        seed: int = 0,
+        turnover: float = 0.0,
+    ):
+        self.volatility = volatility
+        self.tick_seconds = tick_seconds
+        self.extra_markets = extra_markets
+        self.turnover = turnover
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tick = 0
+        self._started = time.monotonic()
+        # (sequence, sportsbook, game index, side, price) per price move
+        self._changes: Deque[Tuple[int, str, int, int, int]] = deque(maxlen=10000)
+        self._sequence = 0
+        self._changed = threading.Condition(self._lock)
+        self.games = [
+            MockGame(
+                index=i,
+                away=f"Away Team {i}",
+                home=f"Home Team {i}",
+                draftkings=[_random_price(self._rng), _random_price(self._rng)],
+                betmgm=[_random_price(self._rng), _random_price(self._rng)],
+            )
+            for i in range(games)
+        ]
+        # Matchups listed so far, including finished ones
+        self.matchups = games
+
+    def advance(self, now: float = None):
+        """Move prices forward to the current tick"""
+        now = time.monotonic() if now is None else now
+        target = (
+            int((now - self._started) / self.tick_seconds)
+            if self.tick_seconds
+            else self._tick + 1
+        )
+        with self._lock:
+            moved = False
+            while self._tick < target:
+                self._tick += 1
+                for game in self.games:
+                    if self.turnover and self._rng.random() < self.turnover:
+                        # The game finished; a new matchup takes its slot
+                        game.away = f"Away Team {self.matchups}"
+                        game.home = f"Home Team {self.matchups}"
+                        self.matchups += 1
+                        moved = True
+                    for sportsbook, prices in (
+                        ("draftkings", game.draftkings),
+                        ("betmgm", game.betmgm),
+                    ):
+                        if self._rng.random() < self.volatility:
+                            price = _random_price(self._rng)
+                            side = self._rng.randrange(2)
+                            prices[side] = price
+                            self._sequence += 1
+                            self._changes.append(
+                                (self._sequence, sportsbook, game.index, side, price)
+                            )
+                            moved = True
+            if moved:
+                self._changed.notify_all()
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the latest price move"""
+        return self._sequence
+
+    def changes_since(
+        self, sequence: int, sportsbook: str, timeout: float = 0.0
+    ) -> Tuple[int, List[Tuple[int, int, int]]]:
+        """
+        Price moves on one sportsbook after `sequence`
+
+        Waits up to `timeout` seconds if there are none yet.
+
+        Returns:
+            Latest sequence number and (game index, side, price) per move
+        """
+        with self._changed:
+            if self._sequence <= sequence and timeout:
+                self._changed.wait(timeout)
+            changes = [
+                (index, side, price)
+                for seq, book, index, side, price in self._changes
+                if seq > sequence and book == sportsbook
+            ]
+            return self._sequence, changes
+
+    @staticmethod
+    def selection_id(sportsbook: str, index: int, side: int) -> str:
+        """Moneyline selection id a game's side has in that sportsbook's payload"""
+        if sportsbook == "draftkings":
+            return f"0QA{30000000 + index}#0_{side}"
+        return str(1000000 + index * 1000 + side)
+
+    def draftkings_payload(self) -> bytes:
+        """Render the board as a DraftKings leagueSubcategory markets payload"""
+        document = {"events": [], "markets": [], "selections": []}
+        with self._lock:
+            for game in self.games:
+                event_id = str(30000000 + game.index)
+                document["events"].append(
+                    {
+                        "id": event_id,
+                        "name": f"{game.away} @ {game.home}",
+                        "status": "STARTED",
+                        "participants": [
+                            {"name": game.away, "venueRole": "Away"},
+                            {"name": game.home, "venueRole": "Home"},
+                        ],
+                        "tags": ["Cards", "SGP", "Live"],
+                    }
+                )
+                markets = [("Moneyline", game.draftkings)] + [
+                    (f"Alternate {k}", [-110, -110]) for k in range(self.extra_markets)
+                ]
+                for k, (market_name, prices) in enumerate(markets):
+                    market_id = f"0QA{event_id}#{k}"
+                    document["markets"].append(
+                        {"id": market_id, "eventId": event_id, "name": market_name}
+                    )
+                    for j, label in enumerate((game.away, game.home)):
+                        document["selections"].append(
+                            {
+                                "id": f"{market_id}_{j}",
+                                "marketId": market_id,
+                                "label": label,
+                                "displayOdds": {
+                                    "american": f"{prices[j]:+d}".replace("-", "−")
+                                },
+                            }
+                        )
+        return json.dumps(document).encode()
+
+    def betmgm_payload(self) -> bytes:
+        """Render the board as a BetMGM bettingoffer/fixtures payload"""
+        document = {"fixtures": []}
+        with self._lock:
+            for game in self.games:
+                fixture = {
+                    "id": f"2:{17000000 + game.index}",
+                    "name": {"value": f"{game.away} at {game.home}"},
+                    "participants": [
+                        {"name": {"value": game.away}},
+                        {"name": {"value": game.home}},
+                    ],
+                }
+                markets = [("Money Line", game.betmgm)] + [
+                    (f"Alternate {k}", [-110, -110]) for k in range(self.extra_markets)
+                ]
+                # Alternate between the two shapes BetMGM uses for markets
+                if game.index % 2:
+                    fixture["games"] = [
+                        {
+                            "id": 900000 + game.index * 100 + k,
+                            "name": {"value": market_name},
+                            "visibility": "Visible",
+                            "results": [
+                                {
+                                    "id": 1000000 + game.index * 1000 + k * 2 + j,
+                                    "name": {"value": team},
+                                    "americanOdds": prices[j],
+                                }
+                                for j, team in enumerate((game.away, game.home))
+                            ],
+                        }
+                        for k, (market_name, prices) in enumerate(markets)
+                    ]
+                else:
+                    fixture["optionMarkets"] = [
+                        {
+                            "id": 900000 + game.index * 100 + k,
+                            "name": {"value": market_name},
+                            "status": "Visible",
+                            "options": [
+                                {
+                                    "id": 1000000 + game.index * 1000 + k * 2 + j,
+                                    "price": {"americanOdds": prices[j]},
+                                }
+                                for j in range(2)
+                            ],
+                        }
+                        for k, (market_name, prices) in enumerate(markets)
+                    ]
+                document["fixtures"].append(fixture)
+        return json.dumps(document).encode()
@@ -0,0 +1,276 @@
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+from arbitrage_bot.mock.board import MockBoard
+
+logger = logging.getLogger(__name__)
+
+STREAM_PATH = "/stream/"
+DRAFTKINGS_API_PATH = (
+    "/sites/US-MI-SB/api/sportscontent/controldata/league/leagueSubcategory/v1/markets"
+)
+BETMGM_API_PATH = "/cds-api/bettingoffer/fixtures"
+
+# XPaths the browser automations use for the betslip clear buttons
+DRAFTKINGS_CLEAR_PATH = "div/div[2]/div/div/div/div/div/div[1]/div[2]/div[2]/div/div/div/div/div/div[1]/div[1]/svg"
+BETMGM_CLEAR_PATH = (
+    "ms-main/div[1]/ng-scrollbar[2]/div/div/div/div/ms-widget-column/ms-widget-slot/"
+    "ms-bet-column/ds-card/ds-tabs-group/div[2]/ds-tab[1]/div[1]/bs-betslip/"
+    "bs-betslip-linear-edit-state/div/div/div/div/bs-betslip-linear-type-list/div/"
+    "bs-digital-picks-linear-toolbar/span/div/span[2]"
+)
+
+
+def _nest(path: str, leaf: str) -> str:
+    """Build nested markup that matches a relative XPath like div/div[2]/span"""
+    steps = path.split("/")
+    html = leaf
+    for step in reversed(steps):
+        tag, _, position = step.partition("[")
+        position = int(position.rstrip("]")) if position else 1
+        siblings = f"<{tag}></{tag}>" * (position - 1)
+        html = f"{siblings}<{tag}>{html}</{tag}>"
+    return html
+
+
+def _betslip_page(
+    title: str, wrapper_id: str, clear_path: str, input_html: str
+) -> bytes:
+    clear = _nest(
+        clear_path,
+        "<button onclick=\"document.querySelector('input').value=''\">Clear</button>",
+    )
+    return (
+        f"<!doctype html><html><head><title>{title}</title></head><body>"
+        f"<h1>{title}</h1>{input_html}"
+        f'<div id="{wrapper_id}">{clear}</div>'
+        "</body></html>"
+    ).encode()
+
+
+DRAFTKINGS_BETSLIP = _betslip_page(
+    "DraftKings Mock Betslip",
+    "dk-betslip-shell__wrapper",
+    DRAFTKINGS_CLEAR_PATH,
+    '<input id="betslip-wager-box__input-0" type="text">',
+)
+BETMGM_BETSLIP = _betslip_page(
+    "BetMGM Mock Betslip",
+    "main-content",
+    BETMGM_CLEAR_PATH,
+    '<input class="stake-input-value" type="text">',
+)
+
+
+class MockSportsbookServer:
+    """
+    Local stand-in for the DraftKings and BetMGM endpoints
+
+    Serves both odds APIs from a shared MockBoard (with ETag/304 support)
+    and minimal betslip pages for the browser automations. Latency, jitter
+    and the fraction of requests that fail with HTTP 500 are configurable.
+
+    `/stream/<sportsbook>` is a server-sent events feed of moneyline price
+    moves in the StreamingOddsFetcher format. `close_streams` drops every
+    open subscription to simulate a feed outage.
+    """
+
+    def __init__(
+        self,
+        board: MockBoard = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        stream_interval: float = 0.05,
+        heartbeat_seconds: float = 5.0,
+    ):
+        self.board = board or MockBoard()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.stream_interval = stream_interval
+        self.heartbeat_seconds = heartbeat_seconds
+
+        self.requests = 0
+        self.errors = 0
+        self.not_modified = 0
+        self.streams = 0
+        self.streamed_prices = 0
+
+        self._stream_generation = 0
+        self._stopping = False
+
+        self._rng = random.Random(seed)
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_urls(self) -> dict:
+        """Settings.sportsbook_api_urls pointing at this server"""
+        return {
+            "draftkings": f"{self.url}{DRAFTKINGS_API_PATH}",
+            "betmgm": f"{self.url}{BETMGM_API_PATH}",
+        }
+
+    @property
+    def stream_urls(self) -> dict:
+        """Settings.sportsbook_stream_urls pointing at this server"""
+        return {
+            "draftkings": f"{self.url}{STREAM_PATH}draftkings",
+            "betmgm": f"{self.url}{STREAM_PATH}betmgm",
+        }
+
+    @property
+    def site_urls(self) -> dict:
+        """Settings.sportsbook_site_urls pointing at this server"""
+        return {"draftkings": self.url, "betmgm": self.url}
+
+    def start(self):
+        """Serve requests on a background thread"""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="mock-sportsbook", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Mock sportsbook server listening on {self.url}")
+
+    def close_streams(self):
+        """End every open stream subscription"""
+        self._stream_generation += 1
+
+    def stop(self):
+        """Stop serving, end streams and close the socket"""
+        self._stopping = True
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def _delay(self):
+        delay = self.latency_ms
+        if self.jitter_ms:
+            delay += self._rng.uniform(0, self.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                path = urlsplit(self.path).path
+                server._delay()
+
+                if path in (DRAFTKINGS_API_PATH, BETMGM_API_PATH):
+                    if server._rng.random() < server.error_rate:
+                        server.errors += 1
+                        self._send(
+                            500, b'{"error": "mock failure"}', "application/json"
+                        )
+                        return
+                    server.board.advance()
+                    if path == DRAFTKINGS_API_PATH:
+                        body = server.board.draftkings_payload()
+                    else:
+                        body = server.board.betmgm_payload()
+                    self._send_payload(body)
+                elif path.startswith(STREAM_PATH):
+                    sportsbook = path[len(STREAM_PATH) :]
+                    if sportsbook not in ("draftkings", "betmgm"):
+                        self._send(404, b"not found", "text/plain")
+                        return
+                    self._stream(sportsbook)
+                elif path.startswith("/event/"):
+                    self._send(200, DRAFTKINGS_BETSLIP, "text/html")
+                elif path.startswith("/en/sports/events/"):
+                    self._send(200, BETMGM_BETSLIP, "text/html")
+                else:
+                    self._send(404, b"not found", "text/plain")
+
+            def _stream(self, sportsbook: str):
+                board = server.board
+                generation = server._stream_generation
+                # Moves after this point are streamed; the subscriber polls
+                # once it has the headers
+                sequence = board.sequence
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                self.wfile.flush()
+                server.streams += 1
+
+                last_write = time.monotonic()
+                try:
+                    while (
+                        not server._stopping and server._stream_generation == generation
+                    ):
+                        board.advance()
+                        sequence, changes = board.changes_since(
+                            sequence, sportsbook, server.stream_interval
+                        )
+                        if changes:
+                            prices = [
+                                {
+                                    "selection_id": board.selection_id(
+                                        sportsbook, index, side
+                                    ),
+                                    "american": price,
+                                }
+                                for index, side, price in changes
+                            ]
+                            self.wfile.write(
+                                b"event: price\ndata: %s\n\n"
+                                % json.dumps(prices).encode()
+                            )
+                            server.streamed_prices += len(prices)
+                        elif time.monotonic() - last_write < server.heartbeat_seconds:
+                            continue
+                        else:
+                            self.wfile.write(b": keep-alive\n\n")
+                        self.wfile.flush()
+                        last_write = time.monotonic()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def _send_payload(self, body: bytes):
+                etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self._send(200, body, "application/json", [("ETag", etag)])
+
+            def _send(
+                self, status: int, body: bytes, content_type: str, headers: List = ()
+            ):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format, *args)
+
+        return Handler
@@ -1,4 +1,15 @@
 from .odds import GameOdds
 from .arbitrage import ArbitrageOpportunity
+from .events import OpportunityEvent, OpportunityEventType
+from .execution import ExecutionJob, ExecutionStep
+from .stats import LoopStats
 
-__all__ = ["GameOdds", "ArbitrageOpportunity"]
+__all__ = [
+    "GameOdds",
+    "ArbitrageOpportunity",
+    "OpportunityEvent",
+    "OpportunityEventType",
+    "ExecutionJob",
+    "ExecutionStep",
+    "LoopStats",
+]
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from enum import StrEnum
+from arbitrage_bot.models.arbitrage import ArbitrageOpportunity
+
+
+class OpportunityEventType(StrEnum):
+    OPENED = "opened"
+    UPDATED = "updated"
+    CLOSED = "closed"
+
+
+@dataclass
+class OpportunityEvent:
+    event_type: OpportunityEventType
+    game_key: str
+    market: str
+    opportunity: ArbitrageOpportunity
+    timestamp: float
+
+    def __str__(self) -> str:
+        return f"[{self.event_type}] {self.opportunity}"
@@ -0,0 +1,38 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from arbitrage_bot.models.arbitrage import ArbitrageOpportunity
+
+
+@dataclass
+class ExecutionStep:
+    """Timing and result of one browser action for one sportsbook"""
+
+    step: str
+    sportsbook: str
+    started_at: float
+    seconds: float
+    success: bool
+    error: Optional[str] = None
+
+
+@dataclass
+class ExecutionJob:
+    """An opportunity in the execution queue, with its lease and result"""
+
+    id: str
+    opportunity: ArbitrageOpportunity
+    enqueued_at: float
+    attempts: int = 0
+    # Set while an executor holds the lease; the token fences late reports
+    # from an executor whose lease already expired
+    worker_id: Optional[str] = None
+    lease_token: Optional[str] = None
+    lease_expires_at: Optional[float] = None
+    # Set once the job is finished
+    outcome: Optional[str] = None
+    started_at: Optional[float] = None
+    seconds: Optional[float] = None
+    steps: List[ExecutionStep] = field(default_factory=list)
+    # Reported after the executor had lost its lease
+    late: bool = False
@@ -1,13 +1,48 @@
-from dataclasses import dataclass
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Optional
 from arbitrage_bot.models.sportsbooks import Sportsbook
 
+MONEYLINE = "moneyline"
+
+
+class BetLinkBuilder(ABC):
+    """Builds a sportsbook's betslip deep link from the ids on a GameOdds"""
+
+    @abstractmethod
+    def build_url(self, odds: "GameOdds", selection_id: str) -> str:
+        pass
+
 
 @dataclass
 class GameOdds:
     sportsbook: Sportsbook
     team1: str
     team2: str
-    team1_url: str
-    team2_url: str
     team1_odds: float
     team2_odds: float
+    market: str = MONEYLINE
+
+    # Compact ids; deep links are only built from these when needed
+    event_id: str = ""
+    event_name: str = ""
+    market_id: str = ""
+    team1_selection_id: str = ""
+    team2_selection_id: str = ""
+    links: Optional[BetLinkBuilder] = field(default=None, compare=False, repr=False)
+
+    @property
+    def team1_url(self) -> str:
+        return self.url_for("team1")
+
+    @property
+    def team2_url(self) -> str:
+        return self.url_for("team2")
+
+    def url_for(self, side: str) -> str:
+        """Deep link for betting on one side ("team1" or "team2")"""
+        if self.links is None:
+            return ""
+        if side == "team1":
+            return self.links.build_url(self, self.team1_selection_id)
+        return self.links.build_url(self, self.team2_selection_id)
@@ -0,0 +1,31 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+import time
+
+
+@dataclass
+class LoopStats:
+    """Counters for the orchestrator's monitoring loop"""
+
+    started_at: float = field(default_factory=time.time)
+    ticks: int = 0
+    last_tick_at: float = 0.0
+    last_tick_seconds: float = 0.0
+    lines_changed: int = 0
+    total_lines_changed: int = 0
+    opportunities_opened: int = 0
+    open_opportunities: int = 0
+    fetch_errors: int = 0
+    # Opportunities the stake allocator ran out of time for
+    allocations_skipped: int = 0
+    dropped_events: int = 0
+    streamed_updates: int = 0
+    streams_connected: int = 0
+
+    # Filled in by the memory governor every `memory_check_ticks` ticks
+    memory_checks: int = 0
+    rss_bytes: int = 0
+    peak_rss_bytes: int = 0
+    cache_sizes: Dict[str, int] = field(default_factory=dict)
+    cache_evictions: Dict[str, int] = field(default_factory=dict)
+    top_allocations: List[str] = field(default_factory=list)
@@ -1,9 +1,23 @@
+from arbitrage_bot.registry import lazy_attribute
 from .base import OddsFetcher
-from .draftkings import DraftKingsOddsFetcher
-from .betmgm import BetMGMOddsFetcher
+from .schema import SchemaError, american_odds
+
+# Sportsbook fetchers are imported on first use
+_EXPORTS = {
+    "DraftKingsOddsFetcher": ".draftkings",
+    "BetMGMOddsFetcher": ".betmgm",
+    "StreamingOddsFetcher": ".stream",
+}
 
 __all__ = [
     "OddsFetcher",
     "DraftKingsOddsFetcher",
     "BetMGMOddsFetcher",
+    "StreamingOddsFetcher",
+    "SchemaError",
+    "american_odds",
 ]
+
+
+def __getattr__(name: str):
+    return lazy_attribute(__name__, _EXPORTS, name)
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Callable, Dict, List, Optional
 from arbitrage_bot.models.odds import GameOdds
 from arbitrage_bot.models.sportsbooks import Sportsbook
+from arbitrage_bot.odds.cache import ParsedResultCache, payload_digest
 
 
 class OddsFetcher(ABC):
@@ -10,16 +11,83 @@ class OddsFetcher(ABC):
     def __init__(self, sportsbook: Sportsbook):
         self.sportsbook = sportsbook
 
+        # Per-sub-document parse cache and last full result
+        self.parsed_cache = ParsedResultCache()
+        self._payload_digest: Optional[bytes] = None
+        self._last_odds: List[GameOdds] = []
+
+        # HTTP validators for conditional requests
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+
     @abstractmethod
     def fetch_odds(self) -> List[GameOdds]:
         """
         Fetch current odds from sportsbook
 
         Returns:
-            List of GameOdds objects
+            List of GameOdds objects (the complete board)
+
+        Raises:
+            Exception: If the fetch failed; never return [] for a failure
         """
         pass
 
     def get_sportsbook(self) -> str:
         """Get the name of this sportsbook"""
         return self.sportsbook
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that let the server answer 304 if nothing changed"""
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        return headers
+
+    def read_response(self, response) -> Optional[bytes]:
+        """
+        Check an API response and store its ETag/Last-Modified validators
+
+        Returns:
+            Raw payload, or None if the server reported it as not modified
+
+        Raises:
+            RuntimeError: If the server answered with an error status
+        """
+        if response.status_code == 304:
+            return None
+        if response.status_code >= 400:
+            raise RuntimeError(
+                f"HTTP {response.status_code} from {self.sportsbook} API"
+            )
+        self._etag = response.headers.get("ETag")
+        self._last_modified = response.headers.get("Last-Modified")
+        return response.content
+
+    def parse_cached(
+        self, content: Optional[bytes], parse: Callable[[bytes], List[GameOdds]]
+    ) -> List[GameOdds]:
+        """
+        Parse a payload, reusing the previous result when it is unchanged
+
+        Args:
+            content: Raw payload, or None if the server answered 304
+            parse: Function that parses the raw payload
+
+        Returns:
+            List of GameOdds objects
+        """
+        if content is None:
+            return self._last_odds
+
+        digest = payload_digest(content)
+        if digest == self._payload_digest:
+            return self._last_odds
+
+        odds = parse(content)
+        self.parsed_cache.sweep()
+        self._payload_digest = digest
+        self._last_odds = odds
+        return odds
@@ -1,123 +1,172 @@
-from typing import List
-import curl_cffi
+import logging
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 from .base import OddsFetcher
-from arbitrage_bot.models.odds import GameOdds
+from .schema import (
+    BetMGMFixture,
+    SchemaError,
+    betmgm_fixture_items,
+    decode_betmgm_fixture,
+)
+from arbitrage_bot.models.odds import BetLinkBuilder, GameOdds
 from arbitrage_bot.models.sportsbooks import Sportsbook
 
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4096)
+def _event_url(
+    site_url: str, event_name: str, event_id: str, market_id: str, selection_id: str
+) -> str:
+    event_name = event_name.replace(" ", "-").lower()
+    return (
+        f"{site_url}/en/sports/events/{event_name}-{event_id}"
+        f"?options={event_id}-{market_id}-{selection_id}&type=Single"
+    )
+
+
+class BetMGMLinks(BetLinkBuilder):
+    """Builds BetMGM betslip links for a site"""
+
+    def __init__(self, site_url: str):
+        self.site_url = site_url
+
+    def build_url(self, odds: GameOdds, selection_id: str) -> str:
+        return _event_url(
+            self.site_url, odds.event_name, odds.event_id, odds.market_id, selection_id
+        )
+
 
 class BetMGMOddsFetcher(OddsFetcher):
     """BetMGM odds fetcher implementation"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        api_url: str = None,
+        site_url: str = None,
+        sport_id: str = "11",
+        competition_ids: List[str] = None,
+    ):
         super().__init__(Sportsbook.BETMGM)
+        self.api_url = (
+            api_url or "https://www.mi.betmgm.com/cds-api/bettingoffer/fixtures"
+        )
+        self.base_url = site_url or "https://sports.mi.betmgm.com"
+        self.links = BetMGMLinks(self.base_url)
+        self.sport_id = sport_id
+        # None fetches every competition (league) of the sport
+        self.competition_ids = competition_ids
 
     def fetch_odds(self) -> List[GameOdds]:
         """
         Fetch odds from BetMGM
 
+        Failures raise rather than returning an empty board, which the
+        odds book would read as every line disappearing.
+
         Returns:
             List of GameOdds objects
+
+        Raises:
+            RuntimeError: If the API answered with an error status
+            SchemaError: If the payload does not match the expected shape
         """
-        odds = []
+        return self.parse_cached(self.fetch_payload(), self.parse_odds)
 
-        try:
-            response = curl_cffi.get(
-                "https://www.mi.betmgm.com/cds-api/bettingoffer/fixtures?x-bwin-accessid=NmFjNmUwZjAtMGI3Yi00YzA3LTg3OTktNDgxMGIwM2YxZGVh&lang=en-us&country=US&userCountry=US&subdivision=US-Michigan&state=Live&take=50&offerMapping=Filtered&offerCategories=Gridable&sortBy=Tags&sportIds=11&statisticsModes=Rank,SeasonStandings",
-                impersonate="chrome",
-            )
+    def fetch_payload(self) -> Optional[bytes]:
+        """
+        Fetch the raw fixtures payload
+
+        Returns:
+            Raw payload, or None if unchanged since the last fetch (HTTP 304)
+        """
+        params = {
+            "x-bwin-accessid": "NmFjNmUwZjAtMGI3Yi00YzA3LTg3OTktNDgxMGIwM2YxZGVh",
+            "lang": "en-us",
+            "country": "US",
+            "userCountry": "US",
+            "subdivision": "US-Michigan",
+            "state": "Live",
+            "take": "50",
+            "offerMapping": "Filtered",
+            "offerCategories": "Gridable",
+            "sortBy": "Tags",
+            "sportIds": self.sport_id,
+            "statisticsModes": "Rank,SeasonStandings",
+        }
+        if self.competition_ids:
+            params["competitionIds"] = ",".join(self.competition_ids)
+
+        # Deferred so building a fetcher (e.g. to parse recorded payloads)
+        # does not load curl_cffi
+        import curl_cffi
+
+        response = curl_cffi.get(
+            self.api_url,
+            params=params,
+            impersonate="chrome",
+            headers=self.conditional_headers(),
+        )
+        return self.read_response(response)
+
+    def parse_odds(self, content: bytes) -> List[GameOdds]:
+        """
+        Parse a raw fixtures payload into GameOdds
 
-            fixtures = response.json()["fixtures"]
-            for fixture in fixtures:
-                event_id = fixture["id"]
-                event_name = fixture["name"]["value"].replace(" ", "-").lower()
-                base_url = f"https://sports.mi.betmgm.com/en/sports/events/{event_name}-{event_id}"
-
-                if "optionMarkets" in fixture and len(fixture["optionMarkets"]) > 0:
-                    p1, p2, m1, m2 = None, None, None, None
-                    try:
-                        participants = fixture["participants"][:2]
-                        p1 = participants[0]["name"]["value"]
-                        p2 = participants[1]["name"]["value"]
-                        if not p1 or not p2:
-                            continue
-                    except:
-                        continue
-
-                    option_markets = fixture["optionMarkets"]
-                    for market in option_markets:
-                        try:
-                            market_name = market["name"]["value"]
-                            status = market["status"]
-                            market_id = market["id"]
-                            if market_name != "Money Line" or status != "Visible":
-                                continue
-                            m1 = market["options"][0]["price"]["americanOdds"]
-                            s1_id = market["options"][0]["id"]
-                            m2 = market["options"][1]["price"]["americanOdds"]
-                            s2_id = market["options"][1]["id"]
-                            break
-                        except:
-                            continue
-
-                    if not m1 or not m2:
-                        continue
-
-                    team1_url = (
-                        f"{base_url}?options={event_id}-{market_id}-{s1_id}&type=Single"
-                    )
-                    team2_url = (
-                        f"{base_url}?options={event_id}-{market_id}-{s2_id}&type=Single"
-                    )
-
-                    odds.append(
-                        GameOdds(
-                            sportsbook=Sportsbook.BETMGM,
-                            team1=p1,
-                            team2=p2,
-                            team1_odds=m1,
-                            team1_url=team1_url,
-                            team2_odds=m2,
-                            team2_url=team2_url,
-                        )
-                    )
-
-                elif "games" in fixture and len(fixture["games"]) > 0:
-                    games = fixture["games"]
-                    for game in games:
-                        market_id = game["id"]
-                        try:
-                            market_name = game["name"]["value"]
-                            visibility = game["visibility"]
-                            if market_name != "Money Line" or visibility != "Visible":
-                                continue
-
-                            p1 = game["results"][0]["name"]["value"]
-                            m1 = game["results"][0]["americanOdds"]
-                            s1_id = game["results"][0]["id"]
-                            p2 = game["results"][1]["name"]["value"]
-                            m2 = game["results"][1]["americanOdds"]
-                            s2_id = game["results"][1]["id"]
-
-                            team1_url = f"{base_url}?options={event_id}-{market_id}-{s1_id}&type=Single"
-                            team2_url = f"{base_url}?options={event_id}-{market_id}-{s2_id}&type=Single"
-
-                            odds.append(
-                                GameOdds(
-                                    sportsbook=Sportsbook.BETMGM,
-                                    team1=p1,
-                                    team2=p2,
-                                    team1_odds=m1,
-                                    team1_url=team1_url,
-                                    team2_odds=m2,
-                                    team2_url=team2_url,
-                                )
-                            )
-                            break
-                        except:
-                            continue
-
-            return odds
-        except:
-            print("Error fetching odds from BetMGM")
-            return []
+        Fixtures whose raw sub-document is unchanged since the last parse
+        reuse last tick's GameOdds without being decoded.
+
+        Raises:
+            SchemaError: If the payload has no fixtures list
+        """
+        odds = []
+        errors = []
+        for i, item in enumerate(betmgm_fixture_items(content)):
+            fixture_id = item.get("id") if isinstance(item, dict) else None
+            lines = (
+                None if fixture_id is None else self.parsed_cache.get(fixture_id, item)
+            )
+            if lines is None:
+                lines = self._fixture_odds(item, f"$.fixtures[{i}]", errors)
+                if fixture_id is not None:
+                    self.parsed_cache.put(fixture_id, item, lines)
+            odds.extend(lines)
+
+        for error in errors:
+            logger.warning(f"Schema error in BetMGM payload: {error}")
+        return odds
+
+    def _fixture_odds(
+        self, item, path: str, errors: List[SchemaError]
+    ) -> Tuple[GameOdds, ...]:
+        """Decode one raw fixture's moneyline, or nothing if it has no usable line"""
+        try:
+            fixture = decode_betmgm_fixture(item, path, errors)
+        except SchemaError as e:
+            errors.append(e)
+            return ()
+        if fixture is None:
+            return ()
+
+        s1, s2 = fixture.selections
+        if not s1.name or not s2.name or not s1.american_odds or not s2.american_odds:
+            return ()
+        return (self._build_game_odds(fixture),)
+
+    def _build_game_odds(self, fixture: BetMGMFixture) -> GameOdds:
+        s1, s2 = fixture.selections
+
+        return GameOdds(
+            sportsbook=Sportsbook.BETMGM,
+            team1=s1.name,
+            team2=s2.name,
+            team1_odds=s1.american_odds,
+            team2_odds=s2.american_odds,
+            event_id=fixture.id,
+            event_name=fixture.name,
+            market_id=fixture.market_id,
+            team1_selection_id=s1.id,
+            team2_selection_id=s2.id,
+            links=self.links,
+        )
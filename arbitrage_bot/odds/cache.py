@@ -0,0 +1,56 @@
+import hashlib
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+def payload_digest(content: bytes) -> bytes:
+    """Cheap content hash of a raw payload"""
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+class ParsedResultCache:
+    """
+    Reuses last tick's parsed objects for sub-documents that did not change
+
+    Entries are keyed by a stable sub-document id (fixture/event id) and
+    validated against a content fingerprint compared by equality, typically
+    the raw (JSON-loaded but undecoded) sub-document itself, so a hit skips
+    decoding as well as building the result. Entries not looked up since the
+    previous sweep are dropped, so the cache never outgrows the live board.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Hashable, Tuple[Any, Any]] = {}
+        self._seen = set()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, fingerprint: Any) -> Optional[Any]:
+        """Get the cached result if the sub-document's fingerprint is unchanged"""
+        self._seen.add(key)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, fingerprint: Any, value: Any):
+        """Store the parsed result for a sub-document"""
+        self._seen.add(key)
+        self._entries[key] = (fingerprint, value)
+
+    def sweep(self) -> int:
+        """
+        Drop entries that were not looked up since the previous sweep
+
+        Returns:
+            Number of entries dropped
+        """
+        stale = self._entries.keys() - self._seen
+        for key in stale:
+            del self._entries[key]
+        self._seen = set()
+        return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,110 +1,175 @@
-from typing import List
+import logging
+from functools import lru_cache
+from urllib.parse import quote
+from typing import List, Optional, Tuple
 from .base import OddsFetcher
-from arbitrage_bot.models.odds import GameOdds
+from .schema import (
+    DraftKingsEvent,
+    DraftKingsSelection,
+    decode_draftkings_event,
+    split_draftkings,
+)
+from arbitrage_bot.models.odds import BetLinkBuilder, GameOdds
 from arbitrage_bot.models.sportsbooks import Sportsbook
-import curl_cffi
-from requests.utils import quote
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4096)
+def _event_url(site_url: str, event_name: str, event_id: str, selection_id: str) -> str:
+    event_name = event_name.replace(" ", "-").lower()
+    return f"{site_url}/event/{event_name}/{event_id}?outcomes={quote(selection_id)}"
+
+
+class DraftKingsLinks(BetLinkBuilder):
+    """Builds DraftKings betslip links for a site"""
+
+    def __init__(self, site_url: str):
+        self.site_url = site_url
+
+    def build_url(self, odds: GameOdds, selection_id: str) -> str:
+        return _event_url(self.site_url, odds.event_name, odds.event_id, selection_id)
 
 
 class DraftKingsOddsFetcher(OddsFetcher):
     """DraftKings odds fetcher implementation"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        league_id: str = "87637",
+        subcategory_ids: List[str] = None,
+        api_url: str = None,
+        site_url: str = None,
+    ):
         super().__init__(Sportsbook.DRAFTKINGS)
-        self.base_url = "https://sportsbook.draftkings.com"
+        self.api_url = (
+            api_url
+            or "https://sportsbook-nash.draftkings.com/sites/US-MI-SB/api/sportscontent/controldata/league/leagueSubcategory/v1/markets"
+        )
+        self.base_url = site_url or "https://sportsbook.draftkings.com"
+        self.links = DraftKingsLinks(self.base_url)
+        self.league_id = league_id
+        self.subcategory_ids = subcategory_ids or ["4518"]
 
     def fetch_odds(self) -> List[GameOdds]:
         """
         Fetch odds from DraftKings
 
+        Failures raise rather than returning an empty board, which the
+        odds book would read as every line disappearing.
+
         Returns:
             List of GameOdds objects
+
+        Raises:
+            RuntimeError: If the API answered with an error status
+            SchemaError: If the payload does not match the expected shape
         """
-        odds = []
+        return self.parse_cached(self.fetch_payload(), self.parse_odds)
 
-        try:
-            params = {
-                "isBatchable": "false",
-                "templateVars": "87637",
-                "eventsQuery": "$filter=leagueId eq '87637' AND clientMetadata/Subcategories/any(s: s/Id eq '4518')",
-                "marketsQuery": "$filter=clientMetadata/subCategoryId eq '4518' AND tags/all(t: t ne 'SportcastBetBuilder')",
-                "include": "Events",
-                "entity": "events",
-            }
-
-            response = curl_cffi.get(
-                "https://sportsbook-nash.draftkings.com/sites/US-MI-SB/api/sportscontent/controldata/league/leagueSubcategory/v1/markets",
-                params=params,
-            ).json()
-
-            event_id_to_data = {}
-            events = response["events"]
-            for event in events:
-                status = event["status"]
-                if status != "STARTED":
-                    continue
-
-                event_id = event["id"]
-                p1 = event["participants"][0]["name"]
-                p2 = event["participants"][1]["name"]
-                event_id_to_data[event_id] = {
-                    "event_name": event["name"].replace(" ", "-").lower(),
-                    "p1": p1,
-                    "p2": p2,
-                }
-
-            market_ids = set()
-            markets = response["markets"]
-            for market in markets:
-                market_event_id = market["eventId"]
-                if market_event_id not in event_id_to_data:
-                    continue
-
-                market_name = market["name"]
-                if market_name != "Moneyline":
-                    continue
-
-                market_id = market["id"]
-                market_ids.add(market_id)
-
-            team_to_selection = {}
-            for selection in response["selections"]:
-                selection_market_id = selection["marketId"]
-                if selection_market_id not in market_ids:
-                    continue
-
-                selection_id = selection["id"]
-                team_to_selection[selection["label"]] = {
-                    "odds": int(selection["displayOdds"]["american"].replace("−", "-")),
-                    "selection_id": selection_id,
-                }
-
-            for event_id, data in event_id_to_data.items():
-                p1 = data["p1"]
-                p2 = data["p2"]
-                event_name = data["event_name"]
-                p1_odds = team_to_selection[p1]["odds"]
-                p1_selection_id = team_to_selection[p1]["selection_id"]
-                p2_odds = team_to_selection[p2]["odds"]
-                p2_selection_id = team_to_selection[p2]["selection_id"]
-
-                team1_url = f"https://sportsbook.draftkings.com/event/{event_name}/{event_id}?outcomes={quote(p1_selection_id)}"
-                team2_url = f"https://sportsbook.draftkings.com/event/{event_name}/{event_id}?outcomes={quote(p2_selection_id)}"
-
-                odds.append(
-                    GameOdds(
-                        sportsbook=Sportsbook.DRAFTKINGS,
-                        team1=p1,
-                        team2=p2,
-                        team1_odds=p1_odds,
-                        team1_url=team1_url,
-                        team2_odds=p2_odds,
-                        team2_url=team2_url,
-                    )
-                )
+    def fetch_payload(self) -> Optional[bytes]:
+        """
+        Fetch the raw markets payload for every configured subcategory
+
+        Returns:
+            Raw payload, or None if unchanged since the last fetch (HTTP 304)
+        """
+        event_filter = " or ".join(f"s/Id eq '{sid}'" for sid in self.subcategory_ids)
+        market_filter = " or ".join(
+            f"clientMetadata/subCategoryId eq '{sid}'" for sid in self.subcategory_ids
+        )
+        params = {
+            "isBatchable": "false",
+            "templateVars": self.league_id,
+            "eventsQuery": f"$filter=leagueId eq '{self.league_id}' AND clientMetadata/Subcategories/any(s: {event_filter})",
+            "marketsQuery": f"$filter=({market_filter}) AND tags/all(t: t ne 'SportcastBetBuilder')",
+            "include": "Events",
+            "entity": "events",
+        }
+
+        # Deferred so building a fetcher (e.g. to parse recorded payloads)
+        # does not load curl_cffi
+        import curl_cffi
+
+        response = curl_cffi.get(
+            self.api_url,
+            params=params,
+            headers=self.conditional_headers(),
+        )
+        return self.read_response(response)
+
+    def parse_odds(self, content: bytes) -> List[GameOdds]:
+        """
+        Parse a raw markets payload into GameOdds
+
+        Selections are matched to participants within each event's own
+        moneyline market, so events sharing a team label cannot overwrite
+        each other and an event without usable selections is skipped alone.
+        Events whose raw sub-documents are unchanged since the last parse
+        reuse last tick's GameOdds without being decoded.
 
-            return odds
+        Raises:
+            SchemaError: If the payload is missing its events/markets/selections
+        """
+        odds = []
+        payload = split_draftkings(content)
+        errors = payload.errors
+
+        for event_id, raw in payload.events.items():
+            lines = self.parsed_cache.get(event_id, raw)
+            if lines is None:
+                lines = self._event_odds(decode_draftkings_event(raw, errors))
+                self.parsed_cache.put(event_id, raw, lines)
+            odds.extend(lines)
+
+        for error in errors:
+            logger.warning(f"Schema error in DraftKings payload: {error}")
+        return odds
+
+    def _event_odds(self, event: Optional[DraftKingsEvent]) -> Tuple[GameOdds, ...]:
+        """The event's moneyline as GameOdds, or nothing if it has no usable line"""
+        if event is None or event.status != "STARTED":
+            return ()
+
+        p1, p2 = event.participants
+        for market in event.markets.values():
+            selections = self._match_selections(market.selections, p1, p2)
+            if selections:
+                return (
+                    self._build_game_odds(event.id, event.name, p1, p2, *selections),
+                )
 
-        except Exception as e:
-            print(f"Error fetching odds from DraftKings: {e}")
-            return []
+        logger.warning(f"No moneyline selections for DraftKings event {event.id}")
+        return ()
+
+    def _build_game_odds(
+        self,
+        event_id: str,
+        name: str,
+        p1: str,
+        p2: str,
+        s1: DraftKingsSelection,
+        s2: DraftKingsSelection,
+    ) -> GameOdds:
+        return GameOdds(
+            sportsbook=Sportsbook.DRAFTKINGS,
+            team1=p1,
+            team2=p2,
+            team1_odds=s1.american_odds,
+            team2_odds=s2.american_odds,
+            event_id=event_id,
+            event_name=name,
+            market_id=s1.market_id,
+            team1_selection_id=s1.id,
+            team2_selection_id=s2.id,
+            links=self.links,
+        )
+
+    def _match_selections(
+        self, selections: List[DraftKingsSelection], p1: str, p2: str
+    ) -> Optional[Tuple[DraftKingsSelection, DraftKingsSelection]]:
+        """Pair a market's selections with the event's participants by label"""
+        by_label = {selection.label: selection for selection in selections}
+        if p1 in by_label and p2 in by_label:
+            return by_label[p1], by_label[p2]
+        return None
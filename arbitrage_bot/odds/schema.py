@@ -0,0 +1,444 @@
+"""
+Typed decoders for the parts of the sportsbook payloads we use
+
+Only the fields the fetchers depend on are read, and anything that does not
+match the expected shape is reported as a SchemaError instead of being
+swallowed.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+DRAFTKINGS_MONEYLINE = "Moneyline"
+BETMGM_MONEYLINE = "Money Line"
+BETMGM_VISIBLE = "Visible"
+
+
+class SchemaError(ValueError):
+    """Raised when a payload does not match the fields we depend on"""
+
+    def __init__(self, path: str, message: str):
+        super().__init__(f"{path}: {message}")
+        self.path = path
+
+
+def _field(obj: Any, key: str, path: str, expected: Union[type, Tuple[type, ...]]):
+    """Read a required field and check its type"""
+    if not isinstance(obj, dict):
+        raise SchemaError(path, f"expected object, got {type(obj).__name__}")
+    if key not in obj:
+        raise SchemaError(f"{path}.{key}", "missing field")
+    value = obj[key]
+    if not isinstance(value, expected):
+        raise SchemaError(f"{path}.{key}", f"unexpected type {type(value).__name__}")
+    return value
+
+
+def _list(obj: Any, key: str, path: str) -> List[Any]:
+    return _field(obj, key, path, list)
+
+
+def _name_value(obj: Any, path: str) -> str:
+    """Read a BetMGM {"name": {"value": ...}} label"""
+    return _field(_field(obj, "name", path, dict), "value", f"{path}.name", str)
+
+
+def american_odds(value: Any, path: str) -> int:
+    """
+    Parse American odds from an int or a display string such as "−150"
+
+    Args:
+        value: Raw odds value from a feed
+        path: Location of the value, used in the error message
+
+    Returns:
+        American odds as an int
+
+    Raises:
+        SchemaError: If the value is not a number or numeric string
+    """
+    if isinstance(value, bool):
+        raise SchemaError(path, "unexpected type bool")
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.replace("−", "-"))
+        except ValueError:
+            raise SchemaError(path, f"invalid American odds {value!r}")
+    raise SchemaError(path, f"unexpected type {type(value).__name__}")
+
+
+def _load(content: Union[bytes, str, dict]) -> Any:
+    if isinstance(content, dict):
+        return content
+    try:
+        return json.loads(content)
+    except ValueError as e:
+        raise SchemaError("$", f"invalid JSON ({e})")
+
+
+# DraftKings
+
+
+@dataclass(slots=True)
+class DraftKingsSelection:
+    id: str
+    market_id: str
+    label: str
+    american_odds: int
+
+
+@dataclass(slots=True)
+class DraftKingsMarket:
+    id: str
+    event_id: str
+    name: str
+    selections: List[DraftKingsSelection] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class DraftKingsEvent:
+    id: str
+    name: str
+    status: str
+    participants: List[str]
+    markets: Dict[str, DraftKingsMarket] = field(default_factory=dict)
+
+
+@dataclass
+class DraftKingsPayload:
+    events: Dict[str, DraftKingsEvent] = field(default_factory=dict)
+    errors: List[SchemaError] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class DraftKingsRawEvent:
+    """
+    One event's raw sub-documents, gathered without decoding them
+
+    Compared by equality, it fingerprints everything the event's decoded
+    form depends on, so an unchanged event can skip decoding.
+    """
+
+    event: Any
+    markets: List[Any] = field(default_factory=list)
+    selections: List[Any] = field(default_factory=list)
+
+
+@dataclass
+class DraftKingsRawPayload:
+    events: Dict[str, DraftKingsRawEvent] = field(default_factory=dict)
+    errors: List[SchemaError] = field(default_factory=list)
+
+
+def split_draftkings(
+    content: Union[bytes, str, dict], market_name: str = DRAFTKINGS_MONEYLINE
+) -> DraftKingsRawPayload:
+    """
+    Group a DraftKings payload's raw events, markets and selections by event
+
+    Only the ids that link the three collections (and market names, to keep
+    only `market_name` markets) are read. Items whose ids are missing are
+    reported in `errors`; a payload missing its top-level collections raises
+    SchemaError.
+    """
+    document = _load(content)
+    result = DraftKingsRawPayload()
+    events = result.events
+
+    for i, item in enumerate(_list(document, "events", "$")):
+        try:
+            event_id = str(_field(item, "id", f"$.events[{i}]", (str, int)))
+        except SchemaError as e:
+            result.errors.append(e)
+            continue
+        events[event_id] = DraftKingsRawEvent(item)
+
+    markets: Dict[str, DraftKingsRawEvent] = {}
+    for i, item in enumerate(_list(document, "markets", "$")):
+        path = f"$.markets[{i}]"
+        try:
+            if _field(item, "name", path, str) != market_name:
+                continue
+            event = events.get(str(_field(item, "eventId", path, (str, int))))
+            if event is None:
+                continue
+            markets[str(_field(item, "id", path, (str, int)))] = event
+            event.markets.append(item)
+        except SchemaError as e:
+            result.errors.append(e)
+
+    for i, item in enumerate(_list(document, "selections", "$")):
+        try:
+            event = markets.get(
+                str(_field(item, "marketId", f"$.selections[{i}]", (str, int)))
+            )
+        except SchemaError as e:
+            result.errors.append(e)
+            continue
+        if event is not None:
+            event.selections.append(item)
+
+    return result
+
+
+def decode_draftkings_event(
+    raw: DraftKingsRawEvent, errors: List[SchemaError]
+) -> Optional[DraftKingsEvent]:
+    """
+    Decode one event gathered by `split_draftkings`
+
+    The result is indexed as marketId -> selections. Malformed markets and
+    selections are skipped and reported in `errors`.
+
+    Returns:
+        DraftKingsEvent, or None if the event itself is malformed (reported
+        in `errors`)
+    """
+    item = raw.event
+    path = f"$.events[id={item.get('id')}]"
+    try:
+        participants = _list(item, "participants", path)
+        if len(participants) < 2:
+            raise SchemaError(f"{path}.participants", "expected two participants")
+        event = DraftKingsEvent(
+            id=str(_field(item, "id", path, (str, int))),
+            name=_field(item, "name", path, str),
+            status=_field(item, "status", path, str),
+            participants=[
+                _field(participants[j], "name", f"{path}.participants[{j}]", str)
+                for j in range(2)
+            ],
+        )
+    except SchemaError as e:
+        errors.append(e)
+        return None
+
+    for item in raw.markets:
+        path = f"$.markets[id={item.get('id')}]"
+        try:
+            market = DraftKingsMarket(
+                id=str(_field(item, "id", path, (str, int))),
+                event_id=event.id,
+                name=_field(item, "name", path, str),
+            )
+            event.markets[market.id] = market
+        except SchemaError as e:
+            errors.append(e)
+
+    for item in raw.selections:
+        path = f"$.selections[id={item.get('id')}]"
+        try:
+            market = event.markets.get(str(_field(item, "marketId", path, (str, int))))
+            if market is None:
+                continue
+            display_odds = _field(item, "displayOdds", path, dict)
+            market.selections.append(
+                DraftKingsSelection(
+                    id=str(_field(item, "id", path, (str, int))),
+                    market_id=market.id,
+                    label=_field(item, "label", path, str),
+                    american_odds=american_odds(
+                        _field(display_odds, "american", f"{path}.displayOdds", str),
+                        f"{path}.displayOdds.american",
+                    ),
+                )
+            )
+        except SchemaError as e:
+            errors.append(e)
+
+    return event
+
+
+def decode_draftkings(
+    content: Union[bytes, str, dict], market_name: str = DRAFTKINGS_MONEYLINE
+) -> DraftKingsPayload:
+    """
+    Decode a DraftKings leagueSubcategory markets payload
+
+    The result is indexed as eventId -> marketId -> selections. Only markets
+    named `market_name` that belong to a decoded event, and their
+    selections, are kept. Malformed items are skipped and reported in
+    `errors`; a payload missing its top-level collections raises
+    SchemaError.
+    """
+    raw = split_draftkings(content, market_name)
+    result = DraftKingsPayload(errors=raw.errors)
+    for raw_event in raw.events.values():
+        event = decode_draftkings_event(raw_event, result.errors)
+        if event is not None:
+            result.events[event.id] = event
+    return result
+
+
+# BetMGM
+
+
+@dataclass(slots=True)
+class BetMGMSelection:
+    id: str
+    name: str
+    american_odds: int
+
+
+@dataclass(slots=True)
+class BetMGMFixture:
+    id: str
+    name: str
+    market_id: str
+    selections: List[BetMGMSelection]
+
+
+@dataclass
+class BetMGMPayload:
+    fixtures: List[BetMGMFixture] = field(default_factory=list)
+    errors: List[SchemaError] = field(default_factory=list)
+
+
+def decode_betmgm_fixture(
+    item: Any, path: str, errors: List[SchemaError]
+) -> Optional[BetMGMFixture]:
+    """
+    Decode the moneyline of a single BetMGM fixture
+
+    Fixtures carry their markets either as `optionMarkets` (team names come
+    from `participants`) or as `games` (team names come from each result).
+    A malformed market is reported in `errors` and the next one is tried.
+
+    Returns:
+        BetMGMFixture, or None if the fixture has no visible moneyline
+    """
+    fixture_id = str(_field(item, "id", path, (str, int)))
+    name = _name_value(item, path)
+
+    option_markets = item.get("optionMarkets") if isinstance(item, dict) else None
+    if option_markets:
+        participants = _list(item, "participants", path)
+        if len(participants) < 2:
+            raise SchemaError(f"{path}.participants", "expected two participants")
+        teams = [
+            _name_value(participants[j], f"{path}.participants[{j}]") for j in range(2)
+        ]
+
+        for i, market in enumerate(option_markets):
+            try:
+                fixture = _decode_option_market(
+                    market, f"{path}.optionMarkets[{i}]", fixture_id, name, teams
+                )
+            except SchemaError as e:
+                errors.append(e)
+                continue
+            if fixture is not None:
+                return fixture
+        return None
+
+    games = item.get("games") if isinstance(item, dict) else None
+    for i, game in enumerate(games or []):
+        try:
+            fixture = _decode_game(game, f"{path}.games[{i}]", fixture_id, name)
+        except SchemaError as e:
+            errors.append(e)
+            continue
+        if fixture is not None:
+            return fixture
+    return None
+
+
+def _decode_option_market(
+    market: Any, path: str, fixture_id: str, name: str, teams: List[str]
+) -> Optional[BetMGMFixture]:
+    if _name_value(market, path) != BETMGM_MONEYLINE:
+        return None
+    if _field(market, "status", path, str) != BETMGM_VISIBLE:
+        return None
+    options = _list(market, "options", path)
+    if len(options) < 2:
+        raise SchemaError(f"{path}.options", "expected two options")
+
+    selections = []
+    for j in range(2):
+        option_path = f"{path}.options[{j}]"
+        price = _field(options[j], "price", option_path, dict)
+        selections.append(
+            BetMGMSelection(
+                id=str(_field(options[j], "id", option_path, (str, int))),
+                name=teams[j],
+                american_odds=american_odds(
+                    _field(
+                        price, "americanOdds", f"{option_path}.price", (int, float, str)
+                    ),
+                    f"{option_path}.price.americanOdds",
+                ),
+            )
+        )
+    return BetMGMFixture(
+        id=fixture_id,
+        name=name,
+        market_id=str(_field(market, "id", path, (str, int))),
+        selections=selections,
+    )
+
+
+def _decode_game(
+    game: Any, path: str, fixture_id: str, name: str
+) -> Optional[BetMGMFixture]:
+    if _name_value(game, path) != BETMGM_MONEYLINE:
+        return None
+    if _field(game, "visibility", path, str) != BETMGM_VISIBLE:
+        return None
+    results = _list(game, "results", path)
+    if len(results) < 2:
+        raise SchemaError(f"{path}.results", "expected two results")
+
+    selections = []
+    for j in range(2):
+        result_path = f"{path}.results[{j}]"
+        selections.append(
+            BetMGMSelection(
+                id=str(_field(results[j], "id", result_path, (str, int))),
+                name=_name_value(results[j], result_path),
+                american_odds=american_odds(
+                    _field(results[j], "americanOdds", result_path, (int, float, str)),
+                    f"{result_path}.americanOdds",
+                ),
+            )
+        )
+    return BetMGMFixture(
+        id=fixture_id,
+        name=name,
+        market_id=str(_field(game, "id", path, (str, int))),
+        selections=selections,
+    )
+
+
+def betmgm_fixture_items(content: Union[bytes, str, dict]) -> List[Any]:
+    """
+    Get the raw fixture sub-documents of a BetMGM payload, undecoded
+
+    Raises:
+        SchemaError: If the payload has no fixtures list
+    """
+    return _list(_load(content), "fixtures", "$")
+
+
+def decode_betmgm(content: Union[bytes, str, dict]) -> BetMGMPayload:
+    """
+    Decode a BetMGM bettingoffer/fixtures payload
+
+    Malformed fixtures are skipped and reported in `errors`; a payload
+    without a fixtures list raises SchemaError.
+    """
+    result = BetMGMPayload()
+
+    for i, item in enumerate(betmgm_fixture_items(content)):
+        try:
+            fixture = decode_betmgm_fixture(item, f"$.fixtures[{i}]", result.errors)
+        except SchemaError as e:
+            result.errors.append(e)
+            continue
+        if fixture is not None:
+            result.fixtures.append(fixture)
+
+    return result
@@ -0,0 +1,322 @@
+import dataclasses
+import http.client
+import json
+import logging
+import socket
+import threading
+import time
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Callable, ContextManager, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from arbitrage_bot.models.odds import GameOdds
+from arbitrage_bot.odds.base import OddsFetcher
+from arbitrage_bot.odds.schema import SchemaError, american_odds
+
+if TYPE_CHECKING:
+    from arbitrage_bot.board.odds_book import OddsBook
+
+logger = logging.getLogger(__name__)
+
+# (event_id, market_id) of one line
+LineId = Tuple[str, str]
+
+
+class StreamingOddsFetcher(OddsFetcher):
+    """
+    Push-feed fetcher that applies price changes as they arrive
+
+    Wraps a polling fetcher for the same sportsbook and keeps a server-sent
+    events subscription open on a background thread. After subscribing, the
+    board is seeded with one poll of the wrapped fetcher; each `price` event
+    then updates a single selection in the odds book. While the stream is
+    down, `fetch_odds` polls the wrapped fetcher as usual and the stream
+    reconnects with exponential backoff.
+
+    Feed format, one JSON object (or a list of them) per event:
+
+        event: price
+        data: {"selection_id": "4271_0", "american": -120}
+
+    Selections are matched through the ids on each GameOdds. An unknown
+    selection (e.g. a newly listed game) triggers a resync poll, and the
+    board is re-polled every `resync_interval` seconds to bound drift from
+    any missed messages. Resyncs run on the stream thread, between
+    messages.
+
+    Once started, this fetcher is the only writer of its sportsbook's lines
+    in the odds book: seeds, resyncs, streamed updates and the loop's
+    fallback polls (`sync`) are applied under one lock, so a poll never
+    reverts a newer streamed price.
+
+    Every poll, whether from the loop or the stream thread, is made inside
+    `limiter` (the host's request limiter). The stream connection itself
+    is long-lived and does not hold a limiter slot.
+    """
+
+    def __init__(
+        self,
+        fetcher: OddsFetcher,
+        stream_url: str,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+        read_timeout: float = 15.0,
+        resync_interval: float = 60.0,
+        limiter: Optional[ContextManager] = None,
+    ):
+        super().__init__(fetcher.sportsbook)
+        self.fetcher = fetcher
+        self.limiter = limiter
+        self.stream_url = stream_url
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.read_timeout = read_timeout
+        self.resync_interval = resync_interval
+
+        self.connected = False
+        self.updates_applied = 0
+        self.reconnects = 0
+        self.last_update_at: Optional[float] = None
+
+        self._lines: Dict[LineId, GameOdds] = {}
+        self._selections: Dict[str, Tuple[LineId, str]] = {}
+        self._synced_at = 0.0
+        self._stale = True
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        # Held while applying anything to the odds book
+        self._apply_lock = threading.Lock()
+
+        self._odds_book: Optional["OddsBook"] = None
+        self._on_change: Optional[Callable[[], None]] = None
+        self._stopping = threading.Event()
+        self._connection: Optional[http.client.HTTPConnection] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def api_url(self) -> Optional[str]:
+        return getattr(self.fetcher, "api_url", None)
+
+    def fetch_odds(self) -> List[GameOdds]:
+        """
+        Current lines: the streamed board while connected, otherwise a poll
+
+        Returns:
+            List of GameOdds objects
+        """
+        if (
+            self.connected
+            and not self._stale
+            and time.monotonic() - self._synced_at < self.resync_interval
+        ):
+            with self._lock:
+                return list(self._lines.values())
+        return self._poll()
+
+    def sync(self, odds_book: "OddsBook") -> Tuple[List[GameOdds], int]:
+        """
+        Bring the odds book up to date from the main loop
+
+        While the stream is connected the stream thread keeps the book
+        current and nothing is applied here. Otherwise the sportsbook is
+        polled and the board applied to `odds_book`.
+
+        Returns:
+            The current lines and the number of lines changed
+        """
+        with self._apply_lock:
+            if self.connected:
+                with self._lock:
+                    return list(self._lines.values()), 0
+            odds = self._poll()
+            return odds, odds_book.apply_snapshot(self.sportsbook, odds)
+
+    def start(self, odds_book: "OddsBook", on_change: Callable[[], None] = None):
+        """
+        Subscribe to the feed on a background thread
+
+        Args:
+            odds_book: Board the streamed updates are applied to
+            on_change: Called (from the stream thread) after updates change
+                at least one line
+        """
+        self._odds_book = odds_book
+        self._on_change = on_change
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"stream-{self.sportsbook}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Close the subscription and wait for the stream thread"""
+        self._stopping.set()
+        connection = self._connection
+        if connection is not None and connection.sock is not None:
+            try:
+                connection.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread:
+            self._thread.join(timeout=self.read_timeout)
+            self._thread = None
+
+    def _poll(self) -> List[GameOdds]:
+        with self._poll_lock, self.limiter or nullcontext():
+            odds = self.fetcher.fetch_odds()
+            lines = {}
+            selections = {}
+            for line in odds:
+                line_id = (line.event_id, line.market_id)
+                lines[line_id] = line
+                if line.team1_selection_id:
+                    selections[line.team1_selection_id] = (line_id, "team1_odds")
+                if line.team2_selection_id:
+                    selections[line.team2_selection_id] = (line_id, "team2_odds")
+
+            with self._lock:
+                self._lines = lines
+                self._selections = selections
+                self._synced_at = time.monotonic()
+                self._stale = False
+            return odds
+
+    def _run(self):
+        delay = self.reconnect_delay
+        while not self._stopping.is_set():
+            try:
+                self._stream()
+                delay = self.reconnect_delay
+                if not self._stopping.is_set():
+                    logger.warning(f"{self.sportsbook} stream closed by server")
+            except Exception as e:
+                if self._stopping.is_set():
+                    break
+                logger.warning(f"{self.sportsbook} stream disconnected: {e}")
+
+            if self._stopping.wait(delay):
+                break
+            delay = min(delay * 2, self.max_reconnect_delay)
+            self.reconnects += 1
+
+    def _stream(self):
+        parts = urlsplit(self.stream_url)
+        if parts.scheme == "https":
+            connection = http.client.HTTPSConnection(
+                parts.netloc, timeout=self.read_timeout
+            )
+        else:
+            connection = http.client.HTTPConnection(
+                parts.netloc, timeout=self.read_timeout
+            )
+        self._connection = connection
+
+        try:
+            path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+            connection.request(
+                "GET",
+                path,
+                headers={"Accept": "text/event-stream", "Cache-Control": "no-cache"},
+            )
+            response = connection.getresponse()
+            if response.status != 200:
+                raise RuntimeError(
+                    f"HTTP {response.status} from {self.sportsbook} stream"
+                )
+
+            # Seed from a poll taken after subscribing, so no update between
+            # the two is missed (replayed updates are no-ops)
+            with self._apply_lock:
+                odds = self._resync()
+                self.connected = True
+            logger.info(f"Subscribed to {self.sportsbook} stream, {len(odds)} lines")
+
+            event_type = "message"
+            data = []
+            while not self._stopping.is_set():
+                line = response.readline()
+                if not line:
+                    return
+                line = line.rstrip(b"\r\n")
+                if not line:
+                    if data:
+                        self._dispatch(event_type, b"\n".join(data))
+                    event_type = "message"
+                    data = []
+                elif line.startswith(b":"):
+                    # Heartbeat
+                    pass
+                else:
+                    name, _, value = line.partition(b":")
+                    if value.startswith(b" "):
+                        value = value[1:]
+                    if name == b"event":
+                        event_type = value.decode()
+                    elif name == b"data":
+                        data.append(value)
+
+                if not data and (
+                    self._stale
+                    or time.monotonic() - self._synced_at >= self.resync_interval
+                ):
+                    with self._apply_lock:
+                        self._resync()
+        finally:
+            self.connected = False
+            self._connection = None
+            connection.close()
+
+    def _dispatch(self, event_type: str, data: bytes):
+        if event_type != "price":
+            return
+
+        try:
+            message = json.loads(data)
+            updates = message if isinstance(message, list) else [message]
+            prices = [
+                (
+                    str(update["selection_id"]),
+                    american_odds(update["american"], "$.american"),
+                )
+                for update in updates
+            ]
+        except (ValueError, KeyError, TypeError, SchemaError) as e:
+            logger.warning(f"Invalid {self.sportsbook} stream message: {e}")
+            return
+
+        changed = 0
+        with self._apply_lock:
+            for selection_id, american in prices:
+                odds = self._apply_price(selection_id, american)
+                if odds is not None and self._odds_book.apply_update(odds):
+                    changed += 1
+        self._notify(changed)
+
+    def _resync(self) -> List[GameOdds]:
+        """Poll and apply the full board (with `_apply_lock` held)"""
+        odds = self._poll()
+        self._notify(self._odds_book.apply_snapshot(self.sportsbook, odds))
+        return odds
+
+    def _apply_price(self, selection_id: str, american: int) -> Optional[GameOdds]:
+        with self._lock:
+            entry = self._selections.get(selection_id)
+            if entry is None:
+                self._stale = True
+                return None
+
+            line_id, side = entry
+            current = self._lines[line_id]
+            if getattr(current, side) == american:
+                return None
+            odds = dataclasses.replace(current, **{side: american})
+            self._lines[line_id] = odds
+            return odds
+
+    def _notify(self, changed: int):
+        if not changed:
+            return
+        self.updates_applied += changed
+        self.last_update_at = time.time()
+        if self._on_change:
+            self._on_change()
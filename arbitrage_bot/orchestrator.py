@@ -1,38 +1,176 @@
+import os
 import time
+import dataclasses
+import queue
+import socket
 import logging
-from typing import Dict, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-from arbitrage_bot.odds.draftkings import DraftKingsOddsFetcher
-from arbitrage_bot.odds.betmgm import BetMGMOddsFetcher
-from arbitrage_bot.detection import ArbitrageDetector
-from arbitrage_bot.browser.draftkings import DraftKingsBrowser
-from arbitrage_bot.browser.betmgm import BetMGMBrowser
+import logging.handlers
+import threading
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+from arbitrage_bot import registry
+from arbitrage_bot.registry import HostLimiter, SportsbookPlugin, SportsbookRegistry
+from arbitrage_bot.detection import (
+    ArbitrageDetector,
+    StakeAllocator,
+    TeamMapper,
+    opportunity_score,
+    top_k,
+)
+from arbitrage_bot.board import OddsBook
 from arbitrage_bot.models.odds import GameOdds
 from arbitrage_bot.models.arbitrage import ArbitrageOpportunity
-from arbitrage_bot.config import Settings
+from arbitrage_bot.models.events import OpportunityEvent, OpportunityEventType
+from arbitrage_bot.models.execution import ExecutionStep
+from arbitrage_bot.models.stats import LoopStats
+from arbitrage_bot.config import ConfigWatcher, Settings
+from arbitrage_bot.memory import MemoryGovernor
 from arbitrage_bot.models.sportsbooks import Sportsbook
 from arbitrage_bot.odds.base import OddsFetcher
-from arbitrage_bot.browser.base import BrowserAutomation
+
+# Optional components (ingestion, history, storage, query API, browsers) are
+# imported where they are constructed, so only configured ones are loaded
+if TYPE_CHECKING:
+    from arbitrage_bot.browser.base import BrowserAutomation
+    from arbitrage_bot.browser.worker import BrowserWorker
+    from arbitrage_bot.odds.stream import StreamingOddsFetcher
 
 
 class ArbitrageOrchestrator:
     """Main orchestrator that coordinates all arbitrage bot operations"""
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, config_file: str = None):
         self.settings = settings or Settings()
         self.logger = self._setup_logging()
 
-        # Initialize components
+        # Initialize components from the registered sportsbook plugins
+        self.sportsbook_registry = SportsbookRegistry.default(
+            self.settings.sportsbook_plugins
+        )
+        self.host_limiters: Dict[Sportsbook, HostLimiter] = {}
+        self.streaming_fetchers: List["StreamingOddsFetcher"] = []
+        self.streaming_books: Set[Sportsbook] = set()
         self.odds_fetchers = self._setup_odds_fetchers()
+        # One long-lived worker per browser runs its commands in order
+        self.browser_workers: Dict[Sportsbook, "BrowserWorker"] = {}
         if self.settings.enable_browser_automation:
+            from arbitrage_bot.browser.worker import BrowserWorker
+
             self.browser_automations = self._setup_browser_automations()
+            for sportsbook, automation in self.browser_automations.items():
+                self.browser_workers[sportsbook] = BrowserWorker(
+                    automation, str(sportsbook)
+                )
         else:
             self.browser_automations = {}
 
+        # Fetch pool sized from the configured sportsbooks (one fetch per
+        # book per tick), kept for the lifetime of the loop
+        self.fetch_executor = ThreadPoolExecutor(
+            max_workers=max(
+                1, min(len(self.odds_fetchers), self.settings.max_fetch_workers)
+            ),
+            thread_name_prefix="fetch",
+        )
+
         self.arbitrage_detector = ArbitrageDetector(
-            min_profit_percentage=self.settings.min_profit_percentage
+            min_profit_percentage=self.settings.min_profit_percentage,
+            total_bet_amount=self.settings.total_bet_amount,
         )
+        self.stake_allocator = StakeAllocator(
+            total_bet_amount=self.settings.total_bet_amount,
+            book_balances=self.settings.book_balances,
+            max_stake_per_bet=self.settings.max_stake_per_bet,
+            stake_rounding=self.settings.stake_rounding,
+        )
+
+        # Live odds board; the executor consumes its opportunity events
+        self.odds_book = OddsBook(self.arbitrage_detector)
+        self.opportunity_events = self.odds_book.subscribe(
+            maxsize=self.settings.max_pending_events
+        )
+        # Opened opportunities not yet acted on, by (game, market, book1, book2);
+        # kept across ticks since the book only publishes OPENED once
+        self.pending_opportunities: Dict[
+            Tuple[str, str, Sportsbook, Sportsbook], OpportunityEvent
+        ] = {}
+        self._seen_dropped_events = 0
+        # Set by push feeds when they change a line, to wake the loop early
+        self.stream_updates = threading.Event()
+
+        # Optional multi-process ingestion into a shared memory board
+        self.ingestion = None
+        if self.settings.enable_process_ingestion:
+            from arbitrage_bot.board.ingestion import ShardedIngestion
+
+            self.ingestion = ShardedIngestion(
+                self._ingestion_feeds(),
+                self.settings.refresh_interval_seconds,
+                rows_per_shard=self.settings.ingestion_rows_per_shard,
+            )
+
+        # Optional odds history recording
+        self.history = None
+        if self.settings.history_directory:
+            from arbitrage_bot.history import HistoryRecorder
+
+            # record() looks game keys up on the loop thread, not the writer's
+            self.history = HistoryRecorder(
+                self.settings.history_directory,
+                self.arbitrage_detector.get_game_key,
+                segment_bytes=self.settings.history_segment_bytes,
+            )
+
+        # Optional SQLite record of opportunities and executions
+        self.store = None
+        if self.settings.database_path:
+            from arbitrage_bot.storage import OpportunityStore
+
+            self.store = OpportunityStore(self.settings.database_path)
+
+        # Optional durable queue that hands opportunities to executor
+        # processes instead of placing them here
+        self.execution_queue = None
+        if self.settings.execution_queue_path:
+            from arbitrage_bot.storage.work_queue import ExecutionQueue
+
+            self.execution_queue = ExecutionQueue(
+                self.settings.execution_queue_path,
+                lease_seconds=self.settings.execution_lease_seconds,
+                ttl=self.settings.execution_job_ttl,
+            )
+            self._results_cursor = self.execution_queue.cursor()
+
+        # Optional hot reload of the settings file and team mappings, staged
+        # by a watcher thread and activated between ticks
+        self.config_watcher = None
+        self._config_appliers: Dict[str, Callable] = {}
+        if self.settings.config_reload_seconds:
+            mappings_file = self.arbitrage_detector.team_mapper.mappings_file
+            loaders = {mappings_file: TeamMapper.load_mappings_file}
+            self._config_appliers[mappings_file] = self._apply_team_mappings
+            if config_file:
+                loaders[config_file] = Settings.load
+                self._config_appliers[config_file] = self._apply_settings
+            self.config_watcher = ConfigWatcher(
+                loaders, self.settings.config_reload_seconds
+            )
+
+        # Loop stats, the memory governor and the optional read-only query API
+        self.loop_stats = LoopStats()
+        self.memory_governor = None
+        if self.settings.memory_check_ticks:
+            self.memory_governor = self._setup_memory_governor()
+        self.query_server = None
+        if self.settings.query_api_port is not None:
+            from arbitrage_bot.api import QueryServer
+
+            self.query_server = QueryServer(
+                self.settings.query_api_host, self.settings.query_api_port
+            )
 
     def _setup_logging(self) -> logging.Logger:
         """Setup logging configuration"""
@@ -40,7 +178,11 @@ class ArbitrageOrchestrator:
             level=logging.INFO,
             format="%(asctime)s - %(levelname)s - %(message)s",
             handlers=[
-                logging.FileHandler("arbitrage_bot.log"),
+                logging.handlers.RotatingFileHandler(
+                    self.settings.log_file,
+                    maxBytes=self.settings.log_max_bytes,
+                    backupCount=self.settings.log_backup_count,
+                ),
                 logging.StreamHandler(),
             ],
         )
@@ -49,233 +191,819 @@ class ArbitrageOrchestrator:
     def _setup_odds_fetchers(self) -> Dict[Sportsbook, OddsFetcher]:
         """Setup odds fetchers for each sportsbook"""
         fetchers = {}
+        limiters_by_host: Dict[str, HostLimiter] = {}
 
-        if Sportsbook.DRAFTKINGS in self.settings.sportsbooks:
-            fetchers[Sportsbook.DRAFTKINGS] = DraftKingsOddsFetcher()
+        for sportsbook in self.settings.sportsbooks:
+            plugin = self.sportsbook_registry.get(sportsbook)
+            if plugin is None:
+                self.logger.error(f"No sportsbook plugin registered for {sportsbook}")
+                continue
 
-        if Sportsbook.BETMGM in self.settings.sportsbooks:
-            fetchers[Sportsbook.BETMGM] = BetMGMOddsFetcher()
+            fetcher = self._build_fetcher(sportsbook, plugin)
+            fetchers[sportsbook] = fetcher
+
+            # Books served from the same host share its limits (first one wins)
+            host = urlsplit(getattr(fetcher, "api_url", "") or "").netloc or str(
+                sportsbook
+            )
+            if host not in limiters_by_host:
+                limiters_by_host[host] = HostLimiter(
+                    plugin.max_concurrent_requests, plugin.min_request_interval
+                )
+            self.host_limiters[sportsbook] = limiters_by_host[host]
+
+            stream_url = self.settings.sportsbook_stream_urls.get(sportsbook)
+            if stream_url and self.settings.enable_process_ingestion:
+                self.logger.warning(
+                    f"Ignoring {sportsbook} stream: not supported with process ingestion"
+                )
+            elif stream_url:
+                from arbitrage_bot.odds.stream import StreamingOddsFetcher
+
+                fetcher = StreamingOddsFetcher(
+                    fetcher, stream_url, limiter=self.host_limiters[sportsbook]
+                )
+                fetchers[sportsbook] = fetcher
+                self.streaming_fetchers.append(fetcher)
+                self.streaming_books.add(sportsbook)
 
         return fetchers
 
-    def _setup_browser_automations(self) -> Dict[Sportsbook, BrowserAutomation]:
+    def _build_fetcher(
+        self, sportsbook: Sportsbook, plugin: SportsbookPlugin, options: Dict = None
+    ) -> OddsFetcher:
+        """Construct a plugin's fetcher, with `options` overriding the plugin's own"""
+        # Only configured sportsbooks' modules are imported
+        fetcher_class = registry.load(plugin.fetcher)
+        fetcher = fetcher_class(
+            api_url=self.settings.sportsbook_api_urls.get(sportsbook),
+            site_url=self.settings.sportsbook_site_urls.get(sportsbook),
+            **{**plugin.options, **(options or {})},
+        )
+        if plugin.parser:
+            # Called like a method: parser(fetcher, content) -> List[GameOdds]
+            fetcher.parse_odds = partial(registry.load(plugin.parser), fetcher)
+        return fetcher
+
+    def _ingestion_feeds(self) -> Dict[Sportsbook, List[OddsFetcher]]:
+        """One fetcher per ingestion feed: each `ingestion_feeds` entry, else the whole book"""
+        feeds = {}
+        for sportsbook, fetcher in self.odds_fetchers.items():
+            overrides = self.settings.ingestion_feeds.get(sportsbook)
+            if overrides:
+                plugin = self.sportsbook_registry.get(sportsbook)
+                feeds[sportsbook] = [
+                    self._build_fetcher(sportsbook, plugin, options)
+                    for options in overrides
+                ]
+            else:
+                feeds[sportsbook] = [fetcher]
+        return feeds
+
+    def _setup_browser_automations(self) -> Dict[Sportsbook, "BrowserAutomation"]:
         """Setup browser automations for each sportsbook"""
         automations = {}
 
-        if Sportsbook.DRAFTKINGS in self.settings.sportsbooks:
-            automations[Sportsbook.DRAFTKINGS] = DraftKingsBrowser()
-
-        if Sportsbook.BETMGM in self.settings.sportsbooks:
-            automations[Sportsbook.BETMGM] = BetMGMBrowser()
+        for sportsbook in self.settings.sportsbooks:
+            plugin = self.sportsbook_registry.get(sportsbook)
+            if plugin is None or not plugin.browser:
+                self.logger.error(f"No browser automation registered for {sportsbook}")
+                continue
+            automations[sportsbook] = registry.load(plugin.browser)()
 
         return automations
 
+    def _setup_memory_governor(self) -> MemoryGovernor:
+        """Register every cache and queue the loop keeps with a memory governor"""
+        governor = MemoryGovernor(
+            check_ticks=self.settings.memory_check_ticks,
+            trace_allocations=self.settings.memory_trace_allocations,
+            rss_limit_bytes=self.settings.memory_limit_bytes,
+        )
+
+        # Grows with every team pairing ever listed, so it is trimmed
+        detector = self.arbitrage_detector
+        governor.register(
+            "game_keys",
+            lambda: detector.game_key_cache_size,
+            limit=self.settings.max_game_key_cache,
+            evict=detector.evict_game_keys,
+        )
+
+        # The rest bound themselves (queues drop and count, parse caches
+        # are swept every fetch) and are only reported
+        governor.register("opportunity_events", self.opportunity_events.qsize)
+        governor.register("pending_opportunities", self.pending_opportunities.__len__)
+        for sportsbook, fetcher in self.odds_fetchers.items():
+            parsed_cache = getattr(fetcher, "fetcher", fetcher).parsed_cache
+            governor.register(f"parsed_cache.{sportsbook}", parsed_cache.__len__)
+        for sportsbook, worker in self.browser_workers.items():
+            governor.register(
+                f"browser_commands.{sportsbook}", lambda w=worker: w.pending
+            )
+        if self.history:
+            governor.register("history_queue", lambda: self.history.pending)
+        if self.store:
+            governor.register("store_queue", lambda: self.store.pending)
+
+        return governor
+
     def run_continuous_loop(self):
         """Main continuous monitoring loop"""
         self.logger.info("Starting arbitrage bot...")
 
+        if self.ingestion:
+            self.ingestion.start()
+        if self.history:
+            self.history.start()
+        if self.store:
+            self.store.start()
+        if self.query_server:
+            self.query_server.start()
+        for fetcher in self.streaming_fetchers:
+            fetcher.start(self.odds_book, self.stream_updates.set)
+        if self.config_watcher:
+            self.config_watcher.start()
+        if self.memory_governor:
+            self.memory_governor.start()
+
+        next_poll = 0.0
         try:
             while True:
-                self.logger.info("Starting new iteration...")
-
-                # Step 1: Fetch odds from all sportsbooks
-                all_odds = self._fetch_all_odds()
-                # print(all_odds)
-
-                # Step 2: Detect arbitrage opportunities
-                opportunities = self.arbitrage_detector.detect_opportunities(all_odds)
+                tick_started = time.perf_counter()
+                self.loop_stats.lines_changed = 0
+                if self.config_watcher:
+                    self._apply_config_reloads()
+
+                # Step 1: Fetch odds from all sportsbooks into the odds book
+                # (push feeds also update it between polls)
+                polled = tick_started >= next_poll
+                if polled:
+                    self.logger.info("Starting new iteration...")
+                    if self.ingestion:
+                        self._read_ingested_odds()
+                    else:
+                        self._fetch_all_odds()
+
+                # Step 2: Collect opportunities opened by this tick's updates
+                opportunities = self._drain_opportunity_events()
                 for opportunity in opportunities:
                     print(opportunity)
 
+                if self.execution_queue:
+                    self._collect_execution_results()
+
+                self._finish_tick(tick_started, len(opportunities))
+
                 # Step 3: Execute browser actions for opportunities
                 if opportunities:
                     self._execute_arbitrage_actions(opportunities)
 
-                # Step 4: Wait for next iteration
-                self.logger.info(
-                    f"Waiting {self.settings.refresh_interval_seconds} seconds..."
-                )
-                time.sleep(self.settings.refresh_interval_seconds)
+                # Step 4: Wait for the next poll, waking early for pushed updates
+                if polled:
+                    self.logger.info(
+                        f"Waiting {self.settings.refresh_interval_seconds} seconds..."
+                    )
+                    next_poll = (
+                        time.perf_counter() + self.settings.refresh_interval_seconds
+                    )
+                self._wait_for_updates(next_poll)
 
         except KeyboardInterrupt:
             self.logger.info("Stopping arbitrage bot...")
         except Exception as e:
             self.logger.error(f"Error in main loop: {e}")
             raise
+        finally:
+            if self.ingestion:
+                self.ingestion.stop()
+            if self.history:
+                self.history.stop()
+            if self.store:
+                self.store.stop()
+            if self.query_server:
+                self.query_server.stop()
+            for fetcher in self.streaming_fetchers:
+                fetcher.stop()
+            if self.config_watcher:
+                self.config_watcher.stop()
+            if self.memory_governor:
+                self.memory_governor.stop()
+            self.fetch_executor.shutdown(wait=False)
+            for worker in self.browser_workers.values():
+                worker.stop()
+
+    def run_executor_loop(self, worker_id: str = None):
+        """Claim opportunities from the execution queue and place them
+
+        Runs instead of `run_continuous_loop` in executor processes. Only
+        opportunities whose two sportsbooks both have a browser here are
+        claimed, so nodes can split sportsbooks between them.
+        """
+        if not self.execution_queue:
+            raise ValueError("execution_queue_path is not set")
+
+        worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        books = list(self.browser_automations) or list(self.settings.sportsbooks)
+        self.logger.info(f"Executor {worker_id} claiming opportunities for {books}")
+
+        try:
+            while True:
+                job = self.execution_queue.claim(worker_id, books)
+                if job is None:
+                    time.sleep(self.settings.executor_poll_seconds)
+                    continue
+
+                self.logger.info(f"Claimed execution job {job.id}: {job.opportunity}")
+                started_at = time.time()
+                started = time.perf_counter()
+                steps: List[ExecutionStep] = []
+                with self.execution_queue.keep_leased(job):
+                    outcome = self._place_opportunity(job.opportunity, steps)
+                self.execution_queue.complete(
+                    job, outcome, started_at, time.perf_counter() - started, steps
+                )
+
+        except KeyboardInterrupt:
+            self.logger.info("Stopping executor...")
+        finally:
+            for worker in self.browser_workers.values():
+                worker.stop()
+
+    def _collect_execution_results(self):
+        """Apply results reported by executor processes since the last tick
+
+        Reserved stakes are kept for bets that were placed and released for
+        jobs that failed, expired unclaimed or were abandoned.
+        """
+        jobs, self._results_cursor = self.execution_queue.results_after(
+            self._results_cursor
+        )
+
+        for job in jobs:
+            if job.late:
+                self.logger.warning(
+                    f"Execution job {job.id} {job.outcome} by {job.worker_id} in "
+                    f"{job.seconds:.2f}s, after its lease was lost"
+                )
+            else:
+                self.logger.info(
+                    f"Execution job {job.id} {job.outcome} by {job.worker_id} in {job.seconds:.2f}s"
+                )
+            placed = (
+                self._placed_books(job.steps)
+                if job.outcome in ("placed", "partial")
+                else []
+            )
+            if not self.stake_allocator.settle(job.id, placed) and placed:
+                # Enqueued before this process started, or reported late
+                # after the stakes were released, so not reserved
+                self.stake_allocator.commit(job.opportunity, placed)
+            if self.store:
+                self.store.record_execution(
+                    job.opportunity,
+                    job.started_at,
+                    job.seconds,
+                    job.outcome,
+                    job.steps,
+                    job.id,
+                )
+
+        # Release the stakes of jobs that will never report a result
+        reserved = self.stake_allocator.reservations
+        if reserved:
+            from arbitrage_bot.storage.work_queue import ABANDONED, EXPIRED
+
+            statuses = self.execution_queue.statuses(reserved)
+            for job_id in reserved:
+                status = statuses.get(job_id)
+                if status in (EXPIRED, ABANDONED, None):
+                    self.stake_allocator.settle(job_id)
+                    self.logger.info(
+                        f"Execution job {job_id} {status or 'purged'}, stakes released"
+                    )
+
+    def _apply_config_reloads(self):
+        """Activate settings and team mappings the watcher loaded since the last tick"""
+        for path, loaded in self.config_watcher.take().items():
+            self._config_appliers[path](loaded)
+
+    def _apply_settings(self, settings: Settings):
+        """Swap in the reloadable part of freshly loaded settings"""
+        restart = self.settings.restart_changes(settings)
+        if restart:
+            self.logger.warning(
+                f"Settings changes need a restart to take effect: {restart}"
+            )
+
+        changes = self.settings.reloadable_changes(settings)
+        if not changes:
+            return
+        self.settings = dataclasses.replace(self.settings, **changes)
+
+        self.arbitrage_detector.min_profit_percentage = (
+            self.settings.min_profit_percentage
+        )
+        self.arbitrage_detector.total_bet_amount = self.settings.total_bet_amount
+        self.stake_allocator.total_bet_amount = self.settings.total_bet_amount
+        self.stake_allocator.max_stake_per_bet = self.settings.max_stake_per_bet
+        self.stake_allocator.stake_rounding = self.settings.stake_rounding
+        if "book_balances" in changes:
+            self.stake_allocator.set_balances(self.settings.book_balances)
+        self.logger.info(f"Reloaded settings: {', '.join(sorted(changes))}")
+
+    def _apply_team_mappings(self, mappings: Dict[str, str]):
+        """Swap in new team mappings and re-key only the games they affect"""
+        changed = self.arbitrage_detector.team_mapper.swap_mappings(mappings)
+        dropped = self.arbitrage_detector.invalidate_teams(changed)
+        # Not conditional on `dropped`: the memory governor may already have
+        # evicted a game key that the book is still filed under
+        moved = self.odds_book.reindex(changed) if changed else 0
+        self.logger.info(
+            f"Reloaded team mappings: {len(changed)} names changed, "
+            f"{dropped} cached game keys dropped, {moved} lines moved"
+        )
+
+    def _wait_for_updates(self, deadline: float):
+        """Sleep until `deadline` (perf_counter), or until a push feed changes a line"""
+        remaining = max(0.0, deadline - time.perf_counter())
+        if not self.streaming_fetchers:
+            time.sleep(remaining)
+        elif self.stream_updates.wait(remaining):
+            self.stream_updates.clear()
+
+    def _finish_tick(self, tick_started: float, opened: int):
+        """Update loop stats, run due memory checks and publish a snapshot to the query API"""
+        stats = self.loop_stats
+        stats.ticks += 1
+        stats.last_tick_at = time.time()
+        stats.last_tick_seconds = time.perf_counter() - tick_started
+        stats.total_lines_changed += stats.lines_changed
+        stats.opportunities_opened += opened
+        stats.open_opportunities = len(self.odds_book.get_open_opportunities())
+        stats.dropped_events = self.odds_book.dropped_events
+        stats.allocations_skipped = self.stake_allocator.skipped
+        stats.streamed_updates = sum(f.updates_applied for f in self.streaming_fetchers)
+        stats.streams_connected = sum(f.connected for f in self.streaming_fetchers)
+
+        if self.memory_governor and self.memory_governor.on_tick(stats):
+            if self.execution_queue:
+                self.execution_queue.purge(
+                    time.time() - self.settings.execution_retention_seconds
+                )
+
+        if self.query_server:
+            from arbitrage_bot.api import BoardSnapshot
+
+            self.query_server.publish(
+                BoardSnapshot.capture(self.odds_book, stats, stats.ticks)
+            )
 
     def _fetch_all_odds(self) -> Dict[str, List[GameOdds]]:
-        """Fetch odds from all sportsbooks in parallel"""
+        """Fetch odds from all sportsbooks in parallel
+
+        Books whose fetch failed are left out of the result and their lines
+        in the odds book are left untouched.
+        """
         all_odds = {}
 
-        with ThreadPoolExecutor(max_workers=len(self.odds_fetchers)) as executor:
-            # Submit all fetch tasks
-            future_to_sportsbook = {
-                executor.submit(fetcher.fetch_odds): sportsbook
-                for sportsbook, fetcher in self.odds_fetchers.items()
-            }
+        # Submit all fetch tasks
+        future_to_sportsbook = {
+            self.fetch_executor.submit(
+                self._fetch_odds, sportsbook, fetcher
+            ): sportsbook
+            for sportsbook, fetcher in self.odds_fetchers.items()
+        }
+
+        # Collect results
+        for future in as_completed(future_to_sportsbook):
+            sportsbook = future_to_sportsbook[future]
+            try:
+                odds, changed = future.result()
+            except Exception as e:
+                # Keep the book's lines: an empty snapshot would close its
+                # opportunities and reopen them, to be bet again, next poll
+                self.logger.error(f"Error fetching odds from {sportsbook}: {e}")
+                self.loop_stats.fetch_errors += 1
+                continue
+
+            all_odds[sportsbook] = odds
+            self.logger.info(f"Fetched {len(odds)} odds from {sportsbook}")
+            if changed is None:
+                changed = self.odds_book.apply_snapshot(sportsbook, odds)
+            self.loop_stats.lines_changed += changed
+            self.logger.info(f"Applied {changed} changed lines from {sportsbook}")
+            if self.history:
+                self.history.record(sportsbook, odds)
 
-            # Collect results
-            for future in as_completed(future_to_sportsbook):
-                sportsbook = future_to_sportsbook[future]
-                try:
-                    odds = future.result()
-                    all_odds[sportsbook] = odds
-                    self.logger.info(f"Fetched {len(odds)} odds from {sportsbook}")
-                except Exception as e:
-                    self.logger.error(f"Error fetching odds from {sportsbook}: {e}")
-                    all_odds[sportsbook] = []
+        return all_odds
+
+    def _fetch_odds(
+        self, sportsbook: Sportsbook, fetcher: OddsFetcher
+    ) -> Tuple[List[GameOdds], Optional[int]]:
+        """
+        Fetch one sportsbook within its host's request limits
+
+        Returns:
+            The lines, and the number of lines changed if the fetcher
+            already applied them to the odds book (streaming fetchers do,
+            so a poll can't revert newer streamed prices), otherwise None
+        """
+        if sportsbook in self.streaming_books:
+            # Its polls take the host limiter themselves, on either thread
+            return fetcher.sync(self.odds_book)
+        with self.host_limiters[sportsbook]:
+            return fetcher.fetch_odds(), None
+
+    def _read_ingested_odds(self) -> Dict[str, List[GameOdds]]:
+        """Apply boards published by the ingestion workers since the last tick"""
+        all_odds = self.ingestion.read_changed()
+
+        for sportsbook, odds in all_odds.items():
+            changed = self.odds_book.apply_snapshot(sportsbook, odds)
+            self.loop_stats.lines_changed += changed
+            self.logger.info(
+                f"Read {len(odds)} odds from {sportsbook} shard, {changed} changed"
+            )
+            if self.history:
+                self.history.record(sportsbook, odds)
 
         return all_odds
 
+    def _drain_opportunity_events(self) -> List[ArbitrageOpportunity]:
+        """Consume pending odds book events and return the best open opportunities
+
+        Every event is consumed (and recorded). Opened opportunities wait in
+        `pending_opportunities` until they are picked or close, and each tick
+        takes the `max_opportunities_per_tick` best of them, ranked by profit
+        less a penalty for age, best first. The rest stay for later ticks.
+        """
+        self._apply_opportunity_events()
+
+        now = time.time()
+        pending = self.pending_opportunities
+        ranked = list(
+            top_k(
+                pending.items(),
+                self.settings.max_opportunities_per_tick,
+                lambda item: opportunity_score(
+                    item[1].opportunity, item[1].timestamp, now
+                ),
+            )
+        )
+        for key, _ in ranked:
+            del pending[key]
+        if pending:
+            self.logger.info(
+                f"Deferred {len(pending)} open opportunities past the "
+                f"{self.settings.max_opportunities_per_tick} per tick limit"
+            )
+        return [event.opportunity for _, event in ranked]
+
+    def _apply_opportunity_events(self):
+        """Update the pending opportunities from the odds book queue until it is empty"""
+        pending = self.pending_opportunities
+        while True:
+            try:
+                event = self.opportunity_events.get_nowait()
+            except queue.Empty:
+                break
+
+            if self.store:
+                self.store.record_event(event)
+
+            opportunity = event.opportunity
+            key = (event.game_key, event.market, opportunity.book1, opportunity.book2)
+            if event.event_type == OpportunityEventType.OPENED:
+                pending[key] = event
+            else:
+                self.logger.info(f"Opportunity event: {event}")
+                if event.event_type == OpportunityEventType.CLOSED:
+                    pending.pop(key, None)
+                elif key in pending:
+                    # Same opportunity at new prices, still not acted on
+                    pending[key] = event
+
+        # A full queue drops events, so a CLOSED may have been missed
+        if self.odds_book.dropped_events != self._seen_dropped_events:
+            self._seen_dropped_events = self.odds_book.dropped_events
+            open_keys = self.odds_book.get_open_keys()
+            for key in [key for key in pending if key not in open_keys]:
+                del pending[key]
+
     def _execute_arbitrage_actions(self, opportunities: List[ArbitrageOpportunity]):
         """Execute browser actions for arbitrage opportunities"""
         self.logger.info(f"Found {len(opportunities)} arbitrage opportunities!")
 
-        for opportunity in opportunities:
+        # Size stakes for the whole batch against balances and limits
+        allocated = self.stake_allocator.allocate(opportunities)
+        if len(allocated) < len(opportunities):
+            self.logger.info(
+                f"Allocated stakes to {len(allocated)} of {len(opportunities)} opportunities"
+            )
+
+        # Executor processes place the bets; results arrive on later ticks
+        if self.execution_queue:
+            for opportunity in allocated:
+                job_id = self.execution_queue.enqueue(opportunity)
+                # Held until the job's outcome is known, so later ticks
+                # don't allocate the same balance
+                self.stake_allocator.reserve(job_id, opportunity)
+                self.logger.info(f"Queued execution job {job_id}: {opportunity}")
+            return
+
+        # Step results per opportunity, and open_url commands queued for the
+        # next opportunity while the current one settles
+        all_steps: List[List[ExecutionStep]] = [[] for _ in allocated]
+        opened: Dict[int, List[Future]] = {}
+
+        for index, opportunity in enumerate(allocated):
             self.logger.info(f"Processing opportunity: {opportunity}")
 
-            if self.settings.enable_browser_automation:
-                self._execute_browser_actions(opportunity)
-            else:
-                # Just log the opportunity for proof of concept
-                self.logger.info(
-                    f"Would place bet: ${opportunity.bet1_amount:.2f} on {opportunity.book1} "
-                    f"and ${opportunity.bet2_amount:.2f} on {opportunity.book2}"
+            started_at = time.time()
+            started = time.perf_counter()
+            steps = all_steps[index]
+
+            following = index + 1
+
+            def open_following():
+                if following < len(allocated):
+                    opened[following] = self._open_urls(
+                        allocated[following], all_steps[following]
+                    )
+
+            outcome = self._place_opportunity(
+                opportunity, steps, opened.pop(index, None), open_following
+            )
+            if outcome in ("placed", "partial"):
+                self.stake_allocator.commit(opportunity, self._placed_books(steps))
+
+            if self.store:
+                self.store.record_execution(
+                    opportunity,
+                    started_at,
+                    time.perf_counter() - started,
+                    outcome,
+                    steps,
+                )
+
+    def _place_opportunity(
+        self,
+        opportunity: ArbitrageOpportunity,
+        steps: List[ExecutionStep],
+        opened: List[Future] = None,
+        on_settle: Callable[[], None] = None,
+    ) -> str:
+        """Place both bets, or only log them without browser automation
+
+        Returns:
+            "placed", "partial" (only one bet was placed), "failed" or
+            "simulated"
+        """
+        if self.settings.enable_browser_automation:
+            placed = self._execute_browser_actions(
+                opportunity, steps, opened, on_settle
+            )
+            if len(placed) == 2:
+                return "placed"
+            if placed:
+                self.logger.error(
+                    f"Only the {placed[0]} bet was placed, position is unhedged: {opportunity}"
                 )
+                return "partial"
+            return "failed"
 
-    def _execute_browser_actions(self, opportunity: ArbitrageOpportunity):
-        """Execute browser actions for a single arbitrage opportunity"""
+        # Just log the opportunity for proof of concept
+        self.logger.info(
+            f"Would place bet: ${opportunity.bet1_amount:.2f} on {opportunity.book1} "
+            f"and ${opportunity.bet2_amount:.2f} on {opportunity.book2}"
+        )
+        return "simulated"
+
+    def _execute_browser_actions(
+        self,
+        opportunity: ArbitrageOpportunity,
+        steps: List[ExecutionStep] = None,
+        opened: List[Future] = None,
+        on_settle: Callable[[], None] = None,
+    ) -> List[Sportsbook]:
+        """Execute browser actions for a single arbitrage opportunity
+
+        Each command is queued on the browser's own worker, so the two books
+        run in parallel while every driver only ever runs one command at a
+        time.
+
+        Args:
+            opportunity: Opportunity to place
+            steps: Optional list that receives each step's timing and result
+            opened: open_url futures already queued for this opportunity
+            on_settle: Called once the bets and betslip clears are queued, to
+                queue the next opportunity's open_url behind them
+
+        Returns:
+            Sportsbooks whose bet was placed (both on success, none if the
+            betslips failed before placing)
+        """
+        if steps is None:
+            steps = []
         try:
             book_1_browser = self.browser_automations[opportunity.book1]
             book_2_browser = self.browser_automations[opportunity.book2]
+            book_1_worker = self.browser_workers[opportunity.book1]
+            book_2_worker = self.browser_workers[opportunity.book2]
 
-            with ThreadPoolExecutor(max_workers=2) as executor:
-                # Load urls for both sportsbo oks
-                futures = []
-                futures.append(
-                    executor.submit(
-                        book_1_browser.open_url,
-                        opportunity.book1_url,
-                    )
-                )
-                futures.append(
-                    executor.submit(
-                        book_2_browser.open_url,
-                        opportunity.book2_url,
-                    )
-                )
-                # Wait for both to complete
-                for future in as_completed(futures):
-                    try:
-                        future.result()
-                    except Exception as e:
-                        self.logger.error(f"Error in browser action: {e}")
-
-                # Fill betslip
-                futures = []
-                futures.append(
-                    executor.submit(
-                        book_1_browser.fill_betslip,
-                        opportunity.bet1_amount,
-                    )
-                )
-                futures.append(
-                    executor.submit(
-                        book_2_browser.fill_betslip,
-                        opportunity.bet2_amount,
-                    )
-                )
-                # Wait for both to complete
-                any_failed = False
-                for future in as_completed(futures):
-                    try:
-                        result = future.result()
-                        if not result:
-                            any_failed = True
-                    except Exception as e:
-                        self.logger.error(f"Error in browser action: {e}")
-
-                if any_failed:
-                    self.clear_betslips(book_1_browser, book_2_browser)
-                    self.logger.error("One or more bets failed, clearing betslips")
-                    return
-
-                # Verify odds
-                futures = []
-                futures.append(
-                    executor.submit(
-                        book_1_browser.verify_odds,
-                        opportunity.book1_odds,
-                    )
-                )
-                futures.append(
-                    executor.submit(
-                        book_2_browser.verify_odds,
-                        opportunity.book2_odds,
-                    )
-                )
-                # Wait for both to complete
-                for future in as_completed(futures):
-                    try:
-                        result = future.result()
-                        if not result:
-                            any_failed = True
-                    except Exception as e:
-                        self.logger.error(f"Error in browser action: {e}")
-
-                if any_failed:
-                    self.clear_betslips(book_1_browser, book_2_browser)
-                    self.logger.error("One or more bets failed, clearing betslips")
-                    return
-
-                # Place bet
-                futures = []
-                futures.append(
-                    executor.submit(
-                        book_1_browser.place_bet,
-                    )
-                )
-                futures.append(
-                    executor.submit(
-                        book_2_browser.place_bet,
-                    )
-                )
-                # Wait for both to complete
-                for future in as_completed(futures):
-                    try:
-                        future.result()
-                    except Exception as e:
-                        self.logger.error(f"Error in browser action: {e}")
+            # Load urls for both sportsbooks
+            futures = opened or self._open_urls(opportunity, steps)
+            # Wait for both to complete
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    self.logger.error(f"Error in browser action: {e}")
+
+            # Fill betslip
+            futures = [
+                book_1_worker.submit(
+                    self._timed_step,
+                    steps,
+                    "fill_betslip",
+                    opportunity.book1,
+                    book_1_browser.fill_betslip,
+                    opportunity.bet1_amount,
+                ),
+                book_2_worker.submit(
+                    self._timed_step,
+                    steps,
+                    "fill_betslip",
+                    opportunity.book2,
+                    book_2_browser.fill_betslip,
+                    opportunity.bet2_amount,
+                ),
+            ]
+            # Wait for both to complete
+            any_failed = False
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                    if not result:
+                        any_failed = True
+                except Exception as e:
+                    self.logger.error(f"Error in browser action: {e}")
 
-                self.logger.info("Completed browser actions for all sportsbooks")
+            if any_failed:
+                self.clear_betslips(book_1_browser, book_2_browser)
+                self.logger.error("One or more bets failed, clearing betslips")
+                return []
+
+            # Verify odds
+            futures = [
+                book_1_worker.submit(
+                    self._timed_step,
+                    steps,
+                    "verify_odds",
+                    opportunity.book1,
+                    book_1_browser.verify_odds,
+                    opportunity.book1_odds,
+                ),
+                book_2_worker.submit(
+                    self._timed_step,
+                    steps,
+                    "verify_odds",
+                    opportunity.book2,
+                    book_2_browser.verify_odds,
+                    opportunity.book2_odds,
+                ),
+            ]
+            # Wait for both to complete
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                    if not result:
+                        any_failed = True
+                except Exception as e:
+                    self.logger.error(f"Error in browser action: {e}")
 
+            if any_failed:
                 self.clear_betslips(book_1_browser, book_2_browser)
+                self.logger.error("One or more bets failed, clearing betslips")
+                return []
+
+            # Place bet, with each betslip clear queued right behind it
+            futures = {
+                book_1_worker.submit(
+                    self._timed_step,
+                    steps,
+                    "place_bet",
+                    opportunity.book1,
+                    book_1_browser.place_bet,
+                ): opportunity.book1,
+                book_2_worker.submit(
+                    self._timed_step,
+                    steps,
+                    "place_bet",
+                    opportunity.book2,
+                    book_2_browser.place_bet,
+                ): opportunity.book2,
+            }
+            clearing = [
+                book_1_worker.submit(book_1_browser.clear_betslip),
+                book_2_worker.submit(book_2_browser.clear_betslip),
+            ]
+            if on_settle:
+                on_settle()
+
+            # Wait for both to complete
+            placed = []
+            for future in as_completed(futures):
+                try:
+                    if future.result() is not False:
+                        placed.append(futures[future])
+                except Exception as e:
+                    self.logger.error(f"Error in browser action: {e}")
+
+            self.logger.info("Completed browser actions for all sportsbooks")
+
+            self._wait_for_clears(clearing)
+            return placed
 
         except Exception as e:
             self.logger.error(f"Error executing browser actions: {e}")
 
-    def clear_betslips(
-        self, book_1_browser: BrowserAutomation, book_2_browser: BrowserAutomation
+        return []
+
+    @staticmethod
+    def _placed_books(steps: List[ExecutionStep]) -> List[str]:
+        """Sportsbooks whose place_bet step succeeded"""
+        return [
+            step.sportsbook
+            for step in steps
+            if step.step == "place_bet" and step.success
+        ]
+
+    def _open_urls(
+        self, opportunity: ArbitrageOpportunity, steps: List[ExecutionStep]
+    ) -> List[Future]:
+        """Queue open_url for both sides of an opportunity"""
+        return [
+            self.browser_workers[book].submit(
+                self._timed_step,
+                steps,
+                "open_url",
+                book,
+                self.browser_automations[book].open_url,
+                url,
+            )
+            for book, url in (
+                (opportunity.book1, opportunity.book1_url),
+                (opportunity.book2, opportunity.book2_url),
+            )
+        ]
+
+    def _timed_step(
+        self,
+        steps: List[ExecutionStep],
+        step: str,
+        sportsbook: Sportsbook,
+        action: Callable,
+        *args,
     ):
-        """Execute browser actions for a specific sportsbook"""
-
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            # Clear betslips
-            futures = []
-            futures.append(
-                executor.submit(
-                    book_1_browser.clear_betslip,
-                )
+        """Run one browser action and append its timing and result to `steps`"""
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            result = action(*args)
+        except Exception as e:
+            seconds = time.perf_counter() - started
+            steps.append(
+                ExecutionStep(step, sportsbook, started_at, seconds, False, str(e))
             )
+            raise
 
-            futures.append(
-                executor.submit(
-                    book_2_browser.clear_betslip,
-                )
-            )
-            # Wait for both to complete
-            for future in as_completed(futures):
-                try:
-                    future.result()
-                except Exception as e:
-                    self.logger.error(f"Error in browser action: {e}")
+        # Only fill/verify report success; other actions return None
+        seconds = time.perf_counter() - started
+        steps.append(
+            ExecutionStep(step, sportsbook, started_at, seconds, result is not False)
+        )
+        return result
+
+    def clear_betslips(
+        self, book_1_browser: "BrowserAutomation", book_2_browser: "BrowserAutomation"
+    ):
+        """Clear both betslips, each on its browser's worker"""
+        workers = {
+            worker.automation: worker for worker in self.browser_workers.values()
+        }
+        self._wait_for_clears(
+            [
+                workers[book_1_browser].submit(book_1_browser.clear_betslip),
+                workers[book_2_browser].submit(book_2_browser.clear_betslip),
+            ]
+        )
+
+    def _wait_for_clears(self, futures: List[Future]):
+        # Wait for both to complete
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                self.logger.error(f"Error in browser action: {e}")
@@ -0,0 +1,174 @@
+import importlib
+import logging
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional
+
+from arbitrage_bot.models.sportsbooks import Sportsbook
+
+logger = logging.getLogger(__name__)
+
+# Installed packages can add sportsbooks by exposing a SportsbookPlugin here
+ENTRY_POINT_GROUP = "arbitrage_bot.sportsbooks"
+
+
+@dataclass(frozen=True)
+class SportsbookPlugin:
+    """
+    Everything the orchestrator needs to run one sportsbook
+
+    Classes are given as "module:attribute" paths and imported only when the
+    sportsbook is configured. The fetcher is constructed with
+    `api_url`/`site_url` keyword arguments plus `options`.
+    """
+
+    name: str
+    fetcher: str
+    browser: Optional[str] = None
+    # Optional "module:function" turning a raw payload into List[GameOdds];
+    # replaces the fetcher's own parse_odds and is called like a method,
+    # as parser(fetcher, content)
+    parser: Optional[str] = None
+    # Per-host limits, shared by every sportsbook that fetches from the host
+    max_concurrent_requests: int = 1
+    min_request_interval: float = 0.0
+    options: Dict[str, Any] = field(default_factory=dict)
+
+
+BUILTIN_PLUGINS = [
+    SportsbookPlugin(
+        name=Sportsbook.DRAFTKINGS,
+        fetcher="arbitrage_bot.odds.draftkings:DraftKingsOddsFetcher",
+        browser="arbitrage_bot.browser.draftkings:DraftKingsBrowser",
+    ),
+    SportsbookPlugin(
+        name=Sportsbook.BETMGM,
+        fetcher="arbitrage_bot.odds.betmgm:BetMGMOddsFetcher",
+        browser="arbitrage_bot.browser.betmgm:BetMGMBrowser",
+    ),
+]
+
+
+class HostLimiter:
+    """Caps concurrent requests to a host and spaces them out"""
+
+    def __init__(
+        self, max_concurrent_requests: int = 1, min_request_interval: float = 0.0
+    ):
+        self.max_concurrent_requests = max_concurrent_requests
+        self.min_request_interval = min_request_interval
+        self._semaphore = threading.BoundedSemaphore(max_concurrent_requests)
+        self._lock = threading.Lock()
+        self._next_request = 0.0
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        if self.min_request_interval:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._next_request - now
+                self._next_request = (
+                    max(now, self._next_request) + self.min_request_interval
+                )
+            if wait > 0:
+                time.sleep(wait)
+        return self
+
+    def __exit__(self, *exc_info):
+        self._semaphore.release()
+
+
+class SportsbookRegistry:
+    """Sportsbook plugins by name: built-ins, entry points, then config"""
+
+    def __init__(self, plugins: List[SportsbookPlugin] = ()):
+        self._plugins: Dict[str, SportsbookPlugin] = {}
+        for plugin in plugins:
+            self.register(plugin)
+
+    @classmethod
+    def default(cls, config: Dict[str, Dict[str, Any]] = None) -> "SportsbookRegistry":
+        """
+        Build the registry the orchestrator uses
+
+        Args:
+            config: Plugin definitions keyed by sportsbook name (the
+                `sportsbook_plugins` setting). Missing fields fall back to an
+                already registered plugin of the same name, so a config
+                entry can override just the limits of a built-in sportsbook.
+        """
+        registry = cls(BUILTIN_PLUGINS)
+        registry.load_entry_points()
+        for name, definition in (config or {}).items():
+            registry.register_config(name, definition)
+        return registry
+
+    def register(self, plugin: SportsbookPlugin):
+        """Add or replace a sportsbook"""
+        self._plugins[str(plugin.name)] = plugin
+
+    def register_config(self, name: str, definition: Dict[str, Any]):
+        """Add or update a sportsbook from a settings dictionary"""
+        known = {f.name for f in fields(SportsbookPlugin)}
+        unknown = set(definition) - known
+        if unknown:
+            raise ValueError(f"Unknown fields for sportsbook {name}: {sorted(unknown)}")
+
+        base = self._plugins.get(name)
+        values = (
+            {f.name: getattr(base, f.name) for f in fields(SportsbookPlugin)}
+            if base
+            else {}
+        )
+        values.update(definition, name=name)
+        self.register(SportsbookPlugin(**values))
+
+    def load_entry_points(self):
+        """Register plugins exposed under the arbitrage_bot.sportsbooks group"""
+        from importlib.metadata import entry_points
+
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            try:
+                plugin = entry_point.load()
+            except Exception as e:
+                logger.error(f"Error loading sportsbook plugin {entry_point.name}: {e}")
+                continue
+            if not isinstance(plugin, SportsbookPlugin):
+                logger.error(
+                    f"Entry point {entry_point.name} is not a SportsbookPlugin"
+                )
+                continue
+            self.register(plugin)
+
+    def get(self, name: str) -> Optional[SportsbookPlugin]:
+        return self._plugins.get(str(name))
+
+    def names(self) -> List[str]:
+        return list(self._plugins)
+
+    def __contains__(self, name: str) -> bool:
+        return str(name) in self._plugins
+
+
+def load(path: str) -> Any:
+    """Import "package.module:attribute" and return the attribute"""
+    module_name, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def lazy_attribute(package: str, exports: Dict[str, str], name: str) -> Any:
+    """
+    Resolve a lazily exported attribute for a package's __getattr__
+
+    Args:
+        package: The package's __name__
+        exports: Attribute name -> relative module that defines it
+        name: Attribute being looked up
+
+    Raises:
+        AttributeError: If the package does not export `name`
+    """
+    if name not in exports:
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(exports[name], package), name)
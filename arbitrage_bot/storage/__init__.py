@@ -0,0 +1,4 @@
+from .database import ExecutionStep, OpportunityStore
+from .work_queue import ExecutionQueue
+
+__all__ = ["ExecutionStep", "OpportunityStore", "ExecutionQueue"]
@@ -0,0 +1,345 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing, contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from arbitrage_bot.models.arbitrage import ArbitrageOpportunity
+from arbitrage_bot.models.events import OpportunityEvent
+from arbitrage_bot.models.execution import ExecutionStep
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS opportunities (
+    id INTEGER PRIMARY KEY,
+    detected_at REAL NOT NULL,
+    hour INTEGER NOT NULL,
+    event_type TEXT NOT NULL,
+    game_key TEXT NOT NULL,
+    market TEXT NOT NULL,
+    team1 TEXT NOT NULL,
+    team2 TEXT NOT NULL,
+    book1 TEXT NOT NULL,
+    book2 TEXT NOT NULL,
+    book1_odds REAL NOT NULL,
+    book2_odds REAL NOT NULL,
+    profit_percentage REAL NOT NULL,
+    bet1_amount REAL NOT NULL,
+    bet2_amount REAL NOT NULL,
+    total_profit REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS opportunities_game ON opportunities (game_key, detected_at);
+CREATE INDEX IF NOT EXISTS opportunities_books ON opportunities (book1, book2, detected_at);
+CREATE INDEX IF NOT EXISTS opportunities_hourly ON opportunities (
+    event_type, hour, book1, book2, profit_percentage
+);
+CREATE INDEX IF NOT EXISTS opportunities_time ON opportunities (detected_at);
+
+CREATE TABLE IF NOT EXISTS executions (
+    id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    seconds REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    team1 TEXT NOT NULL,
+    team2 TEXT NOT NULL,
+    book1 TEXT NOT NULL,
+    book2 TEXT NOT NULL,
+    book1_odds REAL NOT NULL,
+    book2_odds REAL NOT NULL,
+    bet1_amount REAL NOT NULL,
+    bet2_amount REAL NOT NULL,
+    total_profit REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS executions_books ON executions (book1, book2, started_at);
+CREATE INDEX IF NOT EXISTS executions_time ON executions (started_at);
+CREATE INDEX IF NOT EXISTS executions_outcome ON executions (outcome, seconds);
+
+CREATE TABLE IF NOT EXISTS execution_steps (
+    id INTEGER PRIMARY KEY,
+    execution_id TEXT NOT NULL,
+    step TEXT NOT NULL,
+    sportsbook TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    seconds REAL NOT NULL,
+    success INTEGER NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS execution_steps_execution ON execution_steps (execution_id);
+CREATE INDEX IF NOT EXISTS execution_steps_book ON execution_steps (sportsbook, step, started_at);
+"""
+
+INSERT_OPPORTUNITY = """
+INSERT INTO opportunities (
+    detected_at, hour, event_type, game_key, market, team1, team2, book1, book2,
+    book1_odds, book2_odds, profit_percentage, bet1_amount, bet2_amount, total_profit
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_EXECUTION = """
+INSERT OR REPLACE INTO executions (
+    id, started_at, seconds, outcome, team1, team2, book1, book2,
+    book1_odds, book2_odds, bet1_amount, bet2_amount, total_profit
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_STEP = """
+INSERT INTO execution_steps (
+    execution_id, step, sportsbook, started_at, seconds, success, error
+) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class OpportunityStore:
+    """
+    SQLite store for opportunities, executions and their step timings
+
+    Writes are queued and committed by a background thread in batches (one
+    transaction per batch, WAL mode), so callers never wait on disk. If the
+    queue is full, rows are dropped and counted rather than blocking the
+    loop. Queries open their own connection and can run while the writer
+    is committing.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        queue_size: int = 10000,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped_rows = 0
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+
+        with self._transaction() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+
+    def start(self):
+        """Start the background writer"""
+        self._thread = threading.Thread(
+            target=self._run, name="opportunity-store", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Write everything still queued and stop the writer"""
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if self.dropped_rows:
+            logger.warning(f"Opportunity store dropped {self.dropped_rows} rows")
+
+    @property
+    def pending(self) -> int:
+        """Number of rows queued for the writer"""
+        return self._queue.qsize()
+
+    def flush(self):
+        """Block until every queued row has been committed"""
+        self._queue.join()
+
+    def record_event(self, event: OpportunityEvent):
+        """Queue an opportunity event (opened/updated/closed)"""
+        opportunity = event.opportunity
+        self._enqueue(
+            INSERT_OPPORTUNITY,
+            (
+                event.timestamp,
+                int(event.timestamp // 3600) * 3600,
+                str(event.event_type),
+                event.game_key,
+                event.market,
+                opportunity.team1,
+                opportunity.team2,
+                str(opportunity.book1),
+                str(opportunity.book2),
+                opportunity.book1_odds,
+                opportunity.book2_odds,
+                opportunity.profit_percentage,
+                opportunity.bet1_amount,
+                opportunity.bet2_amount,
+                opportunity.total_profit,
+            ),
+        )
+
+    def record_execution(
+        self,
+        opportunity: ArbitrageOpportunity,
+        started_at: float,
+        seconds: float,
+        outcome: str,
+        steps: List[ExecutionStep] = (),
+        execution_id: str = None,
+    ) -> str:
+        """
+        Queue an execution attempt and its step results
+
+        Returns:
+            The execution id the steps are stored under
+        """
+        execution_id = execution_id or uuid.uuid4().hex
+        self._enqueue(
+            INSERT_EXECUTION,
+            (
+                execution_id,
+                started_at,
+                seconds,
+                outcome,
+                opportunity.team1,
+                opportunity.team2,
+                str(opportunity.book1),
+                str(opportunity.book2),
+                opportunity.book1_odds,
+                opportunity.book2_odds,
+                opportunity.bet1_amount,
+                opportunity.bet2_amount,
+                opportunity.total_profit,
+            ),
+        )
+        for step in steps:
+            self._enqueue(
+                INSERT_STEP,
+                (
+                    execution_id,
+                    step.step,
+                    str(step.sportsbook),
+                    step.started_at,
+                    step.seconds,
+                    int(step.success),
+                    step.error,
+                ),
+            )
+        return execution_id
+
+    def arbs_per_book_pair_per_hour(
+        self, since: float = None, event_type: str = "opened"
+    ) -> List[Dict]:
+        """Count opportunities per (book1, book2) per hour, newest hour first"""
+        # Answered from the covering (event_type, hour, book1, book2, ...) index
+        with self._transaction() as connection:
+            rows = connection.execute(
+                """
+                SELECT book1, book2, hour, COUNT(*) AS count,
+                       AVG(profit_percentage) AS avg_profit_percentage
+                FROM opportunities
+                WHERE event_type = ? AND hour >= ?
+                GROUP BY hour, book1, book2
+                ORDER BY hour DESC, count DESC
+                """,
+                (event_type, int((since or 0) // 3600) * 3600),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def median_time_to_place(
+        self, since: float = None, outcome: str = "placed"
+    ) -> Optional[float]:
+        """Median seconds from starting an execution to both bets being placed"""
+        with self._transaction() as connection:
+            (count,) = connection.execute(
+                "SELECT COUNT(*) FROM executions WHERE outcome = ? AND started_at >= ?",
+                (outcome, since or 0.0),
+            ).fetchone()
+            if not count:
+                return None
+            # Walk the (outcome, seconds) index to the middle row(s)
+            rows = connection.execute(
+                """
+                SELECT seconds FROM executions
+                WHERE outcome = ? AND started_at >= ?
+                ORDER BY seconds LIMIT ? OFFSET ?
+                """,
+                (outcome, since or 0.0, 2 - count % 2, (count - 1) // 2),
+            ).fetchall()
+        return sum(row[0] for row in rows) / len(rows)
+
+    def step_timings(self, since: float = None) -> List[Dict]:
+        """Average and worst seconds per (sportsbook, step), with failure counts"""
+        with self._transaction() as connection:
+            rows = connection.execute(
+                """
+                SELECT sportsbook, step, COUNT(*) AS count, AVG(seconds) AS avg_seconds,
+                       MAX(seconds) AS max_seconds, SUM(1 - success) AS failures
+                FROM execution_steps
+                WHERE started_at >= ?
+                GROUP BY sportsbook, step
+                ORDER BY sportsbook, step
+                """,
+                (since or 0.0,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """A connection that commits (or rolls back) and is closed when the block ends"""
+        # The connection's own context manager commits but never closes it
+        with closing(self._connect()) as connection, connection:
+            yield connection
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def _enqueue(self, statement: str, row: Tuple):
+        try:
+            self._queue.put_nowait((statement, row))
+        except queue.Full:
+            self.dropped_rows += 1
+            if self.dropped_rows == 1:
+                logger.warning("Opportunity store queue full, dropping rows")
+
+    def _run(self):
+        connection = self._connect()
+        connection.execute("PRAGMA synchronous=NORMAL")
+        running = True
+        try:
+            while running:
+                batch = []
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                deadline = time.monotonic() + self.flush_interval
+
+                # Gather up to batch_size rows, waiting at most flush_interval
+                while True:
+                    if item is None:
+                        running = False
+                    else:
+                        batch.append(item)
+                    if not running or len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get(
+                            timeout=max(0.0, deadline - time.monotonic())
+                        )
+                    except queue.Empty:
+                        break
+
+                try:
+                    self._write(connection, batch)
+                except sqlite3.Error as e:
+                    logger.error(f"Error writing {len(batch)} rows to {self.path}: {e}")
+                finally:
+                    for _ in range(len(batch) + (0 if running else 1)):
+                        self._queue.task_done()
+        finally:
+            connection.close()
+
+    def _write(self, connection: sqlite3.Connection, batch: List[Tuple[str, Tuple]]):
+        grouped: Dict[str, List[Tuple]] = {}
+        for statement, row in batch:
+            grouped.setdefault(statement, []).append(row)
+        with connection:
+            for statement, rows in grouped.items():
+                connection.executemany(statement, rows)
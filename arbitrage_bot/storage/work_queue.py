@@ -0,0 +1,456 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing, contextmanager
+from dataclasses import asdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from arbitrage_bot.models.arbitrage import ArbitrageOpportunity
+from arbitrage_bot.models.execution import ExecutionJob, ExecutionStep
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS execution_jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    opportunity TEXT NOT NULL,
+    book1 TEXT NOT NULL,
+    book2 TEXT NOT NULL,
+    enqueued_at REAL NOT NULL,
+    expires_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_token TEXT,
+    lease_expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS execution_jobs_claim ON execution_jobs (status, enqueued_at);
+CREATE INDEX IF NOT EXISTS execution_jobs_lease ON execution_jobs (status, lease_expires_at);
+
+CREATE TABLE IF NOT EXISTS execution_results (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL UNIQUE,
+    worker_id TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    seconds REAL NOT NULL,
+    steps TEXT NOT NULL,
+    finished_at REAL NOT NULL
+);
+"""
+
+# Job statuses
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+# Finished by an executor that had already lost its lease
+LATE = "late"
+EXPIRED = "expired"
+ABANDONED = "abandoned"
+
+
+def _dump_opportunity(opportunity: ArbitrageOpportunity) -> str:
+    return json.dumps(asdict(opportunity))
+
+
+def _load_opportunity(document: str) -> ArbitrageOpportunity:
+    # Sportsbooks come back as plain strings, which compare and hash like
+    # the Sportsbook enum
+    return ArbitrageOpportunity(**json.loads(document))
+
+
+class ExecutionQueue:
+    """
+    Durable SQLite work queue between detection and execution
+
+    The detector enqueues opportunities; any number of executor processes
+    (on one machine, or sharing the file over a network mount that honours
+    SQLite locking) claim them. A claim runs in an immediate transaction,
+    so each job is leased to exactly one executor. The lease carries a
+    token that must be presented to renew it or report the result, so an
+    executor whose lease expired cannot overwrite a newer claim.
+
+    A job whose lease expires goes back to pending while it has attempts
+    left (`max_attempts`, 1 by default so a crashed executor never causes a
+    bet to be placed twice) and is marked abandoned otherwise. Jobs not
+    claimed within `ttl` seconds expire, since the prices are stale by then.
+    A result reported after the lease was lost is still recorded, and the
+    job is marked late so it is never claimed again.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lease_seconds: float = 30.0,
+        ttl: float = 10.0,
+        max_attempts: int = 1,
+    ):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+
+        # The journal mode cannot change inside a transaction
+        with closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+        with self._transaction() as connection:
+            connection.executescript(SCHEMA)
+
+    def enqueue(self, opportunity: ArbitrageOpportunity, job_id: str = None) -> str:
+        """
+        Add an opportunity to the queue
+
+        Enqueueing the same `job_id` again is a no-op, so a producer can
+        safely retry.
+
+        Returns:
+            The job id
+        """
+        job_id = job_id or uuid.uuid4().hex
+        now = time.time()
+        with self._transaction() as connection:
+            connection.execute(
+                """
+                INSERT OR IGNORE INTO execution_jobs (
+                    id, status, opportunity, book1, book2, enqueued_at, expires_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    job_id,
+                    PENDING,
+                    _dump_opportunity(opportunity),
+                    str(opportunity.book1),
+                    str(opportunity.book2),
+                    now,
+                    now + self.ttl if self.ttl else None,
+                ),
+            )
+        return job_id
+
+    def claim(
+        self, worker_id: str, books: Iterable[str] = None
+    ) -> Optional[ExecutionJob]:
+        """
+        Lease the oldest claimable job
+
+        Args:
+            worker_id: Name of the claiming executor
+            books: Only claim jobs whose two sportsbooks are both in here
+                (the books this executor has browsers for)
+
+        Returns:
+            The leased job, or None if nothing is claimable
+        """
+        books = None if books is None else {str(book) for book in books}
+        now = time.time()
+        with self._transaction() as connection:
+            self._reap(connection, now)
+            rows = connection.execute(
+                """
+                SELECT id, opportunity, book1, book2, enqueued_at, attempts
+                FROM execution_jobs
+                WHERE status = ?
+                ORDER BY enqueued_at
+                """,
+                (PENDING,),
+            )
+            for row in rows:
+                if books is None or (row["book1"] in books and row["book2"] in books):
+                    break
+            else:
+                return None
+
+            job = ExecutionJob(
+                id=row["id"],
+                opportunity=_load_opportunity(row["opportunity"]),
+                enqueued_at=row["enqueued_at"],
+                attempts=row["attempts"] + 1,
+                worker_id=worker_id,
+                lease_token=uuid.uuid4().hex,
+                lease_expires_at=now + self.lease_seconds,
+            )
+            connection.execute(
+                """
+                UPDATE execution_jobs
+                SET status = ?, attempts = ?, worker_id = ?, lease_token = ?, lease_expires_at = ?
+                WHERE id = ?
+                """,
+                (
+                    LEASED,
+                    job.attempts,
+                    worker_id,
+                    job.lease_token,
+                    job.lease_expires_at,
+                    job.id,
+                ),
+            )
+        return job
+
+    def renew(self, job: ExecutionJob) -> bool:
+        """
+        Extend a lease by `lease_seconds`
+
+        Returns:
+            False if the lease was lost (expired and reaped, or finished)
+        """
+        expires_at = time.time() + self.lease_seconds
+        with self._transaction() as connection:
+            updated = connection.execute(
+                """
+                UPDATE execution_jobs SET lease_expires_at = ?
+                WHERE id = ? AND status = ? AND lease_token = ?
+                """,
+                (expires_at, job.id, LEASED, job.lease_token),
+            ).rowcount
+        if updated:
+            job.lease_expires_at = expires_at
+        return bool(updated)
+
+    @contextmanager
+    def keep_leased(self, job: ExecutionJob) -> Iterator[ExecutionJob]:
+        """Renew the job's lease in the background while the block runs"""
+        done = threading.Event()
+
+        def renew():
+            while not done.wait(self.lease_seconds / 3):
+                if not self.renew(job):
+                    logger.warning(f"Lost lease on execution job {job.id}")
+                    return
+
+        thread = threading.Thread(target=renew, name=f"lease-{job.id[:8]}", daemon=True)
+        thread.start()
+        try:
+            yield job
+        finally:
+            done.set()
+            thread.join()
+
+    def complete(
+        self,
+        job: ExecutionJob,
+        outcome: str,
+        started_at: float,
+        seconds: float,
+        steps: List[ExecutionStep] = (),
+    ) -> bool:
+        """
+        Report the result of a leased job
+
+        If the lease was lost (it expired and the job was reaped or claimed
+        again), the bets may still have been placed, so the result is
+        recorded anyway and the job is marked late, which keeps it from
+        being claimed again.
+
+        Returns:
+            False if the lease was no longer held (the result is recorded as
+            late, or dropped if the job already has a result)
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            late = not connection.execute(
+                """
+                UPDATE execution_jobs SET status = ?, lease_expires_at = NULL
+                WHERE id = ? AND status = ? AND lease_token = ?
+                """,
+                (DONE, job.id, LEASED, job.lease_token),
+            ).rowcount
+            if late:
+                updated = connection.execute(
+                    """
+                    UPDATE execution_jobs
+                    SET status = ?, worker_id = ?, lease_token = NULL, lease_expires_at = NULL
+                    WHERE id = ? AND status NOT IN (?, ?)
+                    """,
+                    (LATE, job.worker_id, job.id, DONE, LATE),
+                ).rowcount
+                if not updated:
+                    logger.error(
+                        f"Dropping {outcome} result for execution job {job.id}: "
+                        f"the job already has a result"
+                    )
+                    return False
+                logger.warning(
+                    f"Recording late {outcome} result for execution job {job.id}"
+                )
+
+            connection.execute(
+                """
+                INSERT INTO execution_results (
+                    job_id, worker_id, outcome, started_at, seconds, steps, finished_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    job.id,
+                    job.worker_id,
+                    outcome,
+                    started_at,
+                    seconds,
+                    json.dumps([asdict(step) for step in steps]),
+                    now,
+                ),
+            )
+
+        job.outcome = outcome
+        job.started_at = started_at
+        job.seconds = seconds
+        job.steps = list(steps)
+        job.late = late
+        return not late
+
+    def release(self, job: ExecutionJob) -> bool:
+        """Give a leased job back without executing it"""
+        with self._transaction() as connection:
+            updated = connection.execute(
+                """
+                UPDATE execution_jobs
+                SET status = ?, attempts = attempts - 1, worker_id = NULL,
+                    lease_token = NULL, lease_expires_at = NULL
+                WHERE id = ? AND status = ? AND lease_token = ?
+                """,
+                (PENDING, job.id, LEASED, job.lease_token),
+            ).rowcount
+        return bool(updated)
+
+    def results_after(
+        self, seq: int = 0, limit: int = 1000
+    ) -> Tuple[List[ExecutionJob], int]:
+        """
+        Finished jobs in completion order, for the detector to pick up
+
+        Args:
+            seq: Cursor returned by the previous call (0 for the start)
+
+        Returns:
+            The finished jobs and the cursor to pass next time
+        """
+        with self._transaction(immediate=False) as connection:
+            rows = connection.execute(
+                """
+                SELECT r.seq, r.job_id, r.worker_id, r.outcome, r.started_at, r.seconds,
+                       r.steps, j.opportunity, j.enqueued_at, j.attempts, j.status
+                FROM execution_results r JOIN execution_jobs j ON j.id = r.job_id
+                WHERE r.seq > ?
+                ORDER BY r.seq
+                LIMIT ?
+                """,
+                (seq, limit),
+            ).fetchall()
+
+        jobs = []
+        for row in rows:
+            jobs.append(
+                ExecutionJob(
+                    id=row["job_id"],
+                    opportunity=_load_opportunity(row["opportunity"]),
+                    enqueued_at=row["enqueued_at"],
+                    attempts=row["attempts"],
+                    worker_id=row["worker_id"],
+                    outcome=row["outcome"],
+                    started_at=row["started_at"],
+                    seconds=row["seconds"],
+                    steps=[ExecutionStep(**step) for step in json.loads(row["steps"])],
+                    late=row["status"] == LATE,
+                )
+            )
+            seq = row["seq"]
+        return jobs, seq
+
+    def cursor(self) -> int:
+        """Cursor just past the latest result, to only pick up new ones"""
+        with self._transaction(immediate=False) as connection:
+            (seq,) = connection.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM execution_results"
+            ).fetchone()
+        return seq
+
+    def statuses(self, job_ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Current status of each job (jobs that no longer exist are left out)
+
+        Expired leases and stale pending jobs are reaped first, so the
+        result shows which jobs will never be placed.
+        """
+        job_ids = list(job_ids)
+        statuses = {}
+        with self._transaction() as connection:
+            self._reap(connection, time.time())
+            # Stay well under SQLite's bound parameter limit
+            for start in range(0, len(job_ids), 500):
+                chunk = job_ids[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = connection.execute(
+                    f"SELECT id, status FROM execution_jobs WHERE id IN ({placeholders})",
+                    chunk,
+                )
+                statuses.update({job_id: status for job_id, status in rows})
+        return statuses
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status"""
+        with self._transaction() as connection:
+            self._reap(connection, time.time())
+            rows = connection.execute(
+                "SELECT status, COUNT(*) FROM execution_jobs GROUP BY status"
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+    def purge(self, older_than: float) -> int:
+        """Delete finished (or late), expired and abandoned jobs enqueued before `older_than`"""
+        with self._transaction() as connection:
+            connection.execute(
+                """
+                DELETE FROM execution_results WHERE job_id IN (
+                    SELECT id FROM execution_jobs WHERE status IN (?, ?) AND enqueued_at < ?
+                )
+                """,
+                (DONE, LATE, older_than),
+            )
+            return connection.execute(
+                "DELETE FROM execution_jobs WHERE status IN (?, ?, ?, ?) AND enqueued_at < ?",
+                (DONE, LATE, EXPIRED, ABANDONED, older_than),
+            ).rowcount
+
+    def _reap(self, connection: sqlite3.Connection, now: float):
+        # Expired leases: retry while attempts remain, otherwise give up
+        connection.execute(
+            """
+            UPDATE execution_jobs
+            SET status = CASE WHEN attempts < ? THEN ? ELSE ? END,
+                worker_id = NULL, lease_token = NULL, lease_expires_at = NULL
+            WHERE status = ? AND lease_expires_at < ?
+            """,
+            (self.max_attempts, PENDING, ABANDONED, LEASED, now),
+        )
+        # Pending jobs whose prices are too old to act on
+        connection.execute(
+            "UPDATE execution_jobs SET status = ? WHERE status = ? AND expires_at < ?",
+            (EXPIRED, PENDING, now),
+        )
+
+    @contextmanager
+    def _transaction(self, immediate: bool = True) -> Iterator[sqlite3.Connection]:
+        """
+        A connection inside one transaction, committed (or rolled back on an
+        exception) and closed when the block ends
+
+        Connections are in autocommit mode, so without the explicit BEGIN
+        each statement would commit on its own. An immediate transaction
+        takes the write lock up front; reads use a deferred one, which
+        still gives them a consistent snapshot.
+        """
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield connection
+            except BaseException:
+                connection.rollback()
+                raise
+            connection.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        return connection
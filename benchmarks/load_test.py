@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test of ArbitrageOrchestrator against the mock sportsbooks
+
+Starts a local MockSportsbookServer, points the fetchers at it through
+Settings and runs fetch -> odds book -> opportunity events back to back,
+reporting throughput and tick latency percentiles.
+
+    python benchmarks/load_test.py --scale 10 --ticks 200 --latency-ms 30
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from arbitrage_bot.config import Settings
+from arbitrage_bot.mock import MockBoard, MockSportsbookServer
+from arbitrage_bot.orchestrator import ArbitrageOrchestrator
+
+# BetMGM's live query takes 50 fixtures per request today
+BASELINE_GAMES = 50
+
+
+def _percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--scale", type=float, default=10, help="Feed volume relative to today's"
+    )
+    parser.add_argument("--ticks", type=int, default=100)
+    parser.add_argument("--extra-markets", type=int, default=5)
+    parser.add_argument("--volatility", type=float, default=0.2)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    board = MockBoard(
+        games=int(BASELINE_GAMES * args.scale),
+        volatility=args.volatility,
+        tick_seconds=0,
+        extra_markets=args.extra_markets,
+    )
+    server = MockSportsbookServer(
+        board,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+    )
+    server.start()
+
+    settings = Settings(
+        enable_browser_automation=False,
+        min_profit_percentage=0.0,
+        sportsbook_api_urls=server.api_urls,
+        sportsbook_site_urls=server.site_urls,
+    )
+    orchestrator = ArbitrageOrchestrator(settings)
+    orchestrator.logger.disabled = True
+
+    tick_seconds = []
+    lines = 0
+    opened = 0
+    started = time.perf_counter()
+    for _ in range(args.ticks):
+        tick_started = time.perf_counter()
+        all_odds = orchestrator._fetch_all_odds()
+        opened += len(orchestrator._drain_opportunity_events())
+        tick_seconds.append(time.perf_counter() - tick_started)
+        lines += sum(len(odds) for odds in all_odds.values())
+    elapsed = time.perf_counter() - started
+    server.stop()
+
+    ms = [t * 1000 for t in tick_seconds]
+    print(f"Games per book:  {len(board.games)} ({args.scale}x baseline)")
+    print(
+        f"Ticks:           {args.ticks} in {elapsed:.2f}s ({args.ticks / elapsed:.1f} ticks/s)"
+    )
+    print(f"Lines ingested:  {lines} ({lines / elapsed:.0f} lines/s)")
+    print(f"Opened opps:     {opened}")
+    print(
+        f"Tick latency ms: p50 {statistics.median(ms):.1f}  p95 {_percentile(ms, 95):.1f}  "
+        f"p99 {_percentile(ms, 99):.1f}  max {max(ms):.1f}"
+    )
+    print(
+        f"Server:          {server.requests} requests, {server.errors} errors, "
+        f"{server.not_modified} not modified"
+    )
+
+
+if __name__ == "__main__":
+    main()
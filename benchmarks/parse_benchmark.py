@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Parse benchmark for the DraftKings and BetMGM fetchers
+
+Times `parse_odds` against recorded payloads (or synthetic ones when none
+are given) and compares it with a bare `json.loads` of the same bytes. Cold
+parses start from an empty parse cache; warm ones re-parse the same payload,
+so every fixture is unchanged and skips decoding.
+
+    python benchmarks/parse_benchmark.py --record benchmarks/recorded
+    python benchmarks/parse_benchmark.py --draftkings benchmarks/recorded/draftkings.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from arbitrage_bot.odds.betmgm import BetMGMOddsFetcher
+from arbitrage_bot.odds.draftkings import DraftKingsOddsFetcher
+from arbitrage_bot.mock import MockBoard
+
+
+def _time(fn, content: bytes, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(content)
+    return (time.perf_counter() - start) / repeat
+
+
+def _report(name: str, fetcher_class, content: bytes, repeat: int):
+    fetcher = fetcher_class()
+    lines = len(fetcher.parse_odds(content))
+    json_ms = _time(json.loads, content, repeat) * 1000
+    cold_ms = _time(lambda c: fetcher_class().parse_odds(c), content, repeat) * 1000
+    warm_ms = _time(fetcher.parse_odds, content, repeat) * 1000
+    mb_per_s = len(content) / 1e6 / (cold_ms / 1000)
+    print(
+        f"{name:<11} {len(content) / 1e3:>9.1f} KB {lines:>6} lines "
+        f"json.loads {json_ms:>8.2f} ms  parse_odds cold {cold_ms:>8.2f} ms "
+        f"({mb_per_s:.1f} MB/s)  warm {warm_ms:>8.2f} ms"
+    )
+
+
+def _record(directory: str):
+    os.makedirs(directory, exist_ok=True)
+    for name, fetcher in (
+        ("draftkings", DraftKingsOddsFetcher()),
+        ("betmgm", BetMGMOddsFetcher()),
+    ):
+        path = os.path.join(directory, f"{name}.json")
+        with open(path, "wb") as f:
+            f.write(fetcher.fetch_payload())
+        print(f"Recorded {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--draftkings", help="Recorded DraftKings payload")
+    parser.add_argument("--betmgm", help="Recorded BetMGM payload")
+    parser.add_argument(
+        "--record", metavar="DIR", help="Record live payloads to DIR and exit"
+    )
+    parser.add_argument(
+        "--games", type=int, default=500, help="Synthetic games per payload"
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.record:
+        _record(args.record)
+        return
+
+    board = MockBoard(games=args.games)
+
+    if args.draftkings:
+        with open(args.draftkings, "rb") as f:
+            dk_content = f.read()
+    else:
+        dk_content = board.draftkings_payload()
+
+    if args.betmgm:
+        with open(args.betmgm, "rb") as f:
+            mgm_content = f.read()
+    else:
+        mgm_content = board.betmgm_payload()
+
+    _report("DraftKings", DraftKingsOddsFetcher, dk_content, args.repeat)
+    _report("BetMGM", BetMGMOddsFetcher, mgm_content, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
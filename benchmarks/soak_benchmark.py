@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Soak test of ArbitrageOrchestrator memory against the mock sportsbooks
+
+Runs many ticks against a local MockSportsbookServer whose games keep
+finishing and being replaced by new matchups, with the memory governor
+checking every `--sample-ticks` ticks. RSS after warmup must stay flat:
+the run exits with status 1 if it grows more than `--max-growth-mb`, or
+if no lines were ingested (every fetch failed).
+
+    python benchmarks/soak_benchmark.py --ticks 5000 --turnover 0.02 --trace
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from arbitrage_bot.config import Settings
+from arbitrage_bot.mock import MockBoard, MockSportsbookServer
+from arbitrage_bot.orchestrator import ArbitrageOrchestrator
+
+
+def _slope(points) -> float:
+    """Least-squares slope of (x, y) points"""
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if not variance:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=3000)
+    parser.add_argument(
+        "--sample-ticks", type=int, default=100, help="Ticks between memory checks"
+    )
+    parser.add_argument(
+        "--warmup",
+        type=float,
+        help="Fraction of ticks before the baseline (default 0.2, or 0.5 with --trace, "
+        "since the tracer's own tables take longer to settle)",
+    )
+    parser.add_argument(
+        "--turnover",
+        type=float,
+        default=0.02,
+        help="Chance a game is replaced per tick",
+    )
+    parser.add_argument("--volatility", type=float, default=0.2)
+    parser.add_argument(
+        "--game-key-cache", type=int, default=2000, help="max_game_key_cache"
+    )
+    parser.add_argument("--max-growth-mb", type=float, default=8.0)
+    parser.add_argument(
+        "--trace", action="store_true", help="Report tracemalloc top allocation sites"
+    )
+    args = parser.parse_args()
+    if args.warmup is None:
+        args.warmup = 0.5 if args.trace else 0.2
+
+    board = MockBoard(
+        games=args.games,
+        volatility=args.volatility,
+        tick_seconds=0,
+        turnover=args.turnover,
+    )
+    server = MockSportsbookServer(board)
+    server.start()
+
+    settings = Settings(
+        enable_browser_automation=False,
+        min_profit_percentage=0.0,
+        sportsbook_api_urls=server.api_urls,
+        sportsbook_site_urls=server.site_urls,
+        config_reload_seconds=None,
+        memory_check_ticks=args.sample_ticks,
+        memory_trace_allocations=args.trace,
+        max_game_key_cache=args.game_key_cache,
+    )
+    orchestrator = ArbitrageOrchestrator(settings)
+    # Keep governor warnings (suspected leaks), drop per-tick chatter
+    logging.getLogger("arbitrage_bot").setLevel(logging.WARNING)
+    stats = orchestrator.loop_stats
+    orchestrator.memory_governor.start()
+
+    samples = []
+    lines_ingested = 0
+    warmup_ticks = int(args.ticks * args.warmup)
+    started = time.perf_counter()
+    for _ in range(args.ticks):
+        tick_started = time.perf_counter()
+        all_odds = orchestrator._fetch_all_odds()
+        lines_ingested += sum(len(odds) for odds in all_odds.values())
+        opened = len(orchestrator._drain_opportunity_events())
+        orchestrator._finish_tick(tick_started, opened)
+        if stats.ticks % args.sample_ticks == 0:
+            samples.append((stats.ticks, stats.rss_bytes))
+    elapsed = time.perf_counter() - started
+    orchestrator.memory_governor.stop()
+    server.stop()
+
+    measured = [(tick, rss) for tick, rss in samples if tick > warmup_ticks]
+    if len(measured) < 2:
+        parser.error(
+            "not enough samples after warmup; raise --ticks or lower --sample-ticks"
+        )
+    baseline = measured[0][1]
+    growth = max(rss for _, rss in measured) - baseline
+    slope = _slope(measured) * 1000
+
+    mib = 2**20
+    print(
+        f"Ticks:           {args.ticks} in {elapsed:.1f}s ({args.ticks / elapsed:.1f} ticks/s)"
+    )
+    print(f"Matchups seen:   {board.matchups} over {args.games} slots")
+    print(f"Lines ingested:  {lines_ingested} ({stats.fetch_errors} fetch errors)")
+    print(
+        f"RSS MiB:         baseline {baseline / mib:.1f}  final {measured[-1][1] / mib:.1f}  "
+        f"peak {stats.peak_rss_bytes / mib:.1f}  growth {growth / mib:+.1f}"
+    )
+    print(f"RSS trend:       {slope / 1024:+.1f} KiB per 1000 ticks")
+    print(f"Cache sizes:     {stats.cache_sizes}")
+    print(f"Evictions:       {stats.cache_evictions}")
+    for line in stats.top_allocations:
+        print(f"  {line}")
+
+    if not lines_ingested:
+        print("FAIL: no lines were ingested, so nothing was soaked")
+        sys.exit(1)
+    if growth > args.max_growth_mb * mib:
+        print(
+            f"FAIL: RSS grew {growth / mib:.1f} MiB after warmup (limit {args.max_growth_mb} MiB)"
+        )
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
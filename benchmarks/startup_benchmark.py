@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for imports and orchestrator construction
+
+Runs each scenario in a fresh interpreter, reports the median wall time
+and lists which heavy third-party modules it ended up importing.
+
+    python benchmarks/startup_benchmark.py --runs 10
+    python benchmarks/startup_benchmark.py --importtime orchestrator
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = [
+    "selenium",
+    "curl_cffi",
+    "requests",
+    "sqlite3",
+    "http.server",
+    "multiprocessing",
+]
+
+SCENARIOS = {
+    "package": "import arbitrage_bot",
+    "detection": "from arbitrage_bot.detection import ArbitrageDetector",
+    "backtest_cli": "import arbitrage_bot.backtest.__main__",
+    "orchestrator": "import arbitrage_bot.orchestrator",
+    "detection_only": (
+        "from arbitrage_bot import ArbitrageOrchestrator, Settings\n"
+        "import logging; logging.disable(logging.CRITICAL)\n"
+        "ArbitrageOrchestrator(Settings(enable_browser_automation=False))"
+    ),
+}
+
+REPORT = (
+    f"\nimport sys\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+)
+
+
+def _run(code: str) -> tuple:
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", code + REPORT],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    lines = result.stdout.strip().splitlines()
+    return elapsed, lines[-1] if lines else ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--importtime",
+        choices=sorted(SCENARIOS),
+        help="Print the 15 slowest imports (python -X importtime) for one scenario",
+    )
+    args = parser.parse_args()
+
+    if args.importtime:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", SCENARIOS[args.importtime]],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+        rows = []
+        for line in result.stderr.splitlines():
+            parts = line.split("|")
+            if len(parts) == 3 and parts[1].strip().isdigit():
+                rows.append((int(parts[1]), parts[2].rstrip()))
+        for cumulative, module in sorted(rows, reverse=True)[:15]:
+            print(f"{cumulative / 1000:>9.1f} ms {module}")
+        return
+
+    baseline, _ = _run("pass")
+    print(f"{'interpreter':<15} {baseline * 1000:>8.1f} ms")
+    for name, code in SCENARIOS.items():
+        try:
+            times = []
+            for _ in range(args.runs):
+                elapsed, loaded = _run(code)
+                times.append(elapsed)
+        except RuntimeError as e:
+            print(f"{name:<15} failed: {e}")
+            continue
+        print(
+            f"{name:<15} {statistics.median(times) * 1000:>8.1f} ms  "
+            f"heavy modules: {loaded or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
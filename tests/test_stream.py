@@ -0,0 +1,156 @@
+import time
+import unittest
+
+from arbitrage_bot.board.odds_book import OddsBook
+from arbitrage_bot.detection.detector import ArbitrageDetector
+from arbitrage_bot.mock import MockBoard, MockSportsbookServer
+from arbitrage_bot.models.sportsbooks import Sportsbook
+from arbitrage_bot.odds import (
+    DraftKingsOddsFetcher,
+    SchemaError,
+    StreamingOddsFetcher,
+    american_odds,
+)
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    """Poll `condition` until it holds or `timeout` seconds pass"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def prices(odds_list):
+    """Moneyline prices keyed by line id"""
+    return {
+        (odds.event_id, odds.market_id): (odds.team1_odds, odds.team2_odds)
+        for odds in odds_list
+    }
+
+
+class StreamingOddsFetcherTest(unittest.TestCase):
+    """StreamingOddsFetcher against the mock sportsbook's SSE feed"""
+
+    def setUp(self):
+        self.board = MockBoard(
+            games=20, volatility=0.3, tick_seconds=0.02, extra_markets=0
+        )
+        self.server = MockSportsbookServer(self.board, stream_interval=0.02)
+        self.server.start()
+        self.odds_book = OddsBook(ArbitrageDetector())
+        self.poller = DraftKingsOddsFetcher(
+            api_url=self.server.api_urls["draftkings"], site_url=self.server.url
+        )
+
+    def tearDown(self):
+        self.server.stop()
+
+    def start_stream(self, **options) -> StreamingOddsFetcher:
+        fetcher = StreamingOddsFetcher(
+            DraftKingsOddsFetcher(
+                api_url=self.server.api_urls["draftkings"], site_url=self.server.url
+            ),
+            self.server.stream_urls["draftkings"],
+            read_timeout=5.0,
+            **options,
+        )
+        fetcher.start(self.odds_book)
+        self.addCleanup(fetcher.stop)
+        self.assertTrue(wait_for(lambda: fetcher.connected))
+        return fetcher
+
+    def settle(self):
+        """Stop the board moving and wait for the last moves to be streamed"""
+        self.board.volatility = 0.0
+        streamed = -1
+        while streamed != self.server.streamed_prices:
+            streamed = self.server.streamed_prices
+            time.sleep(0.2)
+
+    def book_prices(self):
+        return prices(self.odds_book.to_dict().get(Sportsbook.DRAFTKINGS, []))
+
+    def test_applies_streamed_deltas(self):
+        fetcher = self.start_stream()
+        seeded = self.server.requests
+
+        self.assertTrue(wait_for(lambda: fetcher.updates_applied >= 10))
+        self.settle()
+
+        self.assertGreater(self.server.streamed_prices, 0)
+        # The moves arrived over the stream, not through polls
+        self.assertEqual(self.server.requests, seeded)
+        self.assertEqual(self.book_prices(), prices(self.poller.fetch_odds()))
+        self.assertEqual(prices(fetcher.fetch_odds()), self.book_prices())
+
+    def test_reconnects_after_stream_drops(self):
+        fetcher = self.start_stream(reconnect_delay=0.05)
+        streams = self.server.streams
+
+        self.server.close_streams()
+
+        self.assertTrue(wait_for(lambda: fetcher.reconnects >= 1 and fetcher.connected))
+        self.assertGreater(self.server.streams, streams)
+        # Moves after the reconnect are streamed into the book again
+        applied = fetcher.updates_applied
+        self.assertTrue(wait_for(lambda: fetcher.updates_applied > applied))
+        self.settle()
+        self.assertEqual(self.book_prices(), prices(self.poller.fetch_odds()))
+
+    def test_falls_back_to_polling_while_disconnected(self):
+        # Long enough that the stream stays down for the rest of the test
+        fetcher = self.start_stream(reconnect_delay=60.0)
+
+        self.server.close_streams()
+        self.assertTrue(wait_for(lambda: not fetcher.connected))
+
+        # Let the board move while nothing is streamed
+        sequence = self.board.sequence
+        time.sleep(0.2)
+        self.board.advance()
+        self.board.volatility = 0.0
+        self.assertGreater(self.board.sequence, sequence)
+        requests = self.server.requests
+
+        odds, changed = fetcher.sync(self.odds_book)
+
+        self.assertEqual(self.server.requests, requests + 1)
+        self.assertGreater(changed, 0)
+        self.assertEqual(self.book_prices(), prices(odds))
+        self.assertEqual(prices(odds), prices(self.poller.fetch_odds()))
+
+    def test_skips_invalid_messages(self):
+        fetcher = self.start_stream()
+        self.settle()
+        line = next(iter(fetcher._lines.values()))
+        applied = fetcher.updates_applied
+
+        fetcher._dispatch(
+            "price",
+            b'{"selection_id": "%s", "american": "even"}'
+            % line.team1_selection_id.encode(),
+        )
+        fetcher._dispatch("price", b"not json")
+
+        self.assertEqual(fetcher.updates_applied, applied)
+        self.assertTrue(fetcher.connected)
+
+
+class AmericanOddsTest(unittest.TestCase):
+    def test_parses_numbers_and_display_strings(self):
+        self.assertEqual(american_odds(150, "$"), 150)
+        self.assertEqual(american_odds(-110.0, "$"), -110)
+        self.assertEqual(american_odds("+120", "$"), 120)
+        self.assertEqual(american_odds("−150", "$"), -150)
+
+    def test_rejects_other_values(self):
+        for value in (True, None, "even", [120]):
+            with self.assertRaises(SchemaError):
+                american_odds(value, "$.american")
+
+
+if __name__ == "__main__":
+    unittest.main()